@@ -1,40 +1,17 @@
 # src/app/data_enrichment/batch_enricher.py - NEW FILE
-import google.generativeai as genai
-import os
-import json
-import re
 import time
 from typing import Dict, List, Any
+from src.app.utils.json_extract import JsonArray, extract_json_array
 from src.app.utils.logger import logger
+from src.app.llm_client import llm_client
 
 
 class BatchEnricher:
-    def __init__(self):
-        self.last_enrichment_time = 0
-
-    def _enforce_rate_limit(self):
-        """Enforce rate limiting for batch calls"""
-        current_time = time.time()
-        time_since_last_call = current_time - self.last_enrichment_time
-
-        if time_since_last_call < 5.0:  # 5 second minimum between batch calls
-            sleep_time = 5.0 - time_since_last_call
-            logger.info(
-                f"⏳ Batch enrichment rate limit: Waiting {sleep_time:.1f} seconds..."
-            )
-            time.sleep(sleep_time)
-
-        self.last_enrichment_time = time.time()
-
     def safe_batch_gemini_call(self, prompt, max_retries=2):
         """Safe wrapper for batch Gemini calls"""
         for attempt in range(max_retries + 1):
             try:
-                self._enforce_rate_limit()
-                genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-                model = genai.GenerativeModel("gemini-2.0-flash")
-                response = model.generate_content(prompt)
-                return response.text if response.text else None
+                return llm_client.generate(prompt, caller="batch_enrichment")
             except Exception as e:
                 if attempt < max_retries:
                     wait_time = 3 + attempt
@@ -123,27 +100,17 @@ Return a JSON array where each element corresponds to the courses in order:
 """
         return prompt
 
-    def extract_json_from_batch_response(
-        self, response_text: str
-    ) -> List[Dict[str, Any]]:
-        """Extract JSON array from batch response"""
-        if not response_text:
-            return []
-
-        # Clean the response
-        cleaned_text = re.sub(
-            r"```(?:json)?", "", response_text, flags=re.IGNORECASE
-        ).strip()
-
-        # Try to find JSON array
-        json_match = re.search(r"\[.*\]", cleaned_text, re.DOTALL)
-        if json_match:
-            try:
-                return json.loads(json_match.group())
-            except json.JSONDecodeError as e:
-                logger.error(f"❌ Failed to parse batch JSON: {e}")
-
-        return []
+    def extract_json_from_batch_response(self, response_text: str) -> JsonArray:
+        """
+        Extract the JSON array from a batch response. An array cut off by the
+        output limit keeps its complete elements (complete=False).
+        """
+        enrichments = extract_json_array(response_text)
+        if not enrichments.complete:
+            logger.warning(
+                f"⚠️ Batch response was cut off after {len(enrichments.items)} items"
+            )
+        return enrichments
 
     def enrich_courses_batch(
         self, courses_data: List[Dict[str, Any]]
@@ -165,7 +132,20 @@ Return a JSON array where each element corresponds to the courses in order:
             return self._apply_batch_fallback(courses_data)
 
         # Parse response
-        enriched_data_list = self.extract_json_from_batch_response(response_text)
+        enrichments = self.extract_json_from_batch_response(response_text)
+        enriched_data_list = enrichments.items
+
+        # A cut-off array still lines up with the first courses: only the rest
+        # need individual enrichment
+        if not enrichments.complete and len(enriched_data_list) < len(courses_data):
+            recovered = len(enriched_data_list)
+            logger.info(
+                f"✅ Kept {recovered} batch enrichments, "
+                f"{len(courses_data) - recovered} courses fall back"
+            )
+            return self._apply_enrichments(
+                courses_data[:recovered], enriched_data_list
+            ) + self._apply_batch_fallback(courses_data[recovered:])
 
         if len(enriched_data_list) != len(courses_data):
             logger.error(
@@ -173,18 +153,24 @@ Return a JSON array where each element corresponds to the courses in order:
             )
             return self._apply_batch_fallback(courses_data)
 
-        # Apply enrichment to each course
+        enriched_courses = self._apply_enrichments(courses_data, enriched_data_list)
+        logger.info(f"✅ Successfully batch enriched {len(enriched_courses)} courses")
+        return enriched_courses
+
+    def _apply_enrichments(
+        self, courses_data: List[Dict[str, Any]], enriched_data_list: List[Any]
+    ) -> List[Dict[str, Any]]:
+        """Apply enrichment to each course"""
         enriched_courses = []
-        for i, (course_data, enrichment) in enumerate(
-            zip(courses_data, enriched_data_list)
-        ):
+        for course_data, enrichment in zip(courses_data, enriched_data_list):
+            if not isinstance(enrichment, dict):
+                enriched_courses.extend(self._apply_batch_fallback([course_data]))
+                continue
             enriched_course = course_data.copy()
             enriched_course.update(enrichment)
             enriched_course["_enrichment_applied"] = True
             enriched_course["_batch_enriched"] = True
             enriched_courses.append(enriched_course)
-
-        logger.info(f"✅ Successfully batch enriched {len(enriched_courses)} courses")
         return enriched_courses
 
     def _apply_batch_fallback(
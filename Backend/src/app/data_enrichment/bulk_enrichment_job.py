@@ -0,0 +1,215 @@
+# src/app/data_enrichment/bulk_enrichment_job.py
+"""
+Offline pre-enrichment of every course in the provider collections.
+
+Walks each collection in _id order, enriches the courses the enrichment store
+does not know yet with batched Gemini calls and writes the results to the
+store, which /query reads before calling the LLM. Progress is checkpointed per
+provider so an interrupted run resumes where it stopped, and courses whose
+batch failed are retried by the next run.
+
+    python -m src.app.data_enrichment.bulk_enrichment_job --concurrency 4 --rpm 12
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.app.data_enrichment.batch_enricher import batch_enricher
+from src.app.data_enrichment.enrichment_store import EnrichmentStore, enrichment_store
+from src.app.data_enrichment.uniform_formatter import (
+    format_to_universal_schema,
+    needs_enrichment,
+)
+from src.app.indexing.corpus import PROVIDERS
+from src.app.utils.logger import logger
+from src.app.utils.rate_limiter import gemini_limiter
+
+DEFAULT_CHECKPOINT_PATH = "./data/bulk_enrichment_checkpoint.json"
+
+
+def load_checkpoint(path: str) -> Dict[str, Dict[str, Any]]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def save_checkpoint(path: str, checkpoint: Dict[str, Dict[str, Any]]):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fh:
+        json.dump(checkpoint, fh, indent=2)
+    os.replace(tmp_path, path)
+
+
+def iter_collection_after(provider: str, last_id: Optional[str]) -> Iterator[Dict[str, Any]]:
+    """Documents of a provider collection in _id order, after the checkpointed _id"""
+    from src.app.db_connection import get_collection
+    from src.app.indexing.inverted_index import to_document_id
+    from src.app.query_executor.projection_planner import plan_projection
+    from src.app.query_executor.provider_executor import sanitize_doc
+
+    query = {"_id": {"$gt": to_document_id(last_id)}} if last_id else {}
+    projection = plan_projection(provider)
+    for doc in get_collection(provider).find(query, projection).sort("_id", 1):
+        yield sanitize_doc(doc)
+
+
+def _chunks(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class BulkEnrichmentJob:
+    """Batched, rate limited, resumable enrichment of whole collections"""
+
+    def __init__(
+        self,
+        store: EnrichmentStore = enrichment_store,
+        checkpoint_path: str = DEFAULT_CHECKPOINT_PATH,
+        batch_size: int = 20,
+        concurrency: int = 2,
+        llm_call: Optional[Callable[[str], Optional[str]]] = None,
+        document_source: Callable[[str, Optional[str]], Iterable[Dict[str, Any]]] = iter_collection_after,
+    ):
+        self.store = store
+        self.checkpoint_path = checkpoint_path
+        self.batch_size = batch_size
+        self.concurrency = max(1, concurrency)
+        self.llm_call = llm_call or batch_enricher.safe_batch_gemini_call
+        self.document_source = document_source
+        self.checkpoint = load_checkpoint(checkpoint_path)
+
+    def enrich_batch(self, courses: List[Dict[str, Any]]) -> Tuple[int, int]:
+        """One LLM call for a batch; returns (enriched, failed)"""
+        prompt = batch_enricher.create_batch_enrichment_prompt(courses)
+        response_text = self.llm_call(prompt)
+        enrichments = batch_enricher.extract_json_from_batch_response(response_text)
+
+        # A cut-off response still lines up with the first courses: keep those
+        if enrichments.complete and len(enrichments.items) != len(courses):
+            logger.warning(
+                f"Batch returned {len(enrichments.items)} enrichments for {len(courses)} courses - skipped"
+            )
+            return 0, len(courses)
+
+        stored = [
+            (course, enrichment)
+            for course, enrichment in zip(courses, enrichments.items)
+            if isinstance(enrichment, dict)
+        ]
+        self.store.put_many(stored)
+        return len(stored), len(courses) - len(stored)
+
+    def _pending_courses(self, provider: str, documents: List[Dict[str, Any]]):
+        courses = []
+        for doc in documents:
+            course = format_to_universal_schema(doc, provider)
+            course["provider"] = provider
+            if needs_enrichment(course):
+                courses.append(course)
+
+        stored = self.store.get_many(courses)
+        return [course for i, course in enumerate(courses) if i not in stored]
+
+    def run_provider(self, provider: str, limit: Optional[int] = None) -> Dict[str, Any]:
+        progress = self.checkpoint.setdefault(
+            provider, {"last_id": None, "processed": 0, "enriched": 0, "failed": 0}
+        )
+        started = time.time()
+        seen = 0
+        # Courses of this run that could not be enriched (retried next run)
+        progress["failed"] = 0
+        retry_from_checkpoint = False
+
+        documents = self.document_source(provider, progress["last_id"])
+        # A window is `concurrency` batches in flight; the checkpoint only moves
+        # past windows whose batches all succeeded. After the first failed
+        # batch it stays put, so the next run reads those documents again and
+        # retries the courses the store still lacks.
+        window_size = self.batch_size * self.concurrency
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            for window in _chunks(documents, window_size):
+                if limit is not None and seen >= limit:
+                    break
+                window = window[: limit - seen] if limit is not None else window
+                seen += len(window)
+
+                pending = self._pending_courses(provider, window)
+                window_failed = 0
+                for enriched, failed in pool.map(
+                    self.enrich_batch, list(_chunks(pending, self.batch_size))
+                ):
+                    progress["enriched"] += enriched
+                    window_failed += failed
+                progress["failed"] += window_failed
+
+                retry_from_checkpoint = retry_from_checkpoint or window_failed > 0
+                if not retry_from_checkpoint:
+                    progress["processed"] += len(window)
+                    progress["last_id"] = str(window[-1].get("_id"))
+                save_checkpoint(self.checkpoint_path, self.checkpoint)
+                logger.info(
+                    f"📦 {provider}: {progress['processed']} processed, "
+                    f"{progress['enriched']} enriched, {progress['failed']} failed"
+                )
+
+        elapsed = time.time() - started
+        logger.success(f"{provider} pre-enrichment pass finished in {elapsed:.1f}s")
+        return progress
+
+    def run(self, providers: Optional[List[str]] = None, limit: Optional[int] = None):
+        return {
+            provider: self.run_provider(provider, limit)
+            for provider in providers or PROVIDERS
+        }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Pre-enrich all provider collections into the enrichment store"
+    )
+    parser.add_argument("--providers", nargs="+", default=PROVIDERS)
+    parser.add_argument("--batch-size", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=2)
+    parser.add_argument(
+        "--rpm",
+        type=float,
+        default=None,
+        help="Gemini requests per minute (overrides GEMINI_RPM for this run)",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        default=os.getenv("BULK_ENRICHMENT_CHECKPOINT", DEFAULT_CHECKPOINT_PATH),
+    )
+    parser.add_argument(
+        "--limit", type=int, default=None, help="Max documents per provider in this run"
+    )
+    parser.add_argument(
+        "--reset", action="store_true", help="Ignore the checkpoint and start over"
+    )
+    args = parser.parse_args()
+
+    if args.reset and os.path.exists(args.checkpoint):
+        os.remove(args.checkpoint)
+
+    # Batches are throttled by the process-wide Gemini limiter only
+    if args.rpm is not None:
+        gemini_limiter.set_requests_per_minute(args.rpm)
+
+    job = BulkEnrichmentJob(
+        checkpoint_path=args.checkpoint,
+        batch_size=args.batch_size,
+        concurrency=args.concurrency,
+    )
+    summary = job.run(args.providers, args.limit)
+    print(json.dumps(summary, indent=2))
@@ -0,0 +1,141 @@
+# src/app/data_enrichment/enrichment_jobs.py
+"""
+Background enrichment jobs.
+
+/query can hand enrichment to a worker pool and answer right away with the
+ranked results and a job id. The job publishes the enriched course records of
+every finished batch; clients read them by polling (`since` = number of
+batches already seen) or from a Server-Sent Events stream.
+"""
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from src.app.utils.logger import logger
+
+PENDING = "pending"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+
+class EnrichmentJob:
+    def __init__(self, total_batches: int, total_courses: int):
+        self.job_id = uuid.uuid4().hex
+        self.status = PENDING
+        self.error: Optional[str] = None
+        self.total_batches = total_batches
+        self.total_courses = total_courses
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.batches: List[List[Dict[str, Any]]] = []
+        self._changed = threading.Condition()
+
+    @property
+    def done(self) -> bool:
+        return self.status in (COMPLETED, FAILED)
+
+    def publish(self, records: List[Dict[str, Any]]):
+        """Record the enriched courses of one finished batch"""
+        with self._changed:
+            self.batches.append(records)
+            self._changed.notify_all()
+
+    def _set_status(self, status: str, error: Optional[str] = None):
+        with self._changed:
+            self.status = status
+            self.error = error
+            if self.done:
+                self.finished_at = time.time()
+            self._changed.notify_all()
+
+    def wait_for_update(self, since: int, timeout: float) -> bool:
+        """Block until there are more than `since` batches or the job ended"""
+        with self._changed:
+            return self._changed.wait_for(
+                lambda: len(self.batches) > since or self.done, timeout
+            )
+
+    def snapshot(self, since: int = 0) -> Dict[str, Any]:
+        with self._changed:
+            updates = [record for batch in self.batches[since:] for record in batch]
+            return {
+                "job_id": self.job_id,
+                "status": self.status,
+                "error": self.error,
+                "completed_batches": len(self.batches),
+                "total_batches": self.total_batches,
+                "total_courses": self.total_courses,
+                "next": len(self.batches),
+                "updates": updates,
+            }
+
+
+class EnrichmentJobManager:
+    """Runs enrichment jobs on a worker pool and keeps them for a while for polling"""
+
+    def __init__(self, max_workers: int = 2, job_ttl: float = 3600):
+        self.job_ttl = job_ttl
+        self._jobs: Dict[str, EnrichmentJob] = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="enrichment"
+        )
+
+    def _expire_jobs(self):
+        cutoff = time.time() - self.job_ttl
+        with self._lock:
+            for job_id in [
+                job_id
+                for job_id, job in self._jobs.items()
+                if job.done and job.finished_at < cutoff
+            ]:
+                del self._jobs[job_id]
+
+    def submit(
+        self,
+        task: Callable[[EnrichmentJob], None],
+        total_batches: int,
+        total_courses: int,
+    ) -> EnrichmentJob:
+        """Run task(job) in the background; the task calls job.publish per batch"""
+        self._expire_jobs()
+        job = EnrichmentJob(total_batches, total_courses)
+        with self._lock:
+            self._jobs[job.job_id] = job
+
+        def run():
+            job._set_status(RUNNING)
+            try:
+                task(job)
+                job._set_status(COMPLETED)
+                logger.success(
+                    f"Enrichment job {job.job_id} completed ({len(job.batches)} batches)"
+                )
+            except Exception as e:
+                logger.error(f"❌ Enrichment job {job.job_id} failed: {e}")
+                job._set_status(FAILED, str(e))
+
+        self._pool.submit(run)
+        logger.info(
+            f"🧵 Enrichment job {job.job_id} queued: {total_courses} courses in {total_batches} batches"
+        )
+        return job
+
+    def get(self, job_id: str) -> Optional[EnrichmentJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+
+def async_enrichment_enabled() -> bool:
+    return os.getenv("ASYNC_ENRICHMENT", "false").lower() == "true"
+
+
+# Global instance
+enrichment_jobs = EnrichmentJobManager(
+    max_workers=int(os.getenv("ENRICHMENT_WORKERS", "2")),
+    job_ttl=float(os.getenv("ENRICHMENT_JOB_TTL", "3600")),
+)
@@ -0,0 +1,172 @@
+# src/app/data_enrichment/enrichment_store.py
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.app.utils.logger import logger
+
+DEFAULT_STORE_PATH = "./data/enrichment_store.sqlite"
+
+# Fields produced by the LLM enrichment prompts
+ENRICHED_FIELDS = ["skills", "learning_outcomes", "category", "level"]
+
+
+def _original(course_data: Dict[str, Any]) -> Dict[str, Any]:
+    original = course_data.get("original_data")
+    return original if isinstance(original, dict) else {}
+
+
+def course_store_key(course_data: Dict[str, Any]) -> Tuple[str, str]:
+    """(provider, course id) - the MongoDB _id, falling back to URL and title"""
+    original = _original(course_data)
+    provider = str(
+        course_data.get("provider") or original.get("_provider") or "unknown"
+    ).lower()
+    course_id = (
+        original.get("_id")
+        or course_data.get("url")
+        or original.get("URL")
+        or course_data.get("title", "")
+    )
+    return provider, str(course_id)
+
+
+def course_content_hash(course_data: Dict[str, Any]) -> str:
+    """Hash of the source fields the enrichment prompts are built from"""
+    original = _original(course_data)
+    source = {
+        "title": course_data.get("title") or original.get("Title") or "",
+        "description": course_data.get("description") or original.get("Short Intro") or "",
+        "what_you_learn": original.get("What you learn") or "",
+        "prerequisites": original.get("Prequisites") or "",
+    }
+    encoded = json.dumps(source, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class EnrichmentStore:
+    """
+    Durable store of LLM enrichment results, keyed by provider + course id.
+
+    Entries carry a hash of the course's source fields; when the course text
+    changes the stored enrichment is ignored and the course is enriched again.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            with conn:
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS enrichments (
+                        provider TEXT NOT NULL,
+                        course_id TEXT NOT NULL,
+                        content_hash TEXT NOT NULL,
+                        data TEXT NOT NULL,
+                        updated_at REAL NOT NULL,
+                        PRIMARY KEY (provider, course_id)
+                    )
+                    """
+                )
+            self._conn = conn
+        return self._conn
+
+    def get(self, course_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        return self.get_many([course_data]).get(0)
+
+    def get_many(self, courses_data: List[Dict[str, Any]]) -> Dict[int, Dict[str, Any]]:
+        """Stored enrichments for the given courses, by position in the list"""
+        found: Dict[int, Dict[str, Any]] = {}
+        if not courses_data:
+            return found
+
+        try:
+            with self._lock:
+                conn = self._connection()
+                for i, course_data in enumerate(courses_data):
+                    provider, course_id = course_store_key(course_data)
+                    row = conn.execute(
+                        "SELECT content_hash, data FROM enrichments WHERE provider = ? AND course_id = ?",
+                        (provider, course_id),
+                    ).fetchone()
+                    if row and row[0] == course_content_hash(course_data):
+                        found[i] = json.loads(row[1])
+                self.hits += len(found)
+                self.misses += len(courses_data) - len(found)
+        except Exception as e:
+            logger.warning(f"Enrichment store lookup failed: {e}")
+
+        return found
+
+    def put(self, course_data: Dict[str, Any], enrichment: Dict[str, Any]):
+        self.put_many([(course_data, enrichment)])
+
+    def put_many(self, entries: List[Tuple[Dict[str, Any], Dict[str, Any]]]):
+        """Persist enrichment results (only the enriched fields are kept)"""
+        rows = []
+        now = time.time()
+        for course_data, enrichment in entries:
+            data = {
+                field: enrichment[field]
+                for field in ENRICHED_FIELDS
+                if enrichment.get(field) not in (None, "", [])
+            }
+            if not data:
+                continue
+            provider, course_id = course_store_key(course_data)
+            rows.append(
+                (
+                    provider,
+                    course_id,
+                    course_content_hash(course_data),
+                    json.dumps(data, ensure_ascii=False),
+                    now,
+                )
+            )
+
+        if not rows:
+            return
+        try:
+            with self._lock:
+                conn = self._connection()
+                with conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO enrichments VALUES (?, ?, ?, ?, ?)",
+                        rows,
+                    )
+        except Exception as e:
+            logger.warning(f"Enrichment store write failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        entries = 0
+        try:
+            with self._lock:
+                entries = self._connection().execute(
+                    "SELECT COUNT(*) FROM enrichments"
+                ).fetchone()[0]
+        except Exception:
+            pass
+        return {
+            "path": self.path,
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+# Global instance
+enrichment_store = EnrichmentStore(
+    os.getenv("ENRICHMENT_STORE_PATH", DEFAULT_STORE_PATH)
+)
@@ -1,50 +1,27 @@
 # src/app/data_enrichment/llm_enricher.py - COMPLETE FIXED VERSION
-import google.generativeai as genai
-import os
-import json
 import re
 import time
 import random
 from typing import Dict, Any, List
 from src.app.universal_schema import ESSENTIAL_FIELDS
+from src.app.data_enrichment.enrichment_store import enrichment_store
+from src.app.llm_client import LLMThrottledError, llm_client
+from src.app.utils.json_extract import extract_json_object
 
-# Track enrichment requests for rate limiting
-last_enrichment_time = 0
-enrichment_count = 0
 
-
-def _enforce_enrichment_rate_limit():
-    """Enforce stricter rate limiting for enrichment calls"""
-    global last_enrichment_time, enrichment_count
-    current_time = time.time()
-
-    # Reset counter if it's been more than 60 seconds
-    if current_time - last_enrichment_time > 60:
-        enrichment_count = 0
-        last_enrichment_time = current_time
-
-    # More conservative limit - 8 per minute instead of 15
-    if enrichment_count >= 8:
-        sleep_time = 60 - (current_time - last_enrichment_time)
-        if sleep_time > 0:
-            print(f"⏳ Enrichment rate limit: Waiting {sleep_time:.1f} seconds...")
-            time.sleep(sleep_time)
-        enrichment_count = 0
-        last_enrichment_time = time.time()
-
-    enrichment_count += 1
-    time.sleep(1.0)  # Increased delay to 1 second
-
-
-def safe_gemini_call(prompt, max_retries=2):
-    """Safe wrapper for Gemini calls with retry logic"""
+def safe_gemini_call(prompt, max_retries=2, optional=False):
+    """
+    Safe wrapper for Gemini calls with retry logic.
+    Optional calls are skipped (None) instead of waiting for rate limit budget.
+    """
     for attempt in range(max_retries + 1):
         try:
-            _enforce_enrichment_rate_limit()
-            genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-            model = genai.GenerativeModel("gemini-2.0-flash")
-            response = model.generate_content(prompt)
-            return response.text if response.text else None
+            return llm_client.generate(
+                prompt, caller="course_enrichment", blocking=not optional
+            )
+        except LLMThrottledError:
+            print("⚠️  Skipping enrichment due to rate limits")
+            return None
         except Exception as e:
             if attempt < max_retries:
                 wait_time = 2 + attempt
@@ -56,34 +33,6 @@ def safe_gemini_call(prompt, max_retries=2):
     return None
 
 
-def _extract_json_from_response(response_text):
-    """Extract JSON from LLM response with better error handling"""
-    if not response_text:
-        return None
-
-    # Clean the response
-    cleaned_text = re.sub(
-        r"```(?:json)?", "", response_text, flags=re.IGNORECASE
-    ).strip()
-
-    # Try direct parsing first
-    if cleaned_text.startswith("{") and cleaned_text.endswith("}"):
-        try:
-            return json.loads(cleaned_text)
-        except json.JSONDecodeError:
-            pass
-
-    # Try to find JSON object
-    json_match = re.search(r'\{[^{}]*"[^"]*"[^{}]*\}', cleaned_text, re.DOTALL)
-    if json_match:
-        try:
-            return json.loads(json_match.group())
-        except json.JSONDecodeError:
-            pass
-
-    return None
-
-
 def _clean_and_extract_skills(what_you_learn_text, description, title):
     """
     Intelligently extract skills from 'What you learn' content
@@ -209,9 +158,16 @@ def enrich_course_data(
     Use LLM to intelligently enrich course data with high-quality formatting
     Only enrich top N courses to avoid rate limits
     """
-    # Skip enrichment if we're hitting rate limits
-    if enrichment_count >= 8:  # More conservative
-        print("⚠️  Skipping enrichment due to rate limits")
+    store_key_data = {**universal_data, "original_data": original_data}
+
+    # Reuse an earlier LLM enrichment of the same course
+    stored = enrichment_store.get(store_key_data)
+    if stored:
+        for field, value in stored.items():
+            if not universal_data.get(field):
+                universal_data[field] = value
+        universal_data["_enrichment_cached"] = True
+        print("💾 Enrichment loaded from store")
         return universal_data
 
     # Only enrich courses with high relevance probability
@@ -304,7 +260,7 @@ Return ONLY a JSON object with the enriched fields. Example:
 
     try:
         print("🤖 Calling Gemini for intelligent enrichment...")
-        response_text = safe_gemini_call(prompt)
+        response_text = safe_gemini_call(prompt, optional=True)
 
         if not response_text:
             print("⚠️  No response from LLM enrichment")
@@ -313,7 +269,7 @@ Return ONLY a JSON object with the enriched fields. Example:
             )
 
         # Extract JSON from response
-        enriched_data = _extract_json_from_response(response_text)
+        enriched_data = extract_json_object(response_text)
 
         if enriched_data:
             # Apply the enriched data
@@ -323,6 +279,7 @@ Return ONLY a JSON object with the enriched fields. Example:
                     universal_data[field] = value
                     enriched_fields.append(field)
 
+            enrichment_store.put(store_key_data, universal_data)
             print(
                 f"✅ Successfully enriched {len(enriched_fields)} fields: {enriched_fields}"
             )
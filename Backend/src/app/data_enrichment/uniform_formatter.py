@@ -2,6 +2,7 @@
 from typing import Dict, Any , List
 import re
 from src.app.data_enrichment.batch_enricher import batch_enricher
+from src.app.data_enrichment.enrichment_store import enrichment_store
 from src.app.data_enrichment.llm_enricher import enrich_course_data
 from src.app.universal_schema import FIELD_MAPPING, ESSENTIAL_FIELDS
 from src.app.utils.logger import logger
@@ -69,32 +70,50 @@ def format_to_universal_schema(
     # Don't enrich here - just prepare for batch processing
     return _ensure_high_quality_output(universal_data)
 
+def needs_enrichment(course: Dict[str, Any]) -> bool:
+    """True when any of the LLM enriched fields is still empty"""
+    return (
+        not course.get('skills') or 
+        not course.get('learning_outcomes') or
+        not course.get('category') or
+        not course.get('level')
+    )
+
 def process_batch_enrichment(courses_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Process batch enrichment for multiple courses"""
     if not courses_data:
         return courses_data
     
     # Filter courses that need enrichment
-    courses_needing_enrichment = []
-    for course in courses_data:
-        needs_enrichment = (
-            not course.get('skills') or 
-            not course.get('learning_outcomes') or
-            not course.get('category') or
-            not course.get('level')
-        )
-        if needs_enrichment:
-            courses_needing_enrichment.append(course)
+    courses_needing_enrichment = [
+        course for course in courses_data if needs_enrichment(course)
+    ]
     
     if not courses_needing_enrichment:
         logger.info("ℹ️  No courses need batch enrichment")
         return courses_data
     
-    logger.info(f"🤖 Preparing batch enrichment for {len(courses_needing_enrichment)} courses")
+    # Courses enriched before (with unchanged source text) come from the store
+    enriched_courses = []
+    stored = enrichment_store.get_many(courses_needing_enrichment)
+    for index, enrichment in stored.items():
+        enriched_course = courses_needing_enrichment[index].copy()
+        enriched_course.update(enrichment)
+        enriched_course["_enrichment_applied"] = True
+        enriched_course["_enrichment_cached"] = True
+        enriched_courses.append(enriched_course)
+    
+    courses_needing_enrichment = [
+        course for i, course in enumerate(courses_needing_enrichment) if i not in stored
+    ]
+    if stored:
+        logger.info(f"💾 {len(stored)} courses enriched from the enrichment store")
+    
+    if courses_needing_enrichment:
+        logger.info(f"🤖 Preparing batch enrichment for {len(courses_needing_enrichment)} courses")
     
     # Process in batches of 20 to avoid token limits
     batch_size = 20
-    enriched_courses = []
     
     for i in range(0, len(courses_needing_enrichment), batch_size):
         batch = courses_needing_enrichment[i:i + batch_size]
@@ -103,6 +122,13 @@ def process_batch_enrichment(courses_data: List[Dict[str, Any]]) -> List[Dict[st
         try:
             enriched_batch = batch_enricher.enrich_courses_batch(batch)
             enriched_courses.extend(enriched_batch)
+            enrichment_store.put_many(
+                [
+                    (course, enriched)
+                    for course, enriched in zip(batch, enriched_batch)
+                    if enriched.get("_batch_enriched")
+                ]
+            )
         except Exception as e:
             logger.error(f"❌ Batch enrichment failed: {e}")
             # Fallback to individual enrichment
@@ -1,10 +1,15 @@
 # src/app/db_connection.py
 from pymongo import MongoClient
 import os
+import threading
+from collections.abc import MutableMapping
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
 load_dotenv()
 
+PROVIDERS = ["coursera", "udacity", "simplilearn", "futurelearn"]
+
 
 def get_env_or_raise(var_name):
     value = os.getenv(var_name)
@@ -13,57 +18,167 @@ def get_env_or_raise(var_name):
     return value
 
 
-# Create separate clients for each cluster
-coursera_client = MongoClient(get_env_or_raise("MONGO_URI_COURSERA"))
-udacity_client = MongoClient(get_env_or_raise("MONGO_URI_UDACITY"))
-simplilearn_client = MongoClient(get_env_or_raise("MONGO_URI_SIMPLILEARN"))
-futurelearn_client = MongoClient(get_env_or_raise("MONGO_URI_FUTURELEARN"))
+def get_client_options():
+    """Connection pool and timeout settings shared by every MongoClient"""
+    return {
+        "maxPoolSize": int(os.getenv("MONGO_MAX_POOL_SIZE", "50")),
+        "minPoolSize": int(os.getenv("MONGO_MIN_POOL_SIZE", "2")),
+        "maxIdleTimeMS": int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "300000")),
+        "serverSelectionTimeoutMS": int(
+            os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000")
+        ),
+        "connectTimeoutMS": int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "5000")),
+        "socketTimeoutMS": int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "30000")),
+    }
+
+
+class ClientRegistry:
+    """
+    Pooled MongoClients created on first use, one per distinct URI, so
+    providers stored on the same cluster share a connection pool
+    """
+
+    def __init__(self):
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    def client_for_uri(self, uri):
+        client = self._clients.get(uri)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(uri)
+                if client is None:
+                    client = MongoClient(uri, **get_client_options())
+                    self._clients[uri] = client
+        return client
+
+    def clients(self):
+        return list(self._clients.values())
+
+    def close_all(self):
+        with self._lock:
+            for client in self._clients.values():
+                client.close()
+            self._clients.clear()
+
+
+class LazyProviderMap(MutableMapping):
+    """
+    provider -> value resolved on first access. Entries can be overridden
+    (e.g. with test databases) like in a plain dict.
+    """
+
+    def __init__(self, resolve):
+        self._resolve = resolve
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, provider):
+        if provider not in self._values:
+            if provider not in PROVIDERS:
+                raise KeyError(provider)
+            with self._lock:
+                if provider not in self._values:
+                    self._values[provider] = self._resolve(provider)
+        return self._values[provider]
+
+    def __setitem__(self, provider, value):
+        self._values[provider] = value
+
+    def __delitem__(self, provider):
+        del self._values[provider]
+
+    def __iter__(self):
+        return iter(PROVIDERS + [p for p in self._values if p not in PROVIDERS])
+
+    def __len__(self):
+        return len(set(PROVIDERS) | set(self._values))
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+
+client_registry = ClientRegistry()
+
+
+def storage_backend():
+    """mongo (the provider clusters) or embedded (in-process catalog, no network)"""
+    return os.getenv("STORAGE_BACKEND", "mongo").lower()
+
+
+def get_client(provider):
+    if storage_backend() == "embedded":
+        from src.app.storage.embedded_catalog import embedded_catalog
+
+        return embedded_catalog
+    return client_registry.client_for_uri(
+        get_env_or_raise(f"MONGO_URI_{provider.upper()}")
+    )
+
+
+def _get_database(provider):
+    if storage_backend() == "embedded":
+        return CLIENT_MAP[provider][provider]
+    return CLIENT_MAP[provider][get_env_or_raise(f"MONGO_DB_{provider.upper()}")]
+
+
+def _get_collection_name(provider):
+    if storage_backend() == "embedded":
+        return os.getenv(f"MONGO_COLLECTION_{provider.upper()}") or provider
+    return get_env_or_raise(f"MONGO_COLLECTION_{provider.upper()}")
+
+
+# Providers sharing a cluster URI share one client
+CLIENT_MAP = LazyProviderMap(get_client)
 
 # Map each provider to its specific database in its specific cluster
-dbMap = {
-    "coursera": coursera_client[get_env_or_raise("MONGO_DB_COURSERA")],
-    "udacity": udacity_client[get_env_or_raise("MONGO_DB_UDACITY")],
-    "simplilearn": simplilearn_client[get_env_or_raise("MONGO_DB_SIMPLILEARN")],
-    "futurelearn": futurelearn_client[get_env_or_raise("MONGO_DB_FUTURELEARN")],
-}
+dbMap = LazyProviderMap(_get_database)
 
 # Collection names remain the same
-COLLECTION_MAP = {
-    "coursera": get_env_or_raise("MONGO_COLLECTION_COURSERA"),
-    "udacity": get_env_or_raise("MONGO_COLLECTION_UDACITY"),
-    "simplilearn": get_env_or_raise("MONGO_COLLECTION_SIMPLILEARN"),
-    "futurelearn": get_env_or_raise("MONGO_COLLECTION_FUTURELEARN"),
-}
-
-# Optional: Store clients for health checks or cleanup
-CLIENT_MAP = {
-    "coursera": coursera_client,
-    "udacity": udacity_client,
-    "simplilearn": simplilearn_client,
-    "futurelearn": futurelearn_client,
-}
-
-
-# NEW: Initialize database function
+COLLECTION_MAP = LazyProviderMap(_get_collection_name)
+
+
 def initialize_db():
     """
-    Initialize database connections and test them
+    Open the pooled connections and test them, pinging every cluster in parallel
     Returns: True if all connections are successful
     """
     try:
         print("🔌 Testing MongoDB connections...")
 
-        # Test each client connection
-        for provider, client in CLIENT_MAP.items():
+        # Providers on the same cluster share a client: ping each client once
+        clients = {}
+        for provider in PROVIDERS:
+            clients.setdefault(id(CLIENT_MAP[provider]), (CLIENT_MAP[provider], []))
+            clients[id(CLIENT_MAP[provider])][1].append(provider)
+
+        def ping(client):
+            client.admin.command("ping")
+
+        with ThreadPoolExecutor(max_workers=len(clients)) as pool:
+            futures = {
+                pool.submit(ping, client): providers
+                for client, providers in clients.values()
+            }
+
+        failed = []
+        for future, providers in futures.items():
+            names = ", ".join(p.capitalize() for p in providers)
             try:
-                # Ping the database to test connection
-                client.admin.command("ping")
-                print(f"   ✅ {provider.capitalize()} connection successful")
+                future.result()
+                print(f"   ✅ {names} connection successful")
             except Exception as e:
-                print(f"   ❌ {provider.capitalize()} connection failed: {e}")
-                raise ConnectionError(f"{provider} database connection failed")
+                print(f"   ❌ {names} connection failed: {e}")
+                failed.extend(providers)
+
+        if failed:
+            raise ConnectionError(f"{', '.join(failed)} database connection failed")
 
-        print("✅ All MongoDB connections established successfully!")
+        print(
+            f"✅ All MongoDB connections established successfully! "
+            f"({len(clients)} client(s) for {len(PROVIDERS)} providers)"
+        )
         return True
 
     except Exception as e:
@@ -86,5 +201,6 @@ def close_all_clients():
     """
     Closes all MongoDB client connections.
     """
-    for client in CLIENT_MAP.values():
-        client.close()
\ No newline at end of file
+    client_registry.close_all()
+    for lazy_map in (CLIENT_MAP, dbMap, COLLECTION_MAP):
+        lazy_map.reset()
@@ -0,0 +1,49 @@
+# src/app/indexing/corpus.py
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from src.app.utils.logger import logger
+
+PROVIDERS = ["coursera", "udacity", "simplilearn", "futurelearn"]
+
+
+def iter_provider_documents(
+    providers: Optional[List[str]] = None,
+    projection: Optional[Dict[str, Any]] = None,
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Yield (provider, document) for every course in the provider collections"""
+    # Imported lazily: db_connection needs the MongoDB environment variables
+    from src.app.db_connection import get_collection
+
+    for provider in providers or PROVIDERS:
+        try:
+            collection = get_collection(provider)
+            count = 0
+            for doc in collection.find({}, projection):
+                count += 1
+                yield provider, doc
+            logger.database(f"Read {count} documents from {provider}")
+        except Exception as e:
+            logger.error(f"Could not read {provider} collection: {e}")
+
+
+def collection_fingerprints(
+    providers: Optional[List[str]] = None,
+) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    provider -> {"count", "max_id"} of its collection, a cheap signature that
+    changes when courses are added or removed (None when it cannot be read)
+    """
+    from src.app.db_connection import get_collection
+
+    fingerprints: Dict[str, Optional[Dict[str, Any]]] = {}
+    for provider in providers or PROVIDERS:
+        try:
+            collection = get_collection(provider)
+            last = list(collection.find({}, {"_id": 1}).sort("_id", -1).limit(1))
+            fingerprints[provider] = {
+                "count": collection.count_documents({}),
+                "max_id": str(last[0]["_id"]) if last else None,
+            }
+        except Exception as e:
+            logger.error(f"Could not fingerprint {provider} collection: {e}")
+            fingerprints[provider] = None
+    return fingerprints
@@ -0,0 +1,337 @@
+# src/app/indexing/expansion_dictionary.py
+import argparse
+import glob
+import itertools
+import json
+import os
+import re
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.app.indexing.corpus import PROVIDERS, iter_provider_documents
+from src.app.utils.logger import logger
+
+DEFAULT_DICTIONARY_PATH = "./data/expansion_dictionary.json"
+SNAPSHOT_VERSION = 1
+
+SKILL_FIELDS = ["Skills"]
+# A past plan's term is kept when at least this share of the queries naming the head expanded to it
+MIN_PLAN_CONFIDENCE = 0.5
+# Skills are related when they appear together in enough courses, relative to the head's courses
+MIN_SKILL_SUPPORT = 3
+MIN_SKILL_CONFIDENCE = 0.25
+MAX_EXPANSIONS = 8
+MAX_TERM_WORDS = 4
+
+TERM_TOKEN_PATTERN = re.compile(r"[\w+#]+")
+# "Artificial Intelligence (AI)" names the same skill twice
+_PARENTHESIZED = re.compile(r"^(.*?)\s*\(([^()]+)\)\s*$")
+
+
+def tokenize_term(text: str) -> List[str]:
+    return TERM_TOKEN_PATTERN.findall(text.lower())
+
+
+def term_key(text: str) -> str:
+    return " ".join(tokenize_term(text))
+
+
+def _valid_term(text: str) -> bool:
+    tokens = tokenize_term(text)
+    return (
+        0 < len(tokens) <= MAX_TERM_WORDS
+        and not any(char.isdigit() for char in text)
+    )
+
+
+def _contains_phrase(tokens: List[str], phrase: List[str]) -> bool:
+    size = len(phrase)
+    return any(tokens[i : i + size] == phrase for i in range(len(tokens) - size + 1))
+
+
+def _is_acronym(short: str, name: str) -> bool:
+    initials = "".join(word[0] for word in tokenize_term(name))
+    return len(initials) > 1 and term_key(short).replace(" ", "") == initials
+
+
+def _skill_names(value) -> List[List[str]]:
+    """Skills of a course, each as its display names ("Artificial Intelligence", "AI")"""
+    values = value if isinstance(value, list) else [value]
+    skills = []
+    for item in values:
+        if not isinstance(item, str):
+            continue
+        for skill in item.split(","):
+            skill = skill.strip()
+            match = _PARENTHESIZED.match(skill)
+            names = [skill]
+            if match:
+                name, note = match.group(1).strip(), match.group(2).strip()
+                # Only an acronym is another name of the skill ("Python (IDLE)" is not)
+                names = [name, note] if _is_acronym(note, name) else [name]
+            names = [name for name in names if _valid_term(name)]
+            if names:
+                skills.append(names)
+    return skills
+
+
+class ExpansionDictionary:
+    """
+    Term -> related search terms, learned instead of asking the LLM per query.
+
+    Two sources are combined:
+
+    - past plans (generated_queries.json): every expanded term is attributed
+      to the closest preceding term the user actually wrote (the LLM lists each
+      topic's expansions right after it)
+    - the Skills field of the catalog: skills that appear together in enough
+      courses, and the two names of a parenthesized skill
+
+    Terms are stored under a normalized key and found in a tokenized query with
+    a word trie, longest phrase first.
+    """
+
+    def __init__(self):
+        self.expansions: Dict[str, List[str]] = {}
+        self._trie: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.expansions)
+
+    def __contains__(self, term: str) -> bool:
+        return term_key(term) in self.expansions
+
+    # ------------------------------------------------------------------
+    # Learning
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _plan_candidates(plan_records) -> Tuple[Dict[str, Dict[str, float]], Dict[str, str]]:
+        """head -> {term: share of the head's queries expanding to it}, and display names"""
+        displays: Dict[str, str] = {}
+        by_query: Dict[str, Dict[str, set]] = {}
+        for user_query, expanded_terms in plan_records:
+            query_tokens = tokenize_term(user_query)
+            keys = []
+            for term in expanded_terms or []:
+                if isinstance(term, str) and _valid_term(term):
+                    keys.append(term_key(term))
+                    displays.setdefault(term_key(term), term.strip())
+            heads = [i for i, key in enumerate(keys) if _contains_phrase(query_tokens, key.split())]
+            if not heads:
+                continue
+
+            # Same query planned again counts once
+            query_heads = by_query.setdefault(" ".join(query_tokens), {})
+            for position, key in enumerate(keys):
+                owner = max((i for i in heads if i <= position), default=heads[0])
+                terms = query_heads.setdefault(keys[owner], set())
+                if key != keys[owner]:
+                    terms.add(key)
+
+        head_counts: Counter = Counter()
+        pair_counts: Counter = Counter()
+        for query_heads in by_query.values():
+            for head, terms in query_heads.items():
+                head_counts[head] += 1
+                pair_counts.update((head, term) for term in terms)
+
+        candidates: Dict[str, Dict[str, float]] = {}
+        for (head, term), count in pair_counts.items():
+            confidence = count / head_counts[head]
+            if confidence >= MIN_PLAN_CONFIDENCE:
+                candidates.setdefault(head, {})[displays[term]] = confidence
+        return candidates, displays
+
+    @staticmethod
+    def _skill_candidates(skill_values) -> Tuple[Dict[str, Dict[str, float]], Dict[str, str]]:
+        """skill -> {co-occurring skill: share of the skill's courses having both}, and display names"""
+        displays: Dict[str, str] = {}
+        course_counts: Counter = Counter()
+        pair_counts: Counter = Counter()
+        candidates: Dict[str, Dict[str, float]] = {}
+
+        for value in skill_values:
+            course_skills = set()
+            for names in _skill_names(value):
+                keys = [term_key(name) for name in names]
+                for key, name in zip(keys, names):
+                    displays.setdefault(key, name)
+                course_skills.add(keys[0])
+                # The two names of a parenthesized skill are synonyms
+                for key, other in itertools.permutations(keys, 2):
+                    candidates.setdefault(key, {})[displays[other]] = 1.0
+            course_counts.update(course_skills)
+            pair_counts.update(itertools.permutations(course_skills, 2))
+
+        for (skill, other), count in pair_counts.items():
+            confidence = count / course_counts[skill]
+            if count >= MIN_SKILL_SUPPORT and confidence >= MIN_SKILL_CONFIDENCE:
+                related = candidates.setdefault(skill, {})
+                related[displays[other]] = max(related.get(displays[other], 0.0), confidence)
+        return candidates, displays
+
+    def build(self, plan_records=(), skill_values=()) -> "ExpansionDictionary":
+        """
+        Learn from (user_query, expanded_terms) pairs of past plans and from
+        course Skills values
+        """
+        merged: Dict[str, Dict[str, float]] = {}
+        displays: Dict[str, str] = {}
+        for candidates, names in (
+            self._plan_candidates(plan_records),
+            self._skill_candidates(skill_values),
+        ):
+            for key, name in names.items():
+                displays.setdefault(key, name)
+            for head, terms in candidates.items():
+                related = merged.setdefault(head, {})
+                for term, score in terms.items():
+                    if term_key(term) != head:
+                        related[term] = max(related.get(term, 0.0), score)
+
+        # Like the static topic expansions: the term itself, then its related terms
+        expansions = {}
+        for head, terms in merged.items():
+            related, seen = [], {head}
+            for term in sorted(terms, key=lambda term: (-terms[term], term.lower())):
+                if term_key(term) not in seen:
+                    seen.add(term_key(term))
+                    related.append(term)
+            if related:
+                expansions[head] = [displays[head]] + related[:MAX_EXPANSIONS]
+
+        self._install(expansions)
+        logger.success(f"Expansion dictionary built: {len(expansions)} terms")
+        return self
+
+    def build_from_sources(
+        self, results_dir: str, providers: Optional[List[str]] = None
+    ) -> "ExpansionDictionary":
+        skill_values = (
+            doc.get(field)
+            for _, doc in iter_provider_documents(
+                providers or PROVIDERS, {field: 1 for field in SKILL_FIELDS}
+            )
+            for field in SKILL_FIELDS
+        )
+        return self.build(iter_plan_records(results_dir), skill_values)
+
+    def _install(self, expansions: Dict[str, List[str]]):
+        trie: Dict[str, dict] = {}
+        for key in expansions:
+            node = trie
+            for word in key.split():
+                node = node.setdefault(word, {})
+            node[""] = key
+        with self._lock:
+            self.expansions = expansions
+            self._trie = trie
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, path: str = DEFAULT_DICTIONARY_PATH) -> str:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump(
+                {"version": SNAPSHOT_VERSION, "expansions": self.expansions},
+                fh,
+                ensure_ascii=False,
+            )
+        os.replace(tmp_path, path)
+        logger.success(f"Expansion dictionary saved: {path}")
+        return path
+
+    def load(self, path: str = DEFAULT_DICTIONARY_PATH) -> bool:
+        if not os.path.exists(path):
+            return False
+
+        with open(path, "r", encoding="utf-8") as fh:
+            snapshot = json.load(fh)
+
+        if snapshot.get("version") != SNAPSHOT_VERSION:
+            logger.warning(f"Ignoring expansion dictionary with old format: {path}")
+            return False
+
+        self._install(snapshot.get("expansions", {}))
+        logger.info(f"Expansion dictionary loaded from {path} ({len(self)} terms)")
+        return True
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def expand(self, term: str) -> List[str]:
+        """A known term followed by its related terms (empty for unknown terms)"""
+        return list(self.expansions.get(term_key(term), []))
+
+    def longest_match(self, tokens: List[str], start: int) -> Optional[Tuple[str, int]]:
+        """Longest known term starting at tokens[start]: (key, number of tokens)"""
+        node, match = self._trie, None
+        for offset, token in enumerate(tokens[start:], 1):
+            node = node.get(token)
+            if node is None:
+                break
+            if "" in node:
+                match = (node[""], offset)
+        return match
+
+
+def iter_plan_records(results_dir: str) -> Iterable[Tuple[str, List[str]]]:
+    """(user_query, expanded_terms) of every saved plan under results_dir"""
+    for path in sorted(glob.glob(os.path.join(results_dir, "*", "generated_queries.json"))):
+        try:
+            with open(path, "r", encoding="utf-8") as fh:
+                saved = json.load(fh)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Skipping unreadable plan {path}: {e}")
+            continue
+        plan = saved.get("generated_queries")
+        if isinstance(plan, dict) and plan.get("expanded_terms"):
+            yield saved.get("user_query", ""), plan["expanded_terms"]
+
+
+def load_expansion_dictionary(build_if_missing: Optional[bool] = None) -> bool:
+    """Load the expansion dictionary at startup, learning it from past plans and the catalog if needed"""
+    path = os.getenv("EXPANSION_DICTIONARY_PATH", DEFAULT_DICTIONARY_PATH)
+    if build_if_missing is None:
+        build_if_missing = (
+            os.getenv("EXPANSION_DICTIONARY_BUILD_ON_STARTUP", "true").lower() == "true"
+        )
+
+    try:
+        if expansion_dictionary.load(path):
+            return True
+        if not build_if_missing:
+            return False
+
+        expansion_dictionary.build_from_sources(os.getenv("OUTPUT_DIR", "./results"))
+        expansion_dictionary.save(path)
+        return True
+    except Exception as e:
+        logger.error(f"Could not load expansion dictionary: {e}")
+        return False
+
+
+# Global instance
+expansion_dictionary = ExpansionDictionary()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Learn the term expansion dictionary from saved plans and course skills"
+    )
+    parser.add_argument("--results", default=os.getenv("OUTPUT_DIR", "./results"))
+    parser.add_argument(
+        "--output",
+        default=os.getenv("EXPANSION_DICTIONARY_PATH", DEFAULT_DICTIONARY_PATH),
+    )
+    args = parser.parse_args()
+
+    expansion_dictionary.build_from_sources(args.results)
+    expansion_dictionary.save(args.output)
@@ -0,0 +1,368 @@
+# src/app/indexing/inverted_index.py
+import argparse
+import json
+import math
+import os
+import re
+import threading
+from typing import Any, Dict, List, Optional, Set
+
+from bson import ObjectId
+
+from src.app.indexing.corpus import (
+    PROVIDERS,
+    collection_fingerprints,
+    iter_provider_documents,
+)
+from src.app.query_executor.mongo_matcher import (
+    UnsupportedQueryError,
+    compile_filter,
+    extract_literal_alternatives,
+)
+from src.app.utils.logger import logger
+
+DEFAULT_INDEX_PATH = "./data/course_index.json"
+SNAPSHOT_VERSION = 2
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def _snapshot_value(value: Any) -> Any:
+    """Keep the scalar (and string list) values a filter can be evaluated on"""
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, float) and (math.isnan(value) or math.isinf(value)):
+        return None
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if isinstance(value, list) and all(isinstance(v, str) for v in value):
+        return value
+    return None
+
+
+class CourseInvertedIndex:
+    """
+    In-process inverted index over the provider collections.
+
+    For every provider it keeps the filterable field values of each course and
+    a posting list (token -> course ids) per field. Keyword regex conditions
+    are answered from the posting lists and verified against the stored
+    values, so executors only fetch the matching course ids from MongoDB.
+
+    Snapshots record the collection fingerprints they were built from, so a
+    snapshot that predates a re-import is rebuilt instead of hiding courses.
+    """
+
+    def __init__(self):
+        self.documents: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.postings: Dict[str, Dict[str, Dict[str, Set[str]]]] = {}
+        self.fingerprints: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def is_loaded(self) -> bool:
+        return bool(self.documents)
+
+    def document_count(self, provider: Optional[str] = None) -> int:
+        if provider:
+            return len(self.documents.get(provider, {}))
+        return sum(len(docs) for docs in self.documents.values())
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _index_provider(docs: Dict[str, Dict[str, Any]]):
+        postings: Dict[str, Dict[str, Set[str]]] = {}
+        for doc_id, fields in docs.items():
+            for field, value in fields.items():
+                values = value if isinstance(value, list) else [value]
+                field_postings = postings.setdefault(field, {})
+                for item in values:
+                    if not isinstance(item, str):
+                        continue
+                    for token in set(tokenize(item)):
+                        field_postings.setdefault(token, set()).add(doc_id)
+        return postings
+
+    def _install(self, documents: Dict[str, Dict[str, Dict[str, Any]]]):
+        postings = {
+            provider: self._index_provider(docs) for provider, docs in documents.items()
+        }
+        with self._lock:
+            self.documents = documents
+            self.postings = postings
+
+    def build(self, provider_documents, fingerprints=None) -> "CourseInvertedIndex":
+        """Build from an iterable of (provider, document) pairs"""
+        documents: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for provider, doc in provider_documents:
+            doc_id = str(doc.get("_id"))
+            documents.setdefault(provider, {})[doc_id] = {
+                field: _snapshot_value(value)
+                for field, value in doc.items()
+                if field != "_id"
+            }
+
+        self._install(documents)
+        self.fingerprints = fingerprints or {}
+        logger.success(
+            f"Course index built: {self.document_count()} courses across "
+            f"{len(documents)} providers"
+        )
+        return self
+
+    def build_from_collections(self, providers: Optional[List[str]] = None):
+        providers = providers or PROVIDERS
+        # Taken before reading, so writes during the build make it stale
+        fingerprints = collection_fingerprints(providers)
+        return self.build(iter_provider_documents(providers), fingerprints)
+
+    def save_snapshot(self, path: str = DEFAULT_INDEX_PATH) -> str:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump(
+                {
+                    "version": SNAPSHOT_VERSION,
+                    "fingerprints": self.fingerprints,
+                    "providers": self.documents,
+                },
+                fh,
+                ensure_ascii=False,
+            )
+        os.replace(tmp_path, path)
+        logger.success(f"Course index snapshot saved: {path}")
+        return path
+
+    def load_snapshot(
+        self,
+        path: str = DEFAULT_INDEX_PATH,
+        fingerprints: Optional[Dict[str, Optional[Dict[str, Any]]]] = None,
+    ) -> bool:
+        """
+        Install a saved snapshot. With the current collection fingerprints a
+        snapshot built from different collection contents is rejected.
+        """
+        if not os.path.exists(path):
+            return False
+
+        with open(path, "r", encoding="utf-8") as fh:
+            snapshot = json.load(fh)
+
+        if snapshot.get("version") != SNAPSHOT_VERSION:
+            logger.warning(f"Ignoring course index snapshot with old format: {path}")
+            return False
+
+        stored = snapshot.get("fingerprints", {})
+        stale = [
+            provider
+            for provider, fingerprint in (fingerprints or {}).items()
+            if fingerprint is not None and stored.get(provider) != fingerprint
+        ]
+        if stale:
+            logger.warning(
+                f"Ignoring stale course index snapshot {path} "
+                f"(changed: {', '.join(stale)})"
+            )
+            return False
+
+        self._install(snapshot.get("providers", {}))
+        self.fingerprints = stored
+        logger.info(
+            f"Course index loaded from {path} ({self.document_count()} courses)"
+        )
+        return True
+
+    # ------------------------------------------------------------------
+    # Querying
+    # ------------------------------------------------------------------
+
+    def _tokens_for_word(
+        self,
+        field_postings: Dict[str, Set[str]],
+        word: str,
+        left_exact: bool,
+        right_exact: bool,
+    ) -> Set[str]:
+        """Course ids having a token that can contain this word of a literal"""
+        if left_exact and right_exact:
+            return set(field_postings.get(word, ()))
+
+        if left_exact:
+            matches = lambda token: token.startswith(word)
+        elif right_exact:
+            matches = lambda token: token.endswith(word)
+        else:
+            matches = lambda token: word in token
+
+        ids: Set[str] = set()
+        for token, posting in field_postings.items():
+            if matches(token):
+                ids |= posting
+        return ids
+
+    def _literal_candidates(
+        self, field_postings: Dict[str, Set[str]], literal: str, leading: bool, trailing: bool
+    ) -> Optional[Set[str]]:
+        lowered = literal.lower()
+        spans = [(m.group(), m.start(), m.end()) for m in TOKEN_PATTERN.finditer(lowered)]
+        if not spans:
+            return None
+
+        candidates: Optional[Set[str]] = None
+        for i, (word, start, end) in enumerate(spans):
+            # A word is a whole token on a side that is delimited, either by a
+            # non-word character of the literal itself or by a \b anchor
+            left_exact = start > 0 or leading
+            right_exact = end < len(lowered) or trailing
+            ids = self._tokens_for_word(field_postings, word, left_exact, right_exact)
+            candidates = ids if candidates is None else candidates & ids
+            if not candidates:
+                return set()
+        return candidates
+
+    def _candidate_ids(self, provider: str, query: Any) -> Optional[Set[str]]:
+        """Superset of matching course ids, or None when the index cannot narrow"""
+        if not isinstance(query, dict) or not query:
+            return None
+
+        narrowed: List[Set[str]] = []
+        for key, value in query.items():
+            if key == "$and" and isinstance(value, list):
+                for child in value:
+                    ids = self._candidate_ids(provider, child)
+                    if ids is not None:
+                        narrowed.append(ids)
+            elif key == "$or" and isinstance(value, list):
+                union: Set[str] = set()
+                for child in value:
+                    ids = self._candidate_ids(provider, child)
+                    if ids is None:
+                        union = None
+                        break
+                    union |= ids
+                if union is not None:
+                    narrowed.append(union)
+            elif not key.startswith("$") and isinstance(value, dict) and "$regex" in value:
+                literals = extract_literal_alternatives(
+                    value["$regex"], value.get("$options", "")
+                )
+                if literals is None:
+                    continue
+                field_postings = self.postings.get(provider, {}).get(key, {})
+                union = set()
+                for literal, leading, trailing in literals:
+                    ids = self._literal_candidates(field_postings, literal, leading, trailing)
+                    if ids is None:
+                        union = None
+                        break
+                    union |= ids
+                if union is not None:
+                    narrowed.append(union)
+
+        if not narrowed:
+            return None
+        result = narrowed[0]
+        for ids in narrowed[1:]:
+            result = result & ids
+        return result
+
+    def match_ids(self, provider: str, query: Dict[str, Any]) -> Optional[List[str]]:
+        """
+        Ids of the provider's courses matching a find filter, in collection order.
+        Returns None when the provider is not indexed or the filter is not supported.
+        """
+        docs = self.documents.get(provider)
+        if docs is None:
+            return None
+
+        try:
+            predicate = compile_filter(query)
+        except UnsupportedQueryError as e:
+            logger.debug(f"Course index cannot answer query for {provider}: {e}")
+            return None
+
+        candidates = self._candidate_ids(provider, query)
+        if candidates is None:
+            return [doc_id for doc_id, fields in docs.items() if predicate(fields)]
+
+        return [
+            doc_id
+            for doc_id, fields in docs.items()
+            if doc_id in candidates and predicate(fields)
+        ]
+
+
+def to_document_id(doc_id: str):
+    """Convert a stored id back to the value used in the collection"""
+    return ObjectId(doc_id) if ObjectId.is_valid(doc_id) else doc_id
+
+
+def get_course_index_path() -> str:
+    return os.getenv("COURSE_INDEX_PATH", DEFAULT_INDEX_PATH)
+
+
+def invalidate_course_index_snapshot(path: Optional[str] = None) -> bool:
+    """
+    Delete the snapshot after the collections were rewritten in place, so the
+    next startup rebuilds it. Returns whether a snapshot was removed.
+    """
+    path = path or get_course_index_path()
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        return False
+    logger.info(f"Course index snapshot invalidated: {path}")
+    return True
+
+
+def load_course_index(build_if_missing: Optional[bool] = None) -> bool:
+    """
+    Load the course index snapshot at startup, building it from the
+    collections if it is missing or the collections changed since it was saved
+    """
+    if os.getenv("COURSE_INDEX_ENABLED", "true").lower() != "true":
+        logger.info("Course index disabled - queries go straight to MongoDB")
+        return False
+
+    path = get_course_index_path()
+    if build_if_missing is None:
+        build_if_missing = (
+            os.getenv("COURSE_INDEX_BUILD_ON_STARTUP", "true").lower() == "true"
+        )
+
+    try:
+        if course_index.load_snapshot(path, collection_fingerprints()):
+            return True
+        if not build_if_missing:
+            return False
+
+        course_index.build_from_collections()
+        course_index.save_snapshot(path)
+        return True
+    except Exception as e:
+        logger.error(f"Could not load course index: {e}")
+        return False
+
+
+# Global instance
+course_index = CourseInvertedIndex()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Build the course inverted index snapshot from all provider collections"
+    )
+    parser.add_argument(
+        "--output", default=get_course_index_path()
+    )
+    args = parser.parse_args()
+
+    course_index.build_from_collections()
+    course_index.save_snapshot(args.output)
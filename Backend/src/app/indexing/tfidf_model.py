@@ -0,0 +1,155 @@
+# src/app/indexing/tfidf_model.py
+import argparse
+import os
+import pickle
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from src.app.indexing.corpus import iter_provider_documents
+from src.app.utils.logger import logger
+
+DEFAULT_MODEL_PATH = "./data/tfidf_model.pkl"
+
+# Same descriptive fields the relevance scorer compares the query against
+CORPUS_FIELDS = ["Title", "Short Intro", "What you learn", "Skills"]
+
+
+def course_corpus_text(course_data: Dict[str, Any]) -> str:
+    """Text of a course document as seen by the corpus model"""
+    return " ".join(str(course_data.get(field) or "") for field in CORPUS_FIELDS)
+
+
+class CorpusTfidfModel:
+    """TF-IDF model fitted once over all provider collections.
+
+    Replaces the per-pair fit_transform in RelevanceScorer: the vocabulary and
+    IDF weights come from the whole catalog, and scoring a candidate list is a
+    single sparse matrix-vector product.
+    """
+
+    def __init__(self):
+        self.vectorizer: Optional[TfidfVectorizer] = None
+        self.document_count = 0
+        self._lock = threading.Lock()
+
+    @property
+    def is_fitted(self) -> bool:
+        return self.vectorizer is not None
+
+    def fit(self, texts: Iterable[str]) -> "CorpusTfidfModel":
+        """Fit the vocabulary and IDF weights on the given corpus texts"""
+        texts = [text for text in texts if text and text.strip()]
+        vectorizer = TfidfVectorizer(
+            stop_words="english", sublinear_tf=True, max_features=50000
+        )
+        vectorizer.fit(texts)
+
+        with self._lock:
+            self.vectorizer = vectorizer
+            self.document_count = len(texts)
+
+        logger.success(
+            f"TF-IDF corpus model fitted on {len(texts)} courses "
+            f"({len(vectorizer.vocabulary_)} terms)"
+        )
+        return self
+
+    def fit_from_collections(self, providers: Optional[List[str]] = None):
+        """Fit on Title/Short Intro/What you learn/Skills of every provider collection"""
+        projection = {field: 1 for field in CORPUS_FIELDS}
+        texts = (
+            course_corpus_text(doc)
+            for _, doc in iter_provider_documents(providers, projection)
+        )
+        return self.fit(texts)
+
+    def save(self, path: str = DEFAULT_MODEL_PATH) -> str:
+        if not self.is_fitted:
+            raise ValueError("Cannot save an unfitted TF-IDF model")
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as fh:
+            pickle.dump(
+                {"vectorizer": self.vectorizer, "document_count": self.document_count},
+                fh,
+            )
+        os.replace(tmp_path, path)
+        logger.success(f"TF-IDF corpus model saved: {path}")
+        return path
+
+    def load(self, path: str = DEFAULT_MODEL_PATH) -> bool:
+        if not os.path.exists(path):
+            return False
+
+        with open(path, "rb") as fh:
+            state = pickle.load(fh)
+
+        with self._lock:
+            self.vectorizer = state["vectorizer"]
+            self.document_count = state.get("document_count", 0)
+
+        logger.info(
+            f"TF-IDF corpus model loaded from {path} ({self.document_count} courses)"
+        )
+        return True
+
+    def similarities(self, query: str, texts: List[str]) -> np.ndarray:
+        """Cosine similarity between the query and every text"""
+        vectorizer = self.vectorizer
+        if vectorizer is None:
+            raise ValueError("TF-IDF corpus model is not fitted")
+        if not texts:
+            return np.zeros(0)
+
+        # Rows are L2-normalized, so the dot product is the cosine similarity
+        query_vector = vectorizer.transform([query])
+        document_matrix = vectorizer.transform(texts)
+        return np.asarray((document_matrix @ query_vector.T).todense()).ravel()
+
+    def similarity(self, text1: str, text2: str) -> float:
+        return float(self.similarities(text1, [text2])[0])
+
+
+def load_corpus_tfidf_model(build_if_missing: Optional[bool] = None) -> bool:
+    """Load the persisted corpus model at startup, optionally building it first"""
+    path = os.getenv("TFIDF_MODEL_PATH", DEFAULT_MODEL_PATH)
+    if build_if_missing is None:
+        build_if_missing = os.getenv("TFIDF_BUILD_ON_STARTUP", "false").lower() == "true"
+
+    try:
+        if corpus_tfidf_model.load(path):
+            return True
+
+        if not build_if_missing:
+            logger.warning(
+                f"No TF-IDF corpus model at {path} - using pairwise cosine similarity"
+            )
+            return False
+
+        corpus_tfidf_model.fit_from_collections()
+        corpus_tfidf_model.save(path)
+        return True
+    except Exception as e:
+        logger.error(f"Could not load TF-IDF corpus model: {e}")
+        return False
+
+
+# Global instance
+corpus_tfidf_model = CorpusTfidfModel()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Fit the corpus TF-IDF model over all provider collections"
+    )
+    parser.add_argument(
+        "--output", default=os.getenv("TFIDF_MODEL_PATH", DEFAULT_MODEL_PATH)
+    )
+    args = parser.parse_args()
+
+    corpus_tfidf_model.fit_from_collections()
+    corpus_tfidf_model.save(args.output)
@@ -0,0 +1,138 @@
+# src/app/indexing/vocabulary_index.py
+import threading
+from typing import Dict, Iterable, List, Tuple
+
+import jellyfish
+import numpy as np
+
+# Characters are hashed into this many count buckets per word
+CHAR_BUCKETS = 64
+# Longest common prefix rewarded by Jaro-Winkler, and its scaling factor
+WINKLER_PREFIX = 4
+WINKLER_SCALE = 0.1
+# Lowest threshold the relevance scorer asks for
+MIN_FUZZY_THRESHOLD = 0.8
+# Query terms whose matches are kept before the cache is cleared
+MAX_CACHED_TERMS = 10000
+_BOUND_EPSILON = 1e-9
+
+
+def _char_counts(word: str) -> np.ndarray:
+    counts = np.zeros(CHAR_BUCKETS, dtype=np.int16)
+    for char in word:
+        counts[ord(char) % CHAR_BUCKETS] += 1
+    return counts
+
+
+def _prefix_codes(word: str, pad: int) -> List[int]:
+    codes = [ord(char) for char in word[:WINKLER_PREFIX]]
+    return codes + [pad] * (WINKLER_PREFIX - len(codes))
+
+
+class FuzzyVocabularyIndex:
+    """Every distinct word seen in course fields, for fuzzy term lookups.
+
+    Lookups return the words whose Jaro-Winkler similarity to a term is above
+    a threshold. Jaro needs m matching characters, and m is at most the size
+    of the character multiset intersection of the two words (bucketed counts
+    only loosen this), so
+
+        jaro <= (m/len(a) + m/len(b) + 1) / 3
+        jaro_winkler <= jaro + l * 0.1 * (1 - jaro)
+
+    where l is the common prefix length (at most 4).
+
+    One vectorized pass over the vocabulary discards the words that cannot
+    reach the threshold and only the survivors are scored exactly, so the
+    result is the same as comparing the term with every word. Words are
+    appended as new field values are tokenized; a term's matches are cached
+    and only extended with the words added since its last lookup.
+    """
+
+    def __init__(self):
+        self._words: List[str] = []
+        self._word_ids: Dict[str, int] = {}
+        self._lengths = np.zeros(0, dtype=np.float64)
+        self._counts = np.zeros((0, CHAR_BUCKETS), dtype=np.int16)
+        self._prefixes = np.zeros((0, WINKLER_PREFIX), dtype=np.int32)
+        self._pending: List[str] = []
+        # term -> (number of vocabulary words checked, {word: similarity})
+        self._matches: Dict[str, Tuple[int, Dict[str, float]]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._word_ids)
+
+    def add_words(self, words: Iterable[str]):
+        with self._lock:
+            for word in words:
+                if word not in self._word_ids:
+                    self._word_ids[word] = len(self._word_ids)
+                    self._pending.append(word)
+
+    def _flush_pending(self):
+        if not self._pending:
+            return
+        self._lengths = np.concatenate(
+            [self._lengths, np.array([len(word) for word in self._pending], dtype=float)]
+        )
+        self._counts = np.vstack(
+            [self._counts, np.array([_char_counts(word) for word in self._pending])]
+        )
+        self._prefixes = np.vstack(
+            [
+                self._prefixes,
+                np.array([_prefix_codes(word, -1) for word in self._pending]),
+            ]
+        )
+        self._words.extend(self._pending)
+        self._pending = []
+
+    def _scan(self, term: str, start: int) -> Dict[str, float]:
+        """Words from position start on with similarity above MIN_FUZZY_THRESHOLD"""
+        lengths = self._lengths[start:]
+        if not len(lengths) or not term:
+            return {}
+
+        shared = np.minimum(self._counts[start:], _char_counts(term)).sum(axis=1)
+        shared = np.minimum(shared, np.minimum(lengths, len(term)))
+        jaro_bound = np.where(
+            shared > 0, (shared / lengths + shared / len(term) + 1) / 3, 0.0
+        )
+        prefix = np.cumprod(
+            self._prefixes[start:] == np.array(_prefix_codes(term, -2)), axis=1
+        ).sum(axis=1)
+        bound = jaro_bound + prefix * WINKLER_SCALE * (1 - jaro_bound)
+
+        matches = {}
+        for offset in np.flatnonzero(bound > MIN_FUZZY_THRESHOLD - _BOUND_EPSILON):
+            word = self._words[start + offset]
+            similarity = jellyfish.jaro_winkler_similarity(term, word)
+            if similarity > MIN_FUZZY_THRESHOLD:
+                matches[word] = similarity
+        return matches
+
+    def similar_words(self, term: str, threshold: float) -> Dict[str, float]:
+        """{word: Jaro-Winkler similarity} for vocabulary words above threshold"""
+        if threshold < MIN_FUZZY_THRESHOLD:
+            raise ValueError(f"threshold must be at least {MIN_FUZZY_THRESHOLD}")
+
+        with self._lock:
+            self._flush_pending()
+            checked, matches = self._matches.get(term, (0, {}))
+            if checked < len(self._words):
+                matches = {**matches, **self._scan(term, checked)}
+                if len(self._matches) >= MAX_CACHED_TERMS:
+                    self._matches.clear()
+                self._matches[term] = (len(self._words), matches)
+
+        if threshold == MIN_FUZZY_THRESHOLD:
+            return matches
+        return {word: sim for word, sim in matches.items() if sim > threshold}
+
+    def stats(self) -> Dict[str, int]:
+        return {"words": len(self), "cached_terms": len(self._matches)}
+
+
+# Global instance
+fuzzy_vocabulary_index = FuzzyVocabularyIndex()
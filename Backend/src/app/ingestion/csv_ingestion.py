@@ -0,0 +1,141 @@
+# src/app/ingestion/csv_ingestion.py
+"""
+Incremental, idempotent CSV ingestion.
+
+Rows are streamed in chunks and upserted with bulk_write, keyed by course URL.
+Each stored course carries a hash of its raw CSV content, so re-importing a
+refreshed scrape only writes the rows that are new or changed; an interrupted
+import is resumed by simply running it again.
+"""
+import csv
+import hashlib
+import json
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from pymongo import UpdateOne
+
+from src.app.indexing.inverted_index import invalidate_course_index_snapshot
+from src.app.ingestion.index_manager import ensure_indexes
+from src.app.ingestion.normalizers import normalize_course
+from src.app.utils.logger import logger
+
+# Provider -> CSV export in data/raw_data (there is no FutureLearn export:
+# import one with --providers futurelearn --csv <file>)
+PROVIDER_CSV_FILES = {
+    "coursera": "OnlineCoursera.csv",
+    "simplilearn": "OnlineSimplilearn.csv",
+    "udacity": "OnlineUdacity.csv",
+}
+
+KEY_FIELD = "URL"
+HASH_FIELD = "_content_hash"
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def iter_csv_chunks(
+    path: str, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[List[Dict[str, Any]]]:
+    """Stream a CSV file as lists of row dicts (empty cells become None)"""
+    with open(path, "r", encoding="utf-8-sig", newline="") as fh:
+        chunk = []
+        for row in csv.DictReader(fh):
+            chunk.append(
+                {
+                    column.strip(): (value if value != "" else None)
+                    for column, value in row.items()
+                    if column and column.strip()
+                }
+            )
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+def row_content_hash(row: Dict[str, Any]) -> str:
+    payload = json.dumps(row, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def build_course_document(row: Dict[str, Any], content_hash: str) -> Dict[str, Any]:
+    """
+    Stored form of a CSV row: the raw (string) fields, the typed numeric
+    companions parsed from them (rating_value, viewers_count, ...) and the
+    content hash
+    """
+    return {**row, **normalize_course(row), HASH_FIELD: content_hash}
+
+
+def plan_chunk(
+    rows: List[Dict[str, Any]], stored_hashes: Dict[str, Optional[str]]
+) -> Tuple[List[UpdateOne], Dict[str, int]]:
+    """
+    Upserts for the new and changed rows of a chunk.
+    stored_hashes maps the URLs already in the collection to their content
+    hash and is updated in place, so repeated URLs are only written once.
+    """
+    operations = []
+    counts = {"inserted": 0, "updated": 0, "unchanged": 0, "skipped": 0}
+
+    for row in rows:
+        key = row.get(KEY_FIELD)
+        if not key:
+            counts["skipped"] += 1
+            continue
+
+        content_hash = row_content_hash(row)
+        if key in stored_hashes and stored_hashes[key] == content_hash:
+            counts["unchanged"] += 1
+            continue
+
+        counts["updated" if key in stored_hashes else "inserted"] += 1
+        stored_hashes[key] = content_hash
+        document = build_course_document(row, content_hash)
+        operations.append(UpdateOne({KEY_FIELD: key}, {"$set": document}, upsert=True))
+
+    return operations, counts
+
+
+class CsvIngestor:
+    """Chunked bulk upserts of one CSV file into one collection"""
+
+    def __init__(self, collection, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.collection = collection
+        self.chunk_size = chunk_size
+
+    def _stored_hashes(self, rows: List[Dict[str, Any]]) -> Dict[str, Optional[str]]:
+        keys = list({row[KEY_FIELD] for row in rows if row.get(KEY_FIELD)})
+        return {
+            doc[KEY_FIELD]: doc.get(HASH_FIELD)
+            for doc in self.collection.find(
+                {KEY_FIELD: {"$in": keys}}, {KEY_FIELD: 1, HASH_FIELD: 1}
+            )
+        }
+
+    def ingest(self, path: str) -> Dict[str, Any]:
+        ensure_indexes(self.collection)
+
+        started = time.time()
+        totals = {"rows": 0, "inserted": 0, "updated": 0, "unchanged": 0, "skipped": 0}
+        for rows in iter_csv_chunks(path, self.chunk_size):
+            operations, counts = plan_chunk(rows, self._stored_hashes(rows))
+            if operations:
+                self.collection.bulk_write(operations, ordered=False)
+            totals["rows"] += len(rows)
+            for name, count in counts.items():
+                totals[name] += count
+            logger.database(
+                f"{path}: {totals['rows']} rows ({totals['inserted']} inserted, "
+                f"{totals['updated']} updated, {totals['unchanged']} unchanged)"
+            )
+
+        if totals["inserted"] or totals["updated"]:
+            # Updated rows keep the collection fingerprint, so drop the snapshot
+            invalidate_course_index_snapshot()
+
+        elapsed = time.time() - started
+        totals["seconds"] = round(elapsed, 2)
+        totals["rows_per_second"] = round(totals["rows"] / elapsed, 1) if elapsed else None
+        return totals
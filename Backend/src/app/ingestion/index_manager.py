@@ -0,0 +1,91 @@
+# src/app/ingestion/index_manager.py
+"""
+Index provisioning for the provider collections.
+
+Every collection gets a weighted $text index over its descriptive fields (used
+by QUERY_EXECUTION_MODE=text), indexes on the numeric companion fields and an
+index on URL (the ingestion upsert key). Runs at startup unless
+ENSURE_INDEXES_ON_STARTUP=false, or on demand:
+
+    python -m src.app.ingestion.index_manager --providers coursera udacity
+"""
+import argparse
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+from pymongo import TEXT
+from pymongo.errors import PyMongoError
+
+from src.app.indexing.corpus import PROVIDERS
+from src.app.ingestion.normalizers import ensure_numeric_indexes
+from src.app.utils.logger import logger
+
+TEXT_INDEX_NAME = "course_text"
+# Stored field -> $text weight (fields missing from a provider are simply empty)
+TEXT_INDEX_WEIGHTS = {
+    "Title": 10,
+    "Skills": 6,
+    "What you learn": 5,
+    "Category": 3,
+    "Short Intro": 2,
+    "Sub-Category": 1,
+}
+
+
+def ensure_indexes(collection) -> Dict[str, Any]:
+    """Create the text, numeric and URL indexes of one collection (idempotent)"""
+    created, errors = [], []
+    steps = [
+        (
+            TEXT_INDEX_NAME,
+            lambda: collection.create_index(
+                [(field, TEXT) for field in TEXT_INDEX_WEIGHTS],
+                name=TEXT_INDEX_NAME,
+                weights=TEXT_INDEX_WEIGHTS,
+                default_language="english",
+            ),
+        ),
+        ("numeric", lambda: ensure_numeric_indexes(collection)),
+        ("URL", lambda: collection.create_index("URL")),
+    ]
+    for name, create in steps:
+        try:
+            result = create()
+            created.extend(result if isinstance(result, list) else [result])
+        except PyMongoError as e:
+            # e.g. a differently defined text index already exists
+            logger.warning(f"Could not create {name} index on {collection.name}: {e}")
+            errors.append(f"{name}: {e}")
+    return {"indexes": created, "errors": errors}
+
+
+def ensure_all_indexes(providers: Optional[List[str]] = None) -> Dict[str, Any]:
+    from src.app.db_connection import get_collection
+
+    summary = {}
+    for provider in providers or PROVIDERS:
+        try:
+            summary[provider] = ensure_indexes(get_collection(provider))
+        except Exception as e:
+            logger.error(f"Index provisioning failed for {provider}: {e}")
+            summary[provider] = {"indexes": [], "errors": [str(e)]}
+    logger.database(
+        f"Indexes ensured on {sum(not s['errors'] for s in summary.values())}"
+        f"/{len(summary)} provider collections"
+    )
+    return summary
+
+
+def ensure_indexes_on_startup() -> Optional[Dict[str, Any]]:
+    if os.getenv("ENSURE_INDEXES_ON_STARTUP", "true").lower() != "true":
+        logger.info("Index provisioning on startup disabled")
+        return None
+    return ensure_all_indexes()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create the provider collection indexes")
+    parser.add_argument("--providers", nargs="+", default=PROVIDERS)
+    args = parser.parse_args()
+    print(json.dumps(ensure_all_indexes(args.providers), indent=2))
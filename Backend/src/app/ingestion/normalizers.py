@@ -0,0 +1,126 @@
+# src/app/ingestion/normalizers.py
+"""
+Ingestion-time normalization of the free-text numeric fields.
+
+Provider data stores ratings, viewer counts and durations as text ("4.9stars",
+"42,571", "Approximately 6 months to complete"). Ingestion parses them once
+into numeric companion fields that MongoDB can index, sort and range-filter:
+
+    Rating            -> rating_value    (0-5)
+    Number of viewers -> viewers_count
+    Duration          -> duration_hours, duration_weeks
+"""
+import math
+import re
+from typing import Any, Dict, Optional, Tuple
+
+# Raw (stored) field -> numeric companion used for sorting and comparisons
+NUMERIC_COMPANION_FIELDS = {
+    "Rating": "rating_value",
+    "Number of viewers": "viewers_count",
+    "Duration": "duration_hours",
+}
+COMPANION_FIELDS = ["rating_value", "viewers_count", "duration_hours", "duration_weeks"]
+
+# Study effort assumed for calendar durations ("4 months") without an explicit rate
+DEFAULT_HOURS_PER_WEEK = 10
+WEEKS_PER_UNIT = {"day": 1 / 7, "week": 1, "month": 52 / 12, "year": 52}
+HOURS_PER_UNIT = {"minute": 1 / 60, "hour": 1}
+
+NUMBER_PATTERN = re.compile(r"\d+(?:\.\d+)?")
+VIEWERS_PATTERN = re.compile(r"(\d[\d,]*(?:\.\d+)?)\s*([km])?\b", re.IGNORECASE)
+WEEKLY_EFFORT_PATTERN = re.compile(
+    r"(\d+(?:\.\d+)?)\s*(?:hours?|hrs?)\s*(?:a|per|/)\s*week", re.IGNORECASE
+)
+DURATION_PATTERN = re.compile(
+    r"(\d+(?:\.\d+)?)(?:\s*(?:-|to)\s*(\d+(?:\.\d+)?))?\s*"
+    r"(minute|min|hour|hr|day|week|month|year)s?\b",
+    re.IGNORECASE,
+)
+UNIT_ALIASES = {"min": "minute", "hr": "hour"}
+
+
+def _text(value: Any) -> Optional[str]:
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    return str(value)
+
+
+def parse_rating(value: Any) -> Optional[float]:
+    """ "4.9stars" -> 4.9 (None when missing or outside 0-5)"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        rating = float(value)
+    else:
+        text = _text(value)
+        match = NUMBER_PATTERN.search(text) if text else None
+        if not match:
+            return None
+        rating = float(match.group())
+    return rating if 0 <= rating <= 5 else None
+
+
+def parse_viewers(value: Any) -> Optional[int]:
+    """ "42,571" -> 42571, "1.2k" -> 1200"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return None if math.isnan(value) else int(value)
+    text = _text(value)
+    match = VIEWERS_PATTERN.search(text) if text else None
+    if not match:
+        return None
+    count = float(match.group(1).replace(",", ""))
+    suffix = (match.group(2) or "").lower()
+    count *= {"k": 1_000, "m": 1_000_000}.get(suffix, 1)
+    return int(count)
+
+
+def parse_duration(value: Any) -> Tuple[Optional[float], Optional[float]]:
+    """
+    Free-text duration -> (hours, weeks). Ranges use their midpoint; calendar
+    durations assume DEFAULT_HOURS_PER_WEEK unless the text gives a weekly
+    effort ("6 months at 10 hours a week").
+    """
+    text = _text(value)
+    if not text:
+        return None, None
+
+    hours_per_week = DEFAULT_HOURS_PER_WEEK
+    effort = WEEKLY_EFFORT_PATTERN.search(text)
+    if effort:
+        hours_per_week = float(effort.group(1))
+        text = text[: effort.start()] + text[effort.end():]
+
+    match = DURATION_PATTERN.search(text)
+    if not match:
+        return None, None
+    low = float(match.group(1))
+    high = float(match.group(2)) if match.group(2) else low
+    amount = (low + high) / 2
+    unit = match.group(3).lower()
+    unit = UNIT_ALIASES.get(unit, unit)
+
+    if unit in HOURS_PER_UNIT:
+        hours = amount * HOURS_PER_UNIT[unit]
+        weeks = hours / hours_per_week if hours_per_week else None
+    else:
+        weeks = amount * WEEKS_PER_UNIT[unit]
+        hours = weeks * hours_per_week
+    return (
+        round(hours, 2),
+        round(weeks, 2) if weeks is not None else None,
+    )
+
+
+def normalize_course(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Numeric companion fields for one raw course document (None when unparsable)"""
+    hours, weeks = parse_duration(doc.get("Duration"))
+    return {
+        "rating_value": parse_rating(doc.get("Rating")),
+        "viewers_count": parse_viewers(doc.get("Number of viewers")),
+        "duration_hours": hours,
+        "duration_weeks": weeks,
+    }
+
+
+def ensure_numeric_indexes(collection):
+    """Single-field indexes backing the numeric sorts and range filters"""
+    return [collection.create_index(field) for field in COMPANION_FIELDS]
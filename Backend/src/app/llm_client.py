@@ -0,0 +1,160 @@
+# src/app/llm_client.py
+"""
+Shared LLM client used by query generation and enrichment.
+
+The Gemini backend configures the SDK once and keeps one long-lived model
+handle per model name, so calls reuse the underlying connection instead of
+rebuilding the client each time. LLM_BACKEND=stub swaps in a deterministic
+local backend for tests and benchmarks (no network, no API key).
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+from typing import Dict, List, Optional
+
+from src.app.utils.logger import logger
+from src.app.utils.rate_limiter import gemini_limiter
+
+DEFAULT_MODEL = "gemini-2.0-flash"
+
+
+class LLMThrottledError(RuntimeError):
+    """Raised for non-blocking calls when the rate limit budget is used up"""
+
+
+class GeminiBackend:
+    rate_limited = True
+
+    def __init__(self, model_name: str = DEFAULT_MODEL, api_key: Optional[str] = None):
+        self.model_name = model_name
+        self.api_key = api_key
+        self._models: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def _model(self, model_name: str):
+        model = self._models.get(model_name)
+        if model is None:
+            with self._lock:
+                model = self._models.get(model_name)
+                if model is None:
+                    import google.generativeai as genai
+
+                    if not self._models:
+                        genai.configure(api_key=self.api_key or os.getenv("GEMINI_API_KEY"))
+                    model = genai.GenerativeModel(model_name)
+                    self._models[model_name] = model
+                    logger.llm(f"Gemini model ready: {model_name}")
+        return model
+
+    def generate(self, prompt: str, model_name: Optional[str] = None) -> Optional[str]:
+        response = self._model(model_name or self.model_name).generate_content(prompt)
+        return response.text if response.text else None
+
+
+class StubBackend:
+    """
+    Deterministic offline responses shaped like the real ones: query plans for
+    query generation prompts and enrichment JSON for enrichment prompts.
+    """
+
+    rate_limited = False
+    PROVIDERS = ["coursera", "udacity", "simplilearn", "futurelearn"]
+    STOPWORDS = {
+        "a", "an", "and", "the", "for", "in", "of", "on", "to", "with", "i",
+        "want", "need", "learn", "learning", "course", "courses", "me", "show",
+        "find", "some", "about", "best", "good",
+    }
+    CATEGORIES = ["Data Science", "Computer Science", "Business", "Technology", "Programming"]
+    LEVELS = ["Beginner", "Intermediate", "Advanced"]
+
+    def __init__(self):
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _pick(self, options: List[str], text: str) -> str:
+        digest = int(hashlib.md5(text.encode("utf-8")).hexdigest(), 16)
+        return options[digest % len(options)]
+
+    def _enrichment(self, title: str) -> Dict[str, object]:
+        words = [
+            word
+            for word in re.findall(r"[A-Za-z][A-Za-z+#]+", title)
+            if len(word) > 2 and word.lower() not in self.STOPWORDS
+        ]
+        return {
+            "skills": words[:5] or ["General Knowledge"],
+            "learning_outcomes": [f"Understand {title}".strip()],
+            "category": self._pick(self.CATEGORIES, title),
+            "level": self._pick(self.LEVELS, title),
+        }
+
+    def _query_plan(self, user_query: str) -> Dict[str, object]:
+        terms = [
+            word
+            for word in re.findall(r"[A-Za-z0-9+#]+", user_query)
+            if word.lower() not in self.STOPWORDS
+        ] or [user_query.strip() or "course"]
+        regex = {"$regex": "\\b(" + "|".join(re.escape(t) for t in terms) + ")\\b", "$options": "i"}
+        return {
+            "query_type": "SPJ",
+            "thought_process": "Stub backend: keyword search over title and skills",
+            "expanded_terms": terms,
+            "providers": {
+                provider: {"$or": [{"Title": dict(regex)}, {"Skills": dict(regex)}]}
+                for provider in self.PROVIDERS
+            },
+        }
+
+    def generate(self, prompt: str, model_name: Optional[str] = None) -> Optional[str]:
+        with self._lock:
+            self.calls += 1
+
+        batch_titles = re.findall(r"^COURSE \d+:\s*\n- Title: (.*)$", prompt, re.MULTILINE)
+        if batch_titles:
+            return json.dumps([self._enrichment(title) for title in batch_titles])
+
+        single = re.search(r"^- Title: (.*)$", prompt, re.MULTILINE)
+        if single:
+            return json.dumps(self._enrichment(single.group(1)))
+
+        user_query = re.search(r'\*\*USER QUERY:\*\*\s*"(.*)"', prompt)
+        return json.dumps(self._query_plan(user_query.group(1) if user_query else prompt[:200]))
+
+
+class LLMClient:
+    """Rate limited access to one backend shared by every call site"""
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def generate(
+        self,
+        prompt: str,
+        caller: str = "default",
+        blocking: bool = True,
+        model_name: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        Generate text for a prompt. Non-blocking calls raise LLMThrottledError
+        instead of waiting for rate limit budget.
+        """
+        if self.backend.rate_limited:
+            if blocking:
+                gemini_limiter.acquire(prompt, caller=caller)
+            elif not gemini_limiter.try_acquire(prompt, caller=caller):
+                raise LLMThrottledError(f"LLM rate limit budget exhausted for {caller}")
+        return self.backend.generate(prompt, model_name)
+
+
+def create_backend(name: Optional[str] = None):
+    name = (name or os.getenv("LLM_BACKEND", "gemini")).lower()
+    if name == "stub":
+        logger.info("Using the stub LLM backend")
+        return StubBackend()
+    return GeminiBackend(os.getenv("GEMINI_MODEL", DEFAULT_MODEL))
+
+
+# Global instance
+llm_client = LLMClient(create_backend())
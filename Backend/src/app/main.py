@@ -3,6 +3,10 @@ from flask import Flask
 from flask_cors import CORS
 from src.app.routes import register_routes
 from src.app.db_connection import initialize_db
+from src.app.ingestion.index_manager import ensure_indexes_on_startup
+from src.app.indexing.expansion_dictionary import load_expansion_dictionary
+from src.app.indexing.inverted_index import load_course_index
+from src.app.indexing.tfidf_model import load_corpus_tfidf_model
 
 
 def create_app():
@@ -14,6 +18,18 @@ def create_app():
     # Initialize database connection
     initialize_db()
 
+    # Make sure the provider collections have their text and numeric indexes
+    ensure_indexes_on_startup()
+
+    # Load the corpus TF-IDF model used for relevance scoring
+    load_corpus_tfidf_model()
+
+    # Load (or build) the in-process course index used to resolve keyword queries
+    load_course_index()
+
+    # Load (or learn) the term expansions used by the rule-based query planner
+    load_expansion_dictionary()
+
     # Register routes
     register_routes(app)
 
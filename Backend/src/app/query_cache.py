@@ -0,0 +1,252 @@
+# src/app/query_cache.py
+"""
+Two-level query cache:
+
+1. plan_cache   - normalized user query text -> LLM generated query JSON
+2. result_cache - canonical translated MongoDB query per provider -> sanitized docs
+
+Values are stored as plain JSON (MongoDB operators such as $regex must come
+back as dicts, not BSON types) so cached objects are never shared with
+callers that mutate them. Backends are pluggable: in-memory LRU or a sqlite file.
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from bson import json_util
+
+from src.app.utils.logger import logger
+
+DEFAULT_CACHE_PATH = "./data/query_cache.sqlite"
+
+
+class MemoryCacheBackend:
+    """In-process LRU cache with per-entry expiry"""
+
+    def __init__(self, max_entries: int = 1000):
+        self.max_entries = max_entries
+        self.evictions = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, ttl: float):
+        with self._lock:
+            self._entries[key] = (value, time.time() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SqliteCacheBackend:
+    """On-disk cache shared across restarts, LRU-evicted by last access"""
+
+    def __init__(self, path: str, namespace: str, max_entries: int = 10000):
+        self.path = path
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    last_access REAL NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                )
+                """
+            )
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache_entries WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] < now:
+                self._conn.execute(
+                    "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                    (self.namespace, key),
+                )
+                return None
+            self._conn.execute(
+                "UPDATE cache_entries SET last_access = ? WHERE namespace = ? AND key = ?",
+                (now, self.namespace, key),
+            )
+            return row[0]
+
+    def set(self, key: str, value: str, ttl: float):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries VALUES (?, ?, ?, ?, ?)",
+                (self.namespace, key, value, now + ttl, now),
+            )
+            count = self._conn.execute(
+                "SELECT COUNT(*) FROM cache_entries WHERE namespace = ?",
+                (self.namespace,),
+            ).fetchone()[0]
+            overflow = count - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    """
+                    DELETE FROM cache_entries WHERE namespace = ? AND key IN (
+                        SELECT key FROM cache_entries WHERE namespace = ?
+                        ORDER BY expires_at < ? DESC, last_access ASC LIMIT ?
+                    )
+                    """,
+                    (self.namespace, self.namespace, now, overflow),
+                )
+                self.evictions += overflow
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ?", (self.namespace,)
+            )
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM cache_entries WHERE namespace = ?",
+                (self.namespace,),
+            ).fetchone()[0]
+
+
+class QueryCache:
+    """JSON-valued cache with a TTL and hit/miss counters"""
+
+    def __init__(self, name: str, backend, ttl: float):
+        self.name = name
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.enabled = ttl > 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        try:
+            raw = self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"{self.name} cache read failed: {e}")
+            raw = None
+
+        with self._lock:
+            if raw is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return None if raw is None else json.loads(raw)
+
+    def set(self, key: str, value: Any):
+        if not self.enabled:
+            return
+        try:
+            raw = json.dumps(value, default=json_util.default, ensure_ascii=False)
+            self.backend.set(key, raw, self.ttl)
+        except Exception as e:
+            logger.warning(f"{self.name} cache write failed: {e}")
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "ttl_seconds": self.ttl,
+            "entries": len(self.backend),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.backend.evictions,
+        }
+
+
+def normalize_query_text(user_query: str) -> str:
+    """Case, whitespace and trailing punctuation do not change the query plan"""
+    text = re.sub(r"\s+", " ", user_query.lower()).strip()
+    return text.strip(" .?!")
+
+
+def canonical_query_key(provider: str, query: Any, limit: Optional[int] = None) -> str:
+    """Stable key for a translated provider query (key order independent)"""
+    canonical = json.dumps(
+        {"provider": provider, "query": query, "limit": limit},
+        sort_keys=True,
+        default=json_util.default,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _create_backend(namespace: str, max_entries: int):
+    backend_name = os.getenv("QUERY_CACHE_BACKEND", "memory").lower()
+    if backend_name == "sqlite":
+        path = os.getenv("QUERY_CACHE_PATH", DEFAULT_CACHE_PATH)
+        try:
+            return SqliteCacheBackend(path, namespace, max_entries)
+        except Exception as e:
+            logger.error(f"Could not open sqlite query cache at {path}: {e}")
+    return MemoryCacheBackend(max_entries)
+
+
+def _create_cache(name: str, env_prefix: str, default_ttl: int, default_max: int):
+    """Configured by <env_prefix>_TTL (seconds, 0 disables) and <env_prefix>_MAX_ENTRIES"""
+    return QueryCache(
+        name,
+        _create_backend(
+            name, int(os.getenv(f"{env_prefix}_MAX_ENTRIES", str(default_max)))
+        ),
+        float(os.getenv(f"{env_prefix}_TTL", str(default_ttl))),
+    )
+
+
+# Global instances
+plan_cache = _create_cache("query_plans", "QUERY_PLAN_CACHE", 24 * 3600, 5000)
+result_cache = _create_cache("provider_results", "QUERY_RESULT_CACHE", 3600, 500)
+
+
+def cache_stats() -> Dict[str, Any]:
+    return {
+        plan_cache.name: plan_cache.stats(),
+        result_cache.name: result_cache.stats(),
+    }
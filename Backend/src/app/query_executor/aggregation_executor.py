@@ -1,11 +1,40 @@
 # src/app/query_executor/aggregation_executor.py
+import heapq
 import json
+import os
 from src.app.db_connection import dbMap, COLLECTION_MAP
-from src.app.query_generator.query_translator import translate_query_to_db_fields
+from src.app.ingestion.normalizers import NUMERIC_COMPANION_FIELDS
+from src.app.query_generator.query_plan import build_provider_plan
+from src.app.query_generator.query_translator import SCHEMA_TO_DB_FIELD_MAP
+from src.app.query_executor.projection_planner import (
+    apply_pipeline_projection,
+    plan_projection,
+)
+from src.app.query_executor.top_k_planner import (
+    SORT_VALUE_FIELD,
+    build_top_k_pipeline,
+    can_push_down,
+    document_sort_value,
+    merge_top_k,
+)
+from src.app.query_executor.concurrent_executor import (
+    execute_provider_queries,
+    get_provider_timeout,
+)
 from src.app.utils.logger import logger
 
 
-def execute_aggregation_pipeline(provider, pipeline, user_query):
+def execute_aggregation_pipeline(provider, pipeline, user_query, consume_batch=None):
+    """
+    Run a provider aggregation pipeline, sanitizing the output batch by batch.
+    With consume_batch the batches are streamed to it and no list is built.
+    """
+    from src.app.query_executor.provider_executor import (
+        get_document_batch_size,
+        iter_batches,
+        sanitize_doc,
+    )
+
     provider_lower = provider.lower()
     db = dbMap.get(provider_lower)
 
@@ -17,22 +46,31 @@ def execute_aggregation_pipeline(provider, pipeline, user_query):
     coll = db.get_collection(collection_name)
 
     # Translate the pipeline stages
-    translated_pipeline = []
-    for stage in pipeline:
-        translated_stage = translate_query_to_db_fields(stage, provider_lower)
-        translated_pipeline.append(translated_stage)
+    translated_pipeline = [build_provider_plan(stage, provider_lower) for stage in pipeline]
+    translated_pipeline = apply_pipeline_projection(translated_pipeline, provider_lower)
 
     try:
         logger.database(f"Executing aggregation on {provider_lower}")
-        cursor = coll.aggregate(translated_pipeline)
-        matched_docs = list(cursor)
+        timeout_ms = int(get_provider_timeout(provider_lower) * 1000)
+        cursor = coll.aggregate(
+            translated_pipeline,
+            maxTimeMS=timeout_ms,
+            batchSize=get_document_batch_size(),
+        )
+
+        matched_docs = []
+        sink = consume_batch or matched_docs.extend
+        match_count = 0
+        for batch in iter_batches(cursor):
+            match_count += len(batch)
+            sink([sanitize_doc(doc) for doc in batch])
 
-        logger.info(f"Found {len(matched_docs)} documents from {provider}")
+        logger.info(f"Found {match_count} documents from {provider}")
 
         result_info = {
             "collection": collection_name,
             "pipeline": translated_pipeline,
-            "match_count": len(matched_docs),
+            "match_count": match_count,
             "execution_error": None,
         }
 
@@ -49,8 +87,167 @@ def execute_aggregation_pipeline(provider, pipeline, user_query):
         }
 
 
+# (provider, companion field) pairs known to be populated by ingestion
+_ingested_numeric_fields = set()
+
+
+def cross_platform_pushdown_enabled():
+    return os.getenv("CROSS_PLATFORM_PUSHDOWN", "true").lower() == "true"
+
+
+def _ingested_numeric_field(coll, provider, sort_field):
+    """Numeric companion of sort_field when the ingestion pipeline populated it"""
+    numeric_field = NUMERIC_COMPANION_FIELDS.get(sort_field)
+    if numeric_field is None:
+        return None
+    key = (provider, numeric_field)
+    if key not in _ingested_numeric_fields:
+        # Only positive answers are cached: a backfill may run at any time
+        if coll.find_one({numeric_field: {"$exists": True}}, {"_id": 1}) is None:
+            return None
+        _ingested_numeric_fields.add(key)
+    return numeric_field
+
+
+def _fetch_top_k_documents(coll, provider, query, sort_field, descending, limit):
+    """
+    Let MongoDB sort and limit one provider's documents (top-K pushdown).
+    Returns None when the sort has to run in Python.
+    """
+    from src.app.query_executor.provider_executor import (
+        resolve_indexed_query,
+        sanitize_doc,
+    )
+
+    numeric_field = _ingested_numeric_field(coll, provider, sort_field)
+    if not can_push_down(sort_field, numeric_field):
+        # Free-text values need the ingestion parsers: sort them in Python
+        return None
+
+    match_query = resolve_indexed_query(provider, query)
+    if match_query is None:
+        return []
+    pipeline = build_top_k_pipeline(
+        match_query,
+        sort_field,
+        descending,
+        limit,
+        plan_projection(provider, (sort_field,)),
+        numeric_field,
+    )
+    timeout_ms = int(get_provider_timeout(provider) * 1000)
+    cursor = coll.aggregate(pipeline, maxTimeMS=timeout_ms)
+    return [sanitize_doc(doc) for doc in cursor]
+
+
+def _stream_top_k_documents(coll, provider, query, sort_field, descending, limit):
+    """Python fallback: stream the matches, keeping only the best `limit`"""
+    from src.app.query_executor.provider_executor import iter_sanitized_batches
+
+    documents = (
+        doc
+        for batch in iter_sanitized_batches(
+            coll, provider, query, extra_fields=(sort_field,)
+        )
+        for doc in batch
+    )
+
+    def sort_value(doc):
+        return document_sort_value(doc, sort_field)
+
+    if limit:
+        # Bounded heap: O(limit) memory however many documents match
+        select = heapq.nlargest if descending else heapq.nsmallest
+        matched_docs = select(limit, documents, key=sort_value)
+    else:
+        matched_docs = sorted(documents, key=sort_value, reverse=descending)
+    for doc in matched_docs:
+        doc[SORT_VALUE_FIELD] = sort_value(doc)
+    return matched_docs
+
+
+def _fetch_cross_platform_documents(
+    provider, query, user_query, sort_field, descending=True, limit=None
+):
+    """
+    Fetch one provider's best `limit` documents for a cross-platform
+    aggregation, sorted on the numeric value of sort_field
+    """
+    # For cross-platform, extract the actual find query
+    from src.app.query_executor.provider_executor import (
+        _extract_find_query_from_schema,
+    )
+
+    provider_lower = provider.lower()
+    db = dbMap.get(provider_lower)
+
+    if db is None:
+        logger.warning(f"Database not available for: {provider_lower}")
+        return [], {"match_count": 0, "execution_error": "DB not configured"}
+
+    collection_name = COLLECTION_MAP.get(provider_lower)
+    coll = db.get_collection(collection_name)
+
+    # Extract the actual find query from the schema structure
+    find_query = _extract_find_query_from_schema(query)
+
+    # If no specific conditions, use empty query to get all documents
+    if not find_query:
+        find_query = {}
+
+    # Translate the find query and the sort field
+    translated_query = build_provider_plan(find_query, provider_lower)
+    db_sort_field = SCHEMA_TO_DB_FIELD_MAP.get(provider_lower, {}).get(
+        sort_field, sort_field
+    )
+
+    try:
+        matched_docs = None
+        if limit and cross_platform_pushdown_enabled():
+            try:
+                matched_docs = _fetch_top_k_documents(
+                    coll, provider_lower, translated_query, db_sort_field,
+                    descending, limit,
+                )
+                if matched_docs is not None:
+                    logger.database(f"Top-{limit} pushed down to {provider_lower}")
+            except Exception as e:
+                logger.warning(
+                    f"Top-K pushdown failed for {provider}, sorting in Python: {e}"
+                )
+        if matched_docs is None:
+            matched_docs = _stream_top_k_documents(
+                coll, provider_lower, translated_query, db_sort_field,
+                descending, limit,
+            )
+        logger.info(f"Kept {len(matched_docs)} documents from {provider}")
+
+        # Add provider info to each document
+        for doc in matched_docs:
+            doc["_provider"] = provider
+            doc["_collection"] = collection_name
+
+        return matched_docs, {
+            "collection": collection_name,
+            "query": translated_query,
+            "sort_field": db_sort_field,
+            "match_count": len(matched_docs),
+            "execution_error": None,
+        }
+
+    except Exception as e:
+        error_msg = f"Query failed for {provider}: {str(e)}"
+        logger.error(error_msg)
+        return [], {
+            "collection": collection_name,
+            "query": translated_query,
+            "match_count": 0,
+            "execution_error": error_msg,
+        }
+
+
 def execute_cross_platform_aggregation(generated_queries, user_query):
-    all_results = []
+    provider_results = []
     execution_results = {}
 
     logger.aggregation("Starting cross-platform aggregation")
@@ -59,85 +256,30 @@ def execute_cross_platform_aggregation(generated_queries, user_query):
     sort_field = generated_queries.get("sort_field", "Number of viewers")
     sort_order = generated_queries.get("sort_order", -1)
     global_limit = generated_queries.get("global_limit", 10)
+    descending = sort_order == -1
 
     logger.aggregation(
         f"Sorting by: {sort_field}, Order: {sort_order}, Limit: {global_limit}"
     )
 
-    # Get data from all providers
-    for provider, query in generated_queries.get("providers", {}).items():
-        provider_lower = provider.lower()
-        db = dbMap.get(provider_lower)
-
-        if db is None:
-            logger.warning(f"Database not available for: {provider_lower}")
-            continue
-
-        collection_name = COLLECTION_MAP.get(provider_lower)
-        coll = db.get_collection(collection_name)
-
-        # For cross-platform, extract the actual find query
-        from src.app.query_executor.provider_executor import _extract_find_query_from_schema
-        
-        # Extract the actual find query from the schema structure
-        find_query = _extract_find_query_from_schema(query)
-        
-        # If no specific conditions, use empty query to get all documents
-        if not find_query:
-            find_query = {}
-        
-        # Translate and execute the find query
-        translated_query = translate_query_to_db_fields(find_query, provider_lower)
-
-        try:
-            cursor = coll.find(translated_query)
-            matched_docs = list(cursor)
-            logger.info(f"Found {len(matched_docs)} documents from {provider}")
-
-            # Add provider info to each document
-            for doc in matched_docs:
-                doc["_provider"] = provider
-                doc["_collection"] = collection_name
-
-            all_results.extend(matched_docs)
-
-            execution_results[provider] = {
-                "collection": collection_name,
-                "query": translated_query,
-                "match_count": len(matched_docs),
-                "execution_error": None,
-            }
-
-        except Exception as e:
-            error_msg = f"Query failed for {provider}: {str(e)}"
-            logger.error(error_msg)
-            execution_results[provider] = {
-                "collection": collection_name,
-                "query": translated_query,
-                "match_count": 0,
-                "execution_error": error_msg,
-            }
-
-    # Perform cross-platform aggregation
-    logger.aggregation(f"Performing aggregation on {len(all_results)} total documents")
-
-    def get_sort_value(doc):
-        value = doc.get(sort_field, 0)
-        if isinstance(value, str):
-            try:
-                return int(value.replace(",", ""))
-            except (ValueError, AttributeError):
-                return 0
-        return value or 0
+    # Each provider returns only its own top documents, already sorted
+    outcomes = execute_provider_queries(
+        generated_queries.get("providers", {}),
+        user_query,
+        lambda provider, query, user_query: _fetch_cross_platform_documents(
+            provider, query, user_query, sort_field, descending, global_limit
+        ),
+    )
+    for provider, (matched_docs, result_info) in outcomes.items():
+        provider_results.append(matched_docs)
+        execution_results[provider] = result_info
 
-    try:
-        # Sort the combined results
-        sorted_results = sorted(
-            all_results, key=get_sort_value, reverse=(sort_order == -1)
-        )
+    total = sum(len(docs) for docs in provider_results)
+    logger.aggregation(f"Merging {total} documents from {len(provider_results)} providers")
 
-        # Apply global limit
-        final_results = sorted_results[:global_limit]
+    try:
+        # k-way merge of the sorted provider lists, then the global limit
+        final_results = merge_top_k(provider_results, descending, global_limit or None)
 
         logger.success(f"Aggregation completed: {len(final_results)} final results")
 
@@ -146,4 +288,4 @@ def execute_cross_platform_aggregation(generated_queries, user_query):
     except Exception as e:
         error_msg = f"Cross-platform aggregation failed: {str(e)}"
         logger.error(error_msg)
-        return [], execution_results
\ No newline at end of file
+        return [], execution_results
@@ -0,0 +1,100 @@
+# src/app/query_executor/concurrent_executor.py
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Tuple
+
+from src.app.utils.logger import logger
+
+# Shared pool - every provider lives on its own cluster, so the queries are
+# network bound and can all be in flight at once
+_provider_pool = ThreadPoolExecutor(
+    max_workers=int(os.getenv("PROVIDER_QUERY_WORKERS", "8")),
+    thread_name_prefix="provider-query",
+)
+
+
+def get_provider_timeout(provider: str) -> float:
+    """
+    Timeout in seconds for one provider's query.
+    PROVIDER_QUERY_TIMEOUT_<PROVIDER> overrides the global PROVIDER_QUERY_TIMEOUT.
+    """
+    default_timeout = os.getenv("PROVIDER_QUERY_TIMEOUT", "30")
+    return float(
+        os.getenv(f"PROVIDER_QUERY_TIMEOUT_{provider.upper()}", default_timeout)
+    )
+
+
+def run_provider_tasks(
+    tasks: Dict[str, Callable[[], Any]],
+) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """
+    Run one task per provider concurrently.
+
+    Returns (results, errors): results for the providers that finished within
+    their timeout, and an error message for the ones that failed or timed out.
+    Latency is set by the slowest provider instead of the sum of all of them.
+    """
+    started = time.monotonic()
+    futures = {
+        provider: _provider_pool.submit(task) for provider, task in tasks.items()
+    }
+
+    results: Dict[str, Any] = {}
+    errors: Dict[str, str] = {}
+
+    for provider, future in futures.items():
+        timeout = get_provider_timeout(provider)
+        remaining = max(0.0, started + timeout - time.monotonic())
+        try:
+            results[provider] = future.result(timeout=remaining)
+        except FutureTimeoutError:
+            future.cancel()
+            errors[provider] = f"Query for {provider} timed out after {timeout:.0f}s"
+            logger.warning(f"⏱️  {errors[provider]} - continuing with partial results")
+        except Exception as e:
+            errors[provider] = f"Query for {provider} failed: {e}"
+            logger.error(errors[provider])
+
+    logger.info(
+        f"⚡ {len(results)}/{len(tasks)} provider queries completed in "
+        f"{time.monotonic() - started:.2f}s"
+    )
+    return results, errors
+
+
+def execute_provider_queries(
+    provider_queries: Dict[str, Any],
+    user_query: str,
+    runner: Callable[[str, Any, str], Tuple[Any, Dict[str, Any]]],
+) -> Dict[str, Tuple[list, Dict[str, Any]]]:
+    """
+    Dispatch runner(provider, query, user_query) for every provider at once.
+
+    Returns {provider: (documents, result_info)} in the order of
+    provider_queries. Providers that failed or timed out get an empty
+    document list and the error in result_info, so callers can carry on with
+    the partial results.
+    """
+    tasks = {
+        provider: (lambda p=provider, q=query: runner(p, q, user_query))
+        for provider, query in provider_queries.items()
+    }
+    results, errors = run_provider_tasks(tasks)
+
+    outcomes = {}
+    for provider in provider_queries:
+        if provider in errors:
+            outcomes[provider] = (
+                [],
+                {
+                    "match_count": 0,
+                    "execution_error": errors[provider],
+                    "timed_out": "timed out" in errors[provider],
+                },
+            )
+        else:
+            docs, result_info = results[provider]
+            outcomes[provider] = (docs or [], result_info)
+    return outcomes
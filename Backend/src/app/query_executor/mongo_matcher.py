@@ -0,0 +1,291 @@
+# src/app/query_executor/mongo_matcher.py
+"""
+In-process evaluation of the MongoDB find-filter subset the LLM emits
+($and/$or/$nor, $regex, equality, $in/$nin, comparisons, $exists, $not).
+"""
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+
+Predicate = Callable[[Dict[str, Any]], bool]
+
+REGEX_METACHARACTERS = set(".^$*+?{}[]()|")
+_MISSING = object()
+
+
+class UnsupportedQueryError(ValueError):
+    """Raised when a filter uses operators the in-process matcher cannot evaluate"""
+
+
+@lru_cache(maxsize=1024)
+def compile_regex(pattern: str, options: str = "") -> "re.Pattern":
+    """Compile a MongoDB $regex/$options pair into a Python pattern"""
+    flags = 0
+    for option in options or "":
+        if option == "i":
+            flags |= re.IGNORECASE
+        elif option == "m":
+            flags |= re.MULTILINE
+        elif option == "s":
+            flags |= re.DOTALL
+        elif option == "x":
+            flags |= re.VERBOSE
+        else:
+            raise UnsupportedQueryError(f"Unsupported $options flag: {option}")
+    try:
+        return re.compile(pattern, flags)
+    except re.error as e:
+        raise UnsupportedQueryError(f"Regex not supported by Python re: {e}")
+
+
+def _split_alternatives(body: str) -> Optional[List[str]]:
+    """Split a regex body on top-level '|', rejecting any nested group"""
+    alternatives, current, i = [], [], 0
+    while i < len(body):
+        char = body[i]
+        if char == "\\" and i + 1 < len(body):
+            current.append(body[i : i + 2])
+            i += 2
+            continue
+        if char in "()":
+            return None
+        if char == "|":
+            alternatives.append("".join(current))
+            current = []
+        else:
+            current.append(char)
+        i += 1
+    alternatives.append("".join(current))
+    return alternatives
+
+
+def _unescape_literal(alternative: str) -> Optional[Tuple[str, bool, bool]]:
+    """Turn one regex alternative into (literal text, leading \\b, trailing \\b)"""
+    leading = alternative.startswith("\\b")
+    if leading:
+        alternative = alternative[2:]
+    trailing = alternative.endswith("\\b") and not alternative.endswith("\\\\b")
+    if trailing:
+        alternative = alternative[:-2]
+
+    literal, i = [], 0
+    while i < len(alternative):
+        char = alternative[i]
+        if char == "\\":
+            if i + 1 >= len(alternative):
+                return None
+            escaped = alternative[i + 1]
+            if escaped == "s" and alternative[i + 2 : i + 3] == "+":
+                literal.append(" ")
+                i += 3
+                continue
+            if escaped.isalnum() or escaped == "_":
+                # Character classes (\d, \w, \s*, ...) are not literals
+                return None
+            literal.append(escaped)
+            i += 2
+            continue
+        if char in REGEX_METACHARACTERS:
+            return None
+        literal.append(char)
+        i += 1
+
+    text = "".join(literal)
+    if not text.strip():
+        return None
+    return text, leading, trailing
+
+
+@lru_cache(maxsize=1024)
+def extract_literal_alternatives(
+    pattern: str, options: str = ""
+) -> Optional[Tuple[Tuple[str, bool, bool], ...]]:
+    """
+    Decompose keyword regexes such as \\b(AI|Machine Learning)\\b into their
+    literal alternatives.
+
+    Returns a tuple of (literal, leading word boundary, trailing word boundary)
+    or None when the pattern is anything more than an alternation of literals.
+    """
+    if not isinstance(pattern, str) or "x" in (options or ""):
+        return None
+
+    body = pattern
+    leading = body.startswith("\\b")
+    if leading:
+        body = body[2:]
+    trailing = body.endswith("\\b") and not body.endswith("\\\\b")
+    if trailing:
+        body = body[:-2]
+
+    grouped = body.startswith("(") and body.endswith(")")
+    if grouped:
+        inner = body[1:-1]
+        if inner.startswith("?:"):
+            inner = inner[2:]
+        body = inner
+
+    alternatives = _split_alternatives(body)
+    if not alternatives:
+        return None
+
+    literals = []
+    last = len(alternatives) - 1
+    for i, alternative in enumerate(alternatives):
+        parsed = _unescape_literal(alternative)
+        if parsed is None:
+            return None
+        text, alt_leading, alt_trailing = parsed
+        # \b(a|b)\b bounds every alternative; in \ba|b\b the anchors bind
+        # tighter than |, so they only belong to the first and last one
+        alt_leading = alt_leading or (leading and (grouped or i == 0))
+        alt_trailing = alt_trailing or (trailing and (grouped or i == last))
+        literals.append((text, alt_leading, alt_trailing))
+
+    return tuple(literals)
+
+
+def _get_field(doc: Dict[str, Any], path: str) -> Any:
+    value = doc
+    for part in path.split("."):
+        if isinstance(value, dict) and part in value:
+            value = value[part]
+        else:
+            return _MISSING
+    return value
+
+
+def _candidates(value: Any) -> List[Any]:
+    """Values an operator is tested against (arrays match element-wise)"""
+    if value is _MISSING:
+        return []
+    if isinstance(value, list):
+        return value + [value]
+    return [value]
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _comparable(a: Any, b: Any) -> bool:
+    return (
+        (_is_number(a) and _is_number(b))
+        or (isinstance(a, str) and isinstance(b, str))
+        or (isinstance(a, ObjectId) and isinstance(b, ObjectId))
+    )
+
+
+def _equals(value: Any, expected: Any) -> bool:
+    if expected is None:
+        return value is _MISSING or value is None
+    return any(candidate == expected for candidate in _candidates(value))
+
+
+def _compile_operator(operator: str, argument: Any, spec: Dict[str, Any]):
+    """Compile one field operator into a predicate over the field value"""
+    if operator == "$regex":
+        if isinstance(argument, re.Pattern):
+            pattern = argument
+        else:
+            pattern = compile_regex(argument, spec.get("$options", ""))
+        return lambda value: any(
+            isinstance(candidate, str) and pattern.search(candidate) is not None
+            for candidate in _candidates(value)
+        )
+    if operator == "$options":
+        return None
+    if operator == "$eq":
+        return lambda value: _equals(value, argument)
+    if operator == "$ne":
+        return lambda value: not _equals(value, argument)
+    if operator in ("$in", "$nin"):
+        if not isinstance(argument, list):
+            raise UnsupportedQueryError(f"{operator} needs an array")
+        matchers = []
+        for item in argument:
+            if isinstance(item, re.Pattern):
+                matchers.append(
+                    lambda value, p=item: any(
+                        isinstance(c, str) and p.search(c) is not None
+                        for c in _candidates(value)
+                    )
+                )
+            else:
+                matchers.append(lambda value, e=item: _equals(value, e))
+        if operator == "$in":
+            return lambda value: any(match(value) for match in matchers)
+        return lambda value: not any(match(value) for match in matchers)
+    if operator in ("$gt", "$gte", "$lt", "$lte"):
+        compare = {
+            "$gt": lambda a, b: a > b,
+            "$gte": lambda a, b: a >= b,
+            "$lt": lambda a, b: a < b,
+            "$lte": lambda a, b: a <= b,
+        }[operator]
+        return lambda value: any(
+            _comparable(candidate, argument) and compare(candidate, argument)
+            for candidate in _candidates(value)
+        )
+    if operator == "$exists":
+        return lambda value: (value is not _MISSING) == bool(argument)
+    if operator == "$not":
+        if isinstance(argument, dict):
+            inner = _compile_field_spec(argument)
+        elif isinstance(argument, re.Pattern):
+            inner = _compile_operator("$regex", argument, {})
+        else:
+            raise UnsupportedQueryError("$not needs an operator expression")
+        return lambda value: not inner(value)
+    raise UnsupportedQueryError(f"Unsupported field operator: {operator}")
+
+
+def _compile_field_spec(spec: Any):
+    if isinstance(spec, dict) and spec and all(k.startswith("$") for k in spec):
+        checks = [
+            check
+            for check in (
+                _compile_operator(operator, argument, spec)
+                for operator, argument in spec.items()
+            )
+            if check is not None
+        ]
+        return lambda value: all(check(value) for check in checks)
+    if isinstance(spec, re.Pattern):
+        return _compile_operator("$regex", spec, {})
+    return lambda value: _equals(value, spec)
+
+
+def compile_filter(query: Optional[Dict[str, Any]]) -> Predicate:
+    """
+    Compile a MongoDB find filter into a predicate over plain documents.
+    Raises UnsupportedQueryError for anything outside the supported subset.
+    """
+    if not query:
+        return lambda doc: True
+    if not isinstance(query, dict):
+        raise UnsupportedQueryError("Filter must be a document")
+
+    checks: List[Predicate] = []
+    for key, value in query.items():
+        if key in ("$and", "$or", "$nor"):
+            if not isinstance(value, list) or not value:
+                raise UnsupportedQueryError(f"{key} needs a non-empty array")
+            children = [compile_filter(child) for child in value]
+            if key == "$and":
+                checks.append(lambda doc, c=children: all(f(doc) for f in c))
+            elif key == "$or":
+                checks.append(lambda doc, c=children: any(f(doc) for f in c))
+            else:
+                checks.append(lambda doc, c=children: not any(f(doc) for f in c))
+        elif key.startswith("$"):
+            raise UnsupportedQueryError(f"Unsupported top-level operator: {key}")
+        else:
+            field_check = _compile_field_spec(value)
+            checks.append(
+                lambda doc, f=key, check=field_check: check(_get_field(doc, f))
+            )
+
+    return lambda doc: all(check(doc) for check in checks)
@@ -0,0 +1,64 @@
+# src/app/query_executor/projection_planner.py
+"""
+Server-side projections: only the fields the pipeline reads (query schema,
+universal schema mapping, relevance scoring, numeric companion fields) are
+sent over the wire. The full document is fetched on demand through
+GET /courses/<provider>/<id>.
+"""
+import os
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+from src.app.ingestion.normalizers import COMPANION_FIELDS
+from src.app.query_generator.query_translator import SCHEMA_TO_DB_FIELD_MAP
+from src.app.relevance_scorer import RelevanceScorer
+from src.app.schema_loader import getSchemasAndSamples
+from src.app.universal_schema import FIELD_MAPPING
+
+# Stages that pass whole input documents through unchanged
+DOCUMENT_PRESERVING_STAGES = {"$match", "$sort", "$limit", "$skip", "$sample"}
+
+
+def projection_enabled() -> bool:
+    return os.getenv("QUERY_PROJECTION", "true").lower() == "true"
+
+
+@lru_cache(maxsize=None)
+def _provider_fields(provider: str) -> frozenset:
+    fields = set(getSchemasAndSamples().get(provider, {}).get("fields", []))
+    fields.update(SCHEMA_TO_DB_FIELD_MAP.get(provider, {}).values())
+    for source_fields in FIELD_MAPPING.values():
+        fields.update(source_fields)
+    fields.update(RelevanceScorer.FIELD_WEIGHTS)
+    fields.update(RelevanceScorer.COMBINED_TEXT_FIELDS)
+    fields.update(COMPANION_FIELDS)
+    return frozenset(fields)
+
+
+def plan_projection(
+    provider: str, extra_fields: Iterable[str] = ()
+) -> Optional[Dict[str, int]]:
+    """
+    Inclusion projection for a provider's documents (_id is always returned),
+    or None when projections are disabled
+    """
+    if not projection_enabled():
+        return None
+    fields = _provider_fields(provider.lower()).union(extra_fields)
+    return {field: 1 for field in sorted(fields)}
+
+
+def apply_pipeline_projection(pipeline: List[dict], provider: str) -> List[dict]:
+    """
+    Append a $project stage to pipelines that only filter, sort and limit the
+    collection's documents; pipelines that reshape documents are left alone
+    """
+    projection = plan_projection(provider)
+    if projection is None or not pipeline:
+        return pipeline
+    for stage in pipeline:
+        if not isinstance(stage, dict) or len(stage) != 1:
+            return pipeline
+        if next(iter(stage)) not in DOCUMENT_PRESERVING_STAGES:
+            return pipeline
+    return pipeline + [{"$project": projection}]
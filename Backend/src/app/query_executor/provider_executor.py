@@ -1,11 +1,30 @@
 # src/app/query_executor/provider_executor.py
+import os
 import re
 import json
 from src.app.db_connection import dbMap, COLLECTION_MAP
-from src.app.query_generator.query_translator import translate_query_to_db_fields
+from src.app.query_generator.query_plan import (
+    build_provider_plan,
+    canonicalize_query,
+    plan_hash,
+    plan_simplification_enabled,
+)
+from src.app.indexing.inverted_index import course_index, to_document_id
+from src.app.query_executor.concurrent_executor import get_provider_timeout
+from src.app.query_executor.projection_planner import plan_projection
+from src.app.query_executor.text_search import (
+    rewrite_regex_to_text,
+    text_score_options,
+    text_search_enabled,
+)
+from src.app.query_cache import canonical_query_key, result_cache
 from bson import ObjectId, Decimal128
+from pymongo.errors import OperationFailure
 import math
 
+# Server error code of a $text query on a collection without a text index
+INDEX_NOT_FOUND_CODE = 27
+
 STOPWORDS = {
     "course",
     "courses",
@@ -215,9 +234,144 @@ def _extract_limit_from_query(query_obj):
     return query_obj, limit_value
 
 
-def execute_provider_query(provider, schema_field_query, user_query):
+def resolve_indexed_query(provider, query, limit_value=None):
+    """
+    Resolve a find query through the in-process course index when possible so
+    MongoDB only has to fetch the matching ids. Returns None when nothing matches.
+    """
+    matched_ids = course_index.match_ids(provider, query)
+
+    if matched_ids is None:
+        return query
+    print(f"📇 Course index matched {len(matched_ids)} {provider} documents")
+    if limit_value:
+        matched_ids = matched_ids[:limit_value]
+    if not matched_ids:
+        return None
+    return {"_id": {"$in": [to_document_id(doc_id) for doc_id in matched_ids]}}
+
+
+def iter_documents(
+    coll, provider, query, limit_value=None, batch_size=None, projection=None
+):
+    """
+    Stream the documents of a find query, resolving it through the in-process
+    course index when possible so MongoDB only has to fetch the matching ids
+    """
+    query = resolve_indexed_query(provider, query, limit_value)
+    if query is None:
+        return
+
+    # $text searches also fetch (and are ordered by) the text score
+    projection, sort = text_score_options(query, projection)
+
+    # Let the server abandon the query once the caller has stopped waiting
+    timeout_ms = int(get_provider_timeout(provider) * 1000)
+    cursor = (
+        coll.find(query, projection)
+        .max_time_ms(timeout_ms)
+        .batch_size(batch_size or get_document_batch_size())
+    )
+    if sort:
+        cursor = cursor.sort(sort)
+    if limit_value:
+        cursor = cursor.limit(limit_value)
+    yield from cursor
+
+
+def find_documents(coll, provider, query, limit_value=None):
+    return list(iter_documents(coll, provider, query, limit_value))
+
+
+def get_document_batch_size():
+    """Documents fetched, sanitized and scored per batch (DOCUMENT_BATCH_SIZE)"""
+    return int(os.getenv("DOCUMENT_BATCH_SIZE", "200"))
+
+
+def iter_batches(documents, batch_size=None):
+    """Group a document stream into lists of batch_size"""
+    batch_size = batch_size or get_document_batch_size()
+    batch = []
+    for doc in documents:
+        batch.append(doc)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def iter_sanitized_batches(coll, provider, query, limit_value=None, extra_fields=()):
+    """
+    Stream sanitized documents in batches, served from the result cache when
+    the same translated query was executed recently. Only result sets up to
+    QUERY_RESULT_CACHE_MAX_DOCS are cached, so memory stays bounded.
+
+    Documents are projected to the fields the pipeline uses (plus extra_fields).
+    """
+    projection = plan_projection(provider, extra_fields)
+    cache_key = canonical_query_key(
+        provider, {"plan": plan_hash(query), "projection": projection}, limit_value
+    )
+    cached_docs = result_cache.get(cache_key)
+    if cached_docs is not None:
+        print(f"💾 Result cache hit for {provider} ({len(cached_docs)} documents)")
+        yield from iter_batches(cached_docs)
+        return
+
+    max_cached_docs = int(os.getenv("QUERY_RESULT_CACHE_MAX_DOCS", "2000"))
+    cacheable = []
+    documents = iter_documents(
+        coll, provider, query, limit_value, projection=projection
+    )
+    for batch in iter_batches(documents):
+        sanitized_batch = [sanitize_doc(doc) for doc in batch]
+        if cacheable is not None:
+            if len(cacheable) + len(sanitized_batch) <= max_cached_docs:
+                cacheable.extend(sanitized_batch)
+            else:
+                cacheable = None
+        yield sanitized_batch
+
+    if cacheable is not None:
+        result_cache.set(cache_key, cacheable)
+
+
+def find_sanitized_documents(coll, provider, query, limit_value=None):
+    """find_documents + sanitize_doc (through the result cache)"""
+    return [
+        doc
+        for batch in iter_sanitized_batches(coll, provider, query, limit_value)
+        for doc in batch
+    ]
+
+
+def fetch_full_document(provider, course_id):
+    """Complete, unprojected document of one course (None when not found)"""
+    provider_lower = provider.lower()
+    db = dbMap.get(provider_lower)
+    if db is None:
+        return None
+    coll = db.get_collection(COLLECTION_MAP.get(provider_lower))
+    doc = coll.find_one({"_id": to_document_id(course_id)})
+    return sanitize_doc(doc) if doc else None
+
+
+def _consume_batches(batches, consume_batch):
+    """Feed every batch to consume_batch; returns the number of documents"""
+    count = 0
+    for batch in batches:
+        count += len(batch)
+        consume_batch(batch)
+    return count
+
+
+def execute_provider_query(provider, schema_field_query, user_query, consume_batch=None):
     """
     Execute query for a specific provider with fallback mechanism
+
+    With consume_batch the sanitized documents are streamed to it batch by
+    batch (nothing is accumulated) and an empty document list is returned.
     """
     provider_lower = provider.lower()
     db = dbMap.get(provider_lower)
@@ -253,11 +407,17 @@ def execute_provider_query(provider, schema_field_query, user_query):
     clean_find_query, limit_value = _extract_limit_from_query(find_query)
     print(f"📏 Extracted limit: {limit_value}")
 
-    # STEP 3: Translate query from schema fields to database fields
-    db_field_query = translate_query_to_db_fields(clean_find_query, provider_lower)
+    # STEP 3: Translate query from schema fields to database fields and simplify it
+    db_field_query = build_provider_plan(clean_find_query, provider_lower)
 
     print(f"🔄 Translated Database Query: {json.dumps(db_field_query, indent=2)}")
 
+    regex_query = db_field_query
+    if text_search_enabled():
+        db_field_query = rewrite_regex_to_text(regex_query) or regex_query
+        if db_field_query is not regex_query:
+            print(f"🔎 Text search query: {json.dumps(db_field_query)}")
+
     final_query_used = db_field_query
     used_fallback = False
     execution_error = None
@@ -267,38 +427,62 @@ def execute_provider_query(provider, schema_field_query, user_query):
         print(f"🚀 Executing find query on {provider_lower}.{collection_name}")
 
         if limit_value:
-            cursor = coll.find(db_field_query).limit(limit_value)
             print(f"📏 Applying limit: {limit_value}")
-        else:
-            cursor = coll.find(db_field_query)
 
-        matched_docs = list(cursor)
+        sanitized_docs = []
+        sink = consume_batch or sanitized_docs.extend
+        consumed_batches = []
 
-        print(f"📄 Found {len(matched_docs)} documents with primary query")
+        def tracked_sink(batch):
+            consumed_batches.append(len(batch))
+            sink(batch)
+
+        try:
+            match_count = _consume_batches(
+                iter_sanitized_batches(coll, provider_lower, db_field_query, limit_value),
+                tracked_sink,
+            )
+        except OperationFailure as e:
+            # Only a missing text index is recoverable, and only before any
+            # document reached the sink (a rerun would duplicate them)
+            if (
+                db_field_query is regex_query
+                or e.code != INDEX_NOT_FOUND_CODE
+                or consumed_batches
+            ):
+                raise
+            # No usable text index on this collection: run the regex query instead
+            print(f"⚠️ Text search unavailable on {provider_lower} ({e}), using regex")
+            final_query_used = regex_query
+            match_count = _consume_batches(
+                iter_sanitized_batches(coll, provider_lower, regex_query, limit_value),
+                sink,
+            )
+
+        print(f"📄 Found {match_count} documents with primary query")
 
         # Fallback if no results
-        if len(matched_docs) == 0:
+        if match_count == 0:
             print("🔄 No results with primary query, trying fallback...")
             used_fallback = True
             fallback_query = build_keyword_fallback_query(user_query, provider_lower)
+            if plan_simplification_enabled():
+                fallback_query = canonicalize_query(fallback_query)
+            if text_search_enabled() and final_query_used is not regex_query:
+                fallback_query = rewrite_regex_to_text(fallback_query) or fallback_query
             final_query_used = fallback_query
             print(f"🔄 Fallback Query: {json.dumps(fallback_query, indent=2)}")
 
-            if limit_value:
-                cursor = coll.find(fallback_query).limit(limit_value)
-            else:
-                cursor = coll.find(fallback_query)
-
-            matched_docs = list(cursor)
-            print(f"📄 Found {len(matched_docs)} documents with fallback query")
-
-        # Sanitize documents
-        sanitized_docs = [sanitize_doc(doc) for doc in matched_docs]
+            match_count = _consume_batches(
+                iter_sanitized_batches(coll, provider_lower, fallback_query, limit_value),
+                sink,
+            )
+            print(f"📄 Found {match_count} documents with fallback query")
 
         result_info = {
             "collection": collection_name,
             "query": final_query_used,
-            "match_count": len(sanitized_docs),
+            "match_count": match_count,
             "used_fallback": used_fallback,
             "limit_applied": limit_value,
             "execution_error": execution_error,
@@ -0,0 +1,109 @@
+# src/app/query_executor/text_search.py
+"""
+QUERY_EXECUTION_MODE=text: keyword regex conditions become $text searches.
+
+An $or of case-insensitive single-word keyword regexes over text-indexed
+fields (e.g. "\\b(AI|Python)\\b" on Title and Skills) is answered by the
+collection's weighted text index instead of a collection scan; documents come
+back ordered by textScore.
+
+Multi-word literals keep the regex: unquoted words in $search are OR-ed (so
+"Machine Learning" would match anything mentioning "learning") and quoted
+phrases are AND-ed, so neither can express the regex alternation.
+"""
+import os
+import re
+from typing import Any, Dict, List, Optional
+
+from src.app.ingestion.index_manager import TEXT_INDEX_WEIGHTS
+from src.app.query_executor.mongo_matcher import extract_literal_alternatives
+
+TEXT_SCORE_FIELD = "_text_score"
+
+_SINGLE_WORD = re.compile(r"\w+")
+
+
+def text_search_enabled() -> bool:
+    return os.getenv("QUERY_EXECUTION_MODE", "regex").lower() == "text"
+
+
+def _condition_terms(condition: Any) -> Optional[List[str]]:
+    """Search terms of a {field: {"$regex": ..., "$options": "i"}} condition"""
+    if not isinstance(condition, dict) or len(condition) != 1:
+        return None
+    field, spec = next(iter(condition.items()))
+    if field not in TEXT_INDEX_WEIGHTS or not isinstance(spec, dict):
+        return None
+    if set(spec) - {"$regex", "$options"} or "i" not in spec.get("$options", ""):
+        return None
+    literals = extract_literal_alternatives(spec.get("$regex"), spec.get("$options", ""))
+    if not literals:
+        return None
+    # $text only matches whole words: every term needs \b on both sides
+    if not all(leading and trailing for _, leading, trailing in literals):
+        return None
+    terms = [literal for literal, _, _ in literals]
+    if not all(_SINGLE_WORD.fullmatch(term) for term in terms):
+        return None
+    return terms
+
+
+def _keyword_terms(filter_obj: Dict[str, Any]) -> Optional[List[str]]:
+    """Terms of a filter that is a single keyword condition or an $or of them"""
+    conditions = filter_obj["$or"] if list(filter_obj) == ["$or"] else [filter_obj]
+    if not isinstance(conditions, list) or not conditions:
+        return None
+    terms = []
+    for condition in conditions:
+        condition_terms = _condition_terms(condition)
+        if condition_terms is None:
+            return None
+        terms.extend(term for term in condition_terms if term not in terms)
+    return terms
+
+
+def _text_condition(terms: List[str]) -> Dict[str, Any]:
+    # Unquoted single words are OR-ed, like the regex alternation
+    return {"$text": {"$search": " ".join(terms)}}
+
+
+def rewrite_regex_to_text(query: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    $text version of a translated find filter, or None when it has no keyword
+    part the text index can answer. Inside an $and only the first keyword
+    $or is rewritten (a query can hold a single $text).
+    """
+    if not isinstance(query, dict) or not query:
+        return None
+
+    terms = _keyword_terms(query)
+    if terms:
+        return _text_condition(terms)
+
+    if list(query) == ["$and"] and isinstance(query["$and"], list):
+        conditions = list(query["$and"])
+        for i, condition in enumerate(conditions):
+            if not isinstance(condition, dict) or not condition:
+                continue
+            terms = _keyword_terms(condition)
+            if terms:
+                conditions[i] = _text_condition(terms)
+                return {"$and": conditions}
+    return None
+
+
+def text_score_options(query: Dict[str, Any], projection: Optional[Dict[str, Any]]):
+    """(projection, sort) adding the textScore to $text queries"""
+    if not isinstance(query, dict) or not _has_text(query):
+        return projection, None
+    score = {"$meta": "textScore"}
+    return {**(projection or {}), TEXT_SCORE_FIELD: score}, [(TEXT_SCORE_FIELD, score)]
+
+
+def _has_text(query: Dict[str, Any]) -> bool:
+    if "$text" in query:
+        return True
+    return any(
+        isinstance(condition, dict) and "$text" in condition
+        for condition in query.get("$and", [])
+    )
@@ -0,0 +1,135 @@
+# src/app/query_executor/top_k_planner.py
+"""
+Top-K pushdown for cross-platform aggregations.
+
+Instead of fetching every matching document and sorting in Python, each
+provider runs $match -> $addFields(numeric sort value) -> $sort -> $limit K,
+and the already sorted per-provider lists are k-way merged. Collections with
+ingested numeric companion fields (viewers_count, ...) sort on those indexed
+fields directly; otherwise stored values like "10,438" are converted on the fly.
+
+Rating, Number of viewers and Duration need the ingestion parsers ("4.9stars"
+is 4.9, not 0), which $convert cannot express: without their companion field
+they are sorted by the Python fallback, so both paths rank by the same value.
+"""
+import heapq
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional
+
+from src.app.ingestion.normalizers import (
+    NUMERIC_COMPANION_FIELDS,
+    parse_duration,
+    parse_rating,
+    parse_viewers,
+)
+
+SORT_VALUE_FIELD = "_sort_value"
+
+
+def numeric_sort_value(value: Any) -> float:
+    """Python counterpart of numeric_sort_expression"""
+    if isinstance(value, bool) or value is None:
+        return 0
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        return float(str(value).replace(",", ""))
+    except ValueError:
+        return 0
+
+
+RAW_FIELD_PARSERS = {
+    "Rating": parse_rating,
+    "Number of viewers": parse_viewers,
+    "Duration": lambda value: parse_duration(value)[0],
+}
+
+
+def document_sort_value(doc: Dict[str, Any], field: str) -> float:
+    """Numeric sort value of a document: companion field, then the parsed raw value"""
+    companion = NUMERIC_COMPANION_FIELDS.get(field)
+    if companion and doc.get(companion) is not None:
+        return doc[companion]
+    parser = RAW_FIELD_PARSERS.get(field)
+    if parser:
+        return parser(doc.get(field)) or 0
+    return numeric_sort_value(doc.get(field))
+
+
+def can_push_down(sort_field: str, numeric_field: Optional[str]) -> bool:
+    """Whether the server computes the same sort value as document_sort_value"""
+    return numeric_field is not None or sort_field not in RAW_FIELD_PARSERS
+
+
+def numeric_sort_expression(field: str) -> Dict[str, Any]:
+    """Aggregation expression turning numbers and "10,438"-style strings into doubles"""
+    return {
+        "$convert": {
+            "input": {
+                "$replaceAll": {
+                    "input": {"$toString": f"${field}"},
+                    "find": ",",
+                    "replacement": "",
+                }
+            },
+            "to": "double",
+            "onError": 0,
+            "onNull": 0,
+        }
+    }
+
+
+def build_top_k_pipeline(
+    match_query: Dict[str, Any],
+    sort_field: str,
+    descending: bool,
+    limit: int,
+    projection: Optional[Dict[str, int]] = None,
+    numeric_field: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Pipeline returning one provider's best `limit` documents, best first.
+    With numeric_field (an ingested, indexed companion of sort_field) the sort
+    runs on it directly and the sort value is only attached to the top K.
+    """
+    direction = -1 if descending else 1
+    pipeline = []
+    if match_query:
+        pipeline.append({"$match": match_query})
+    if numeric_field:
+        pipeline += [
+            {"$sort": {numeric_field: direction, "_id": 1}},
+            {"$limit": limit},
+            {
+                "$addFields": {
+                    SORT_VALUE_FIELD: {"$ifNull": [f"${numeric_field}", 0]}
+                }
+            },
+        ]
+    else:
+        pipeline += [
+            {"$addFields": {SORT_VALUE_FIELD: numeric_sort_expression(sort_field)}},
+            {"$sort": {SORT_VALUE_FIELD: direction, "_id": 1}},
+            {"$limit": limit},
+        ]
+    if projection:
+        pipeline.append({"$project": {**projection, SORT_VALUE_FIELD: 1}})
+    return pipeline
+
+
+def merge_top_k(
+    sorted_lists: Iterable[List[Dict[str, Any]]],
+    descending: bool,
+    limit: Optional[int],
+) -> List[Dict[str, Any]]:
+    """
+    k-way merge of per-provider lists already sorted on SORT_VALUE_FIELD;
+    ties keep provider order (limit None keeps everything)
+    """
+    merged = heapq.merge(
+        *sorted_lists, key=lambda doc: doc[SORT_VALUE_FIELD], reverse=descending
+    )
+    top = list(islice(merged, limit))
+    for doc in top:
+        doc.pop(SORT_VALUE_FIELD, None)
+    return top
@@ -1,73 +1,20 @@
 import json
-import re
 import time
 import random
-import google.generativeai as genai
-import os
 from src.app.schema_loader import getSchemasAndSamples
 from src.app.utils.logger import logger
-
-# Configure Gemini with rate limiting
-last_request_time = 0
-
-
-def _enforce_rate_limit():
-    global last_request_time
-    current_time = time.time()
-    time_since_last_request = current_time - last_request_time
-    if time_since_last_request < 3.0:
-        sleep_time = 3.0 - time_since_last_request
-        time.sleep(sleep_time)
-    last_request_time = time.time()
-
-
-def _find_balanced_json(text: str):
-    # Strip markdown code blocks
-    text = re.sub(r"```(?:json)?", "", text, flags=re.IGNORECASE).strip()
-
-    # Try to find the largest outer bracket pair
-    match = re.search(r"\{.*\}", text, re.DOTALL)
-    if match:
-        candidate = match.group()
-        try:
-            return json.loads(candidate)
-        except json.JSONDecodeError:
-            pass
-
-    # Fallback to stack method if regex fails
-    starts = [i for i, c in enumerate(text) if c == "{"]
-    candidates = []
-    for i in starts:
-        depth = 0
-        for j in range(i, len(text)):
-            if text[j] == "{":
-                depth += 1
-            elif text[j] == "}":
-                depth -= 1
-                if depth == 0:
-                    candidates.append(text[i : j + 1])
-                    break
-    candidates.sort(key=len, reverse=True)
-    for cand in candidates:
-        try:
-            return json.loads(cand)
-        except Exception:
-            continue
-    return None
+from src.app.llm_client import llm_client
+from src.app.utils.json_extract import extract_json_object
 
 
 def call_gemini_with_retry(prompt, max_retries=2):
     for attempt in range(max_retries + 1):
         try:
-            _enforce_rate_limit()
             # logger.llm(f"Calling Gemini API (attempt {attempt + 1}/{max_retries + 1})") # Optional logging
+            response_text = llm_client.generate(prompt, caller="query_generation")
 
-            genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-            model = genai.GenerativeModel("gemini-2.0-flash")
-            response = model.generate_content(prompt)
-
-            if response.text:
-                return response.text
+            if response_text:
+                return response_text
             else:
                 raise ValueError("Empty response from Gemini")
 
@@ -286,7 +233,7 @@ def generate_queries(user_query):
             logger.warning("Empty response from Gemini")
             return {"query_type": "SPJ", "providers": {}}
 
-        parsed = _find_balanced_json(raw_text)
+        parsed = extract_json_object(raw_text)
 
         if parsed is None:
             logger.warning("Could not parse JSON from LLM response")
@@ -0,0 +1,294 @@
+# src/app/query_generator/query_plan.py
+"""
+Query-plan IR for translated provider filters.
+
+A filter is parsed into a boolean tree of (field, op, operand) predicates,
+simplified and written back as a MongoDB filter:
+
+- nested $and/$or groups are folded into their parent, single-child groups
+  are unwrapped and duplicate children are dropped
+- keyword regexes on the same field inside an $or are merged into one
+  alternation (\\b(AI|Machine Learning)\\b), without duplicate alternatives
+- children and alternatives are put in a canonical order
+
+Only boolean-equivalent rewrites are made, so a plan matches the same
+documents as the LLM query. Equivalent plans serialize identically, which
+makes plan_hash a stable key for executor results.
+"""
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from bson import json_util
+
+from src.app.query_executor.mongo_matcher import (
+    REGEX_METACHARACTERS,
+    extract_literal_alternatives,
+)
+from src.app.query_generator.query_translator import (
+    FILTER_OPERATORS,
+    rewrite_numeric_fields,
+    translate_query_to_db_fields,
+)
+
+LOGICAL_OPERATORS = ("$and", "$or", "$nor")
+WORD_BOUNDARY = "\\b"
+
+
+class Predicate(NamedTuple):
+    """
+    One field condition. op is "$regex" (operand: (pattern, options)), "$eq"
+    (operand: the value) or "$cond" (operand: any other condition, as is)
+    """
+
+    field: str
+    op: str
+    operand: Any
+
+
+class Group(NamedTuple):
+    op: str  # $and, $or or $nor
+    children: Tuple[Any, ...]
+
+
+PlanNode = Union[Predicate, Group]
+
+
+def plan_simplification_enabled() -> bool:
+    return os.getenv("QUERY_PLAN_SIMPLIFY", "true").lower() == "true"
+
+
+def _canonical_json(value: Any) -> str:
+    return json.dumps(
+        value, sort_keys=True, default=json_util.default, ensure_ascii=False
+    )
+
+
+# Parsing ----------------------------------------------------------------
+
+
+def _parse_condition(field: str, condition: Any) -> Predicate:
+    if isinstance(condition, dict):
+        if (
+            "$regex" in condition
+            and set(condition) <= {"$regex", "$options"}
+            and isinstance(condition["$regex"], str)
+            and isinstance(condition.get("$options", ""), str)
+        ):
+            options = "".join(sorted(set(condition.get("$options", ""))))
+            return Predicate(field, "$regex", (condition["$regex"], options))
+        return Predicate(field, "$cond", condition)
+    return Predicate(field, "$eq", condition)
+
+
+def parse_filter(filter_obj: Dict[str, Any]) -> PlanNode:
+    """Boolean tree of a MongoDB filter (a multi-key filter is an implicit $and)"""
+    children = []
+    for key, value in filter_obj.items():
+        if (
+            key in LOGICAL_OPERATORS
+            and isinstance(value, list)
+            and all(isinstance(item, dict) for item in value)
+        ):
+            children.append(Group(key, tuple(parse_filter(item) for item in value)))
+        else:
+            # Field conditions and other top-level operators ($text, $expr, ...)
+            children.append(_parse_condition(key, value))
+    if len(children) == 1:
+        return children[0]
+    return Group("$and", tuple(children))
+
+
+# Simplification ---------------------------------------------------------
+
+
+def _escape_literal(text: str) -> str:
+    return "".join(
+        f"\\{char}" if char in REGEX_METACHARACTERS or char == "\\" else char
+        for char in text
+    )
+
+
+def _keyword_literals(predicate: Predicate) -> Optional[Tuple[Tuple[str, bool, bool], ...]]:
+    """Literal alternatives of a keyword regex predicate (None for other regexes)"""
+    if predicate.op != "$regex":
+        return None
+    pattern, options = predicate.operand
+    # \s+ is read as a plain space by the literal extraction: keep those patterns
+    if "\\s" in pattern:
+        return None
+    return extract_literal_alternatives(pattern, options)
+
+
+def _bounded(body: str, leading: bool, trailing: bool) -> str:
+    return f"{WORD_BOUNDARY if leading else ''}{body}{WORD_BOUNDARY if trailing else ''}"
+
+
+def _alternation(
+    literals: List[Tuple[str, bool, bool]], case_insensitive: bool
+) -> str:
+    """Canonical regex for a set of (literal, leading \\b, trailing \\b)"""
+    unique = {}
+    for text, leading, trailing in literals:
+        key = (text.lower() if case_insensitive else text, leading, trailing)
+        unique.setdefault(key, (text, leading, trailing))
+    ordered = [unique[key] for key in sorted(unique)]
+
+    boundaries = {(leading, trailing) for _, leading, trailing in ordered}
+    if len(boundaries) == 1:
+        # Shared boundaries go around the group: \b(AI|Machine Learning)\b
+        body = "|".join(_escape_literal(text) for text, _, _ in ordered)
+        if len(ordered) > 1:
+            body = f"({body})"
+        return _bounded(body, *boundaries.pop())
+
+    alternatives = "|".join(
+        _bounded(_escape_literal(text), leading, trailing)
+        for text, leading, trailing in ordered
+    )
+    return f"({alternatives})"
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+def keyword_regex(terms: List[str], case_insensitive: bool = True) -> str:
+    """
+    Alternation matching any of the terms as whole words (no \\b next to a
+    non-word character, so "C++" and "C#" still match)
+    """
+    literals = [
+        (term, _is_word_char(term[0]), _is_word_char(term[-1])) for term in terms if term
+    ]
+    return _alternation(literals, case_insensitive)
+
+
+def _normalize_keyword_regex(predicates: List[Predicate]) -> Predicate:
+    """One predicate matching when any of the keyword regex predicates matches"""
+    field, options = predicates[0].field, predicates[0].operand[1]
+    literals = [
+        literal for predicate in predicates for literal in _keyword_literals(predicate)
+    ]
+    return Predicate(field, "$regex", (_alternation(literals, "i" in options), options))
+
+
+def _merge_or_regexes(children: List[PlanNode]) -> List[PlanNode]:
+    """Merge the keyword regexes of an $or that test the same field with the same options"""
+    keyword_groups: Dict[Tuple[str, str], List[Predicate]] = {}
+    others = []
+    for child in children:
+        if isinstance(child, Predicate) and _keyword_literals(child):
+            key = (child.field, child.operand[1])
+            keyword_groups.setdefault(key, []).append(child)
+        else:
+            others.append(child)
+    # Children are sorted afterwards, so their relative order does not matter
+    return others + [
+        _normalize_keyword_regex(predicates) for predicates in keyword_groups.values()
+    ]
+
+
+def _sort_key(node: PlanNode) -> str:
+    return _canonical_json(to_filter(node))
+
+
+def simplify(node: PlanNode) -> PlanNode:
+    if isinstance(node, Predicate):
+        if _keyword_literals(node):
+            return _normalize_keyword_regex([node])
+        return node
+
+    children = [simplify(child) for child in node.children]
+    if node.op in ("$and", "$or"):
+        folded = []
+        for child in children:
+            if isinstance(child, Group) and child.op == node.op and child.children:
+                folded.extend(child.children)
+            else:
+                folded.append(child)
+        children = folded
+        if node.op == "$or":
+            children = _merge_or_regexes(children)
+
+    unique = {}
+    for child in children:
+        unique.setdefault(_sort_key(child), child)
+    children = [unique[key] for key in sorted(unique)]
+
+    if node.op in ("$and", "$or") and len(children) == 1:
+        return children[0]
+    return Group(node.op, tuple(children))
+
+
+# Serialization ----------------------------------------------------------
+
+
+def _predicate_condition(predicate: Predicate) -> Any:
+    if predicate.op == "$regex":
+        pattern, options = predicate.operand
+        condition = {"$regex": pattern}
+        if options:
+            condition["$options"] = options
+        return condition
+    return predicate.operand
+
+
+def to_filter(node: PlanNode) -> Dict[str, Any]:
+    if isinstance(node, Predicate):
+        return {node.field: _predicate_condition(node)}
+
+    children = [to_filter(child) for child in node.children]
+    if node.op == "$and":
+        # Write an implicit $and when every child has its own top-level keys
+        keys = [key for child in children for key in child]
+        if len(keys) == len(set(keys)):
+            return {key: value for child in children for key, value in child.items()}
+    return {node.op: children}
+
+
+# Public helpers ---------------------------------------------------------
+
+
+def canonicalize_filter(filter_obj: Dict[str, Any]) -> Dict[str, Any]:
+    """Simplified, canonically ordered equivalent of a find filter"""
+    if not isinstance(filter_obj, dict) or not filter_obj:
+        return filter_obj
+    return to_filter(simplify(parse_filter(filter_obj)))
+
+
+def canonicalize_query(query_obj: Any) -> Any:
+    """canonicalize_filter for a find filter, a $match stage or a pipeline"""
+    if isinstance(query_obj, list):
+        return [canonicalize_query(stage) for stage in query_obj]
+    if not isinstance(query_obj, dict):
+        return query_obj
+
+    stage_names = [
+        key for key in query_obj if key.startswith("$") and key not in FILTER_OPERATORS
+    ]
+    if len(query_obj) != 1 or not stage_names:
+        return canonicalize_filter(query_obj)
+    if "$match" in query_obj and isinstance(query_obj["$match"], dict):
+        return {"$match": canonicalize_filter(query_obj["$match"])}
+    return query_obj
+
+
+def plan_hash(query_obj: Any) -> str:
+    """Stable hash of a query: equivalent plans hash the same"""
+    return hashlib.sha256(
+        _canonical_json(canonicalize_query(query_obj)).encode("utf-8")
+    ).hexdigest()
+
+
+def build_provider_plan(query_obj: Any, provider: str) -> Any:
+    """
+    Translate a schema-field query (filter, stage or pipeline) to the
+    provider's database fields, point numeric comparisons at the companion
+    fields and simplify it (unless QUERY_PLAN_SIMPLIFY=false)
+    """
+    plan = rewrite_numeric_fields(translate_query_to_db_fields(query_obj, provider))
+    if plan_simplification_enabled():
+        plan = canonicalize_query(plan)
+    return plan
@@ -1,4 +1,7 @@
 # src/app/query_generator/query_translator.py
+from src.app.ingestion.normalizers import NUMERIC_COMPANION_FIELDS
+from src.app.utils.logger import logger
+
 SCHEMA_TO_DB_FIELD_MAP = {
     "coursera": {
         "Course Title": "Title",
@@ -89,7 +92,7 @@ def translate_query_to_db_fields(query_obj, provider):
         # Translate field names (skip operators starting with $)
         if not key.startswith("$") and key in translation_map:
             new_key = translation_map[key]
-            print(f"🔧 Translating '{key}' → '{new_key}' for {provider}")
+            logger.debug(f"🔧 Translating '{key}' → '{new_key}' for {provider}")
         else:
             new_key = key
 
@@ -108,4 +111,94 @@ def translate_query_to_db_fields(query_obj, provider):
         else:
             translated_obj[new_key] = value
 
-    return translated_obj
\ No newline at end of file
+    return translated_obj
+
+
+FILTER_OPERATORS = {"$and", "$or", "$nor", "$expr", "$text", "$where"}
+NUMERIC_OPERATORS = {"$eq", "$ne", "$gt", "$gte", "$lt", "$lte", "$in", "$nin"}
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _is_numeric_condition(value):
+    if _is_number(value):
+        return True
+    if not isinstance(value, dict) or not value:
+        return False
+    for operator, operand in value.items():
+        if operator not in NUMERIC_OPERATORS:
+            return False
+        operands = operand if isinstance(operand, list) else [operand]
+        if not operands or not all(_is_number(item) for item in operands):
+            return False
+    return True
+
+
+def numeric_companion_condition(field, condition):
+    """
+    Condition on the numeric companion of field, falling back to the raw
+    field for documents that were not normalized yet (no backfill/re-import)
+    """
+    companion = NUMERIC_COMPANION_FIELDS[field]
+    return {
+        "$or": [
+            {companion: condition},
+            {companion: {"$exists": False}, field: condition},
+        ]
+    }
+
+
+def rewrite_numeric_filter(filter_obj):
+    """
+    Point numeric comparisons on free-text fields ({"Rating": {"$gte": 4.5}})
+    at their numeric companion fields ({"rating_value": {"$gte": 4.5}}),
+    keeping the raw-field comparison for documents without the companion
+    """
+    rewritten = {}
+    companion_conditions = []
+    for key, value in filter_obj.items():
+        if key in ("$and", "$or", "$nor") and isinstance(value, list):
+            rewritten[key] = [
+                rewrite_numeric_filter(item) if isinstance(item, dict) else item
+                for item in value
+            ]
+        elif key in NUMERIC_COMPANION_FIELDS and _is_numeric_condition(value):
+            companion_conditions.append(numeric_companion_condition(key, value))
+        else:
+            rewritten[key] = value
+
+    if not companion_conditions:
+        return rewritten
+    conditions = ([rewritten] if rewritten else []) + companion_conditions
+    return conditions[0] if len(conditions) == 1 else {"$and": conditions}
+
+
+def rewrite_numeric_fields(query_obj):
+    """
+    Rewrite a translated find filter or aggregation stage (or pipeline) to use
+    the numeric companion fields for comparisons and $sort keys
+    """
+    if isinstance(query_obj, list):
+        return [rewrite_numeric_fields(stage) for stage in query_obj]
+    if not isinstance(query_obj, dict):
+        return query_obj
+
+    stage_names = [
+        key for key in query_obj if key.startswith("$") and key not in FILTER_OPERATORS
+    ]
+    if len(query_obj) != 1 or not stage_names:
+        return rewrite_numeric_filter(query_obj)
+
+    stage, body = next(iter(query_obj.items()))
+    if stage == "$match" and isinstance(body, dict):
+        return {stage: rewrite_numeric_filter(body)}
+    if stage == "$sort" and isinstance(body, dict):
+        return {
+            stage: {
+                NUMERIC_COMPANION_FIELDS.get(field, field): order
+                for field, order in body.items()
+            }
+        }
+    return query_obj
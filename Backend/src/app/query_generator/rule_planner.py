@@ -0,0 +1,285 @@
+# src/app/query_generator/rule_planner.py
+"""
+Deterministic planner for simple keyword queries ("python", "Data Science
+courses from Udacity", "beginner AI courses").
+
+Each word of the query is classified as a known topic or technology, a
+course level, a provider name or filler. The planner is confident when
+almost every content word is recognized and nothing calls for the LLM's
+judgement (numbers, ratings, durations, negations, rankings...). Confident
+queries get their provider queries built directly, in the same shape
+generate_queries returns; everything else still goes through the LLM.
+"""
+import os
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+import jellyfish
+
+from src.app.db_connection import PROVIDERS
+from src.app.indexing.expansion_dictionary import expansion_dictionary
+from src.app.query_executor.provider_executor import STOPWORDS
+from src.app.query_generator.query_plan import keyword_regex
+from src.app.relevance_scorer import relevance_scorer
+from src.app.schema_loader import getSchemasAndSamples
+from src.app.utils.logger import logger
+
+# Same expansions the LLM prompt asks for; other topics come from the learned
+# expansion dictionary
+TOPIC_EXPANSIONS = {
+    "ai": ["AI", "Artificial Intelligence", "Machine Learning", "Deep Learning",
+           "Neural Networks", "NLP", "Computer Vision"],
+    "artificial intelligence": ["Artificial Intelligence", "AI", "Machine Learning",
+                                "Deep Learning", "Neural Networks"],
+    "machine learning": ["Machine Learning", "Deep Learning", "Neural Networks",
+                         "Artificial Intelligence"],
+    "deep learning": ["Deep Learning", "Neural Networks"],
+    "reinforcement learning": ["Reinforcement Learning"],
+    "nlp": ["NLP", "Natural Language Processing"],
+    "natural language processing": ["Natural Language Processing", "NLP"],
+    "computer vision": ["Computer Vision", "Image Processing"],
+    "cyber security": ["Cyber Security", "Cybersecurity", "Network Security",
+                       "Ethical Hacking", "InfoSec", "Penetration Testing"],
+    "ethical hacking": ["Ethical Hacking", "Penetration Testing"],
+    "web development": ["Web Development", "HTML", "CSS", "JavaScript", "React",
+                        "Full Stack", "Frontend", "Backend"],
+    "data science": ["Data Science", "Data Analysis", "Statistics", "Big Data",
+                     "Pandas", "Python"],
+    "data analysis": ["Data Analysis", "Data Analytics", "Statistics"],
+    "database": ["Database", "DBMS", "SQL"],
+    "cloud computing": ["Cloud Computing", "AWS", "Azure", "Google Cloud"],
+}
+TOPIC_ALIASES = {
+    "artificial intelligence": "artificial intelligence",
+    "cybersecurity": "cyber security",
+    "web dev": "web development",
+    "data analytics": "data analysis",
+    "databases": "database",
+    "dbms": "database",
+    "ml": "machine learning",
+    "cloud": "cloud computing",
+}
+
+PROVIDER_ALIASES = {
+    "coursera": "coursera",
+    "course era": "coursera",
+    "udacity": "udacity",
+    "uda city": "udacity",
+    "simplilearn": "simplilearn",
+    "simpli learn": "simplilearn",
+    "simply learn": "simplilearn",
+    "futurelearn": "futurelearn",
+    "future learn": "futurelearn",
+}
+# Typos of provider names ("SImplilern") still count above this similarity
+PROVIDER_NAME_SIMILARITY = 0.9
+
+LEVEL_ALIASES = {"basic": "beginner", "fundamental": "beginner", "intro": "beginner"}
+
+FILLER_WORDS = STOPWORDS | {
+    "a", "an", "the", "i", "you", "can", "could", "please", "want", "need",
+    "looking", "find", "get", "give", "suggest", "some", "about", "on", "in",
+    "for", "of", "to", "and", "or", "&", "with", "related", "platforms",
+    "level", "levels", "friendly", "tutorial", "tutorials", "lesson",
+    "lessons", "programming", "hey", "interested", "teach", "teaches", "so",
+    "just", "like", "something", "kind", "other",
+}
+
+# Words that need the LLM: constraints, negations, rankings and multi-part requests
+BLOCKING_WORDS = {
+    "not", "no", "without", "except", "exclude", "excluding", "ignore", "but",
+    "also", "each", "per", "top", "best", "most", "least", "highest", "lowest",
+    "minimum", "maximum", "min", "max", "average", "count", "many", "compare",
+    "rating", "rated", "ratings", "viewers", "views", "popular", "cheap",
+    "cheapest", "price", "free", "paid", "short", "long", "quick", "hour",
+    "hours", "day", "days", "week", "weeks", "month", "months", "year", "years",
+    "duration", "under", "over", "less", "more", "than", "between",
+}
+
+# Fields searched for topics (the LLM prompt's target fields), where a provider has them
+SEARCH_FIELDS = ["Title", "Short Intro", "Skills", "Category", "What you learn"]
+LEVEL_FIELD = "Level"
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9&][a-z0-9+#.]*")
+
+
+def rule_planner_enabled() -> bool:
+    return os.getenv("RULE_PLANNER_ENABLED", "true").lower() == "true"
+
+
+def get_min_confidence() -> float:
+    return float(os.getenv("RULE_PLANNER_MIN_CONFIDENCE", "0.8"))
+
+
+def tokenize_query(user_query: str) -> List[str]:
+    return [token.rstrip(".") for token in _TOKEN_PATTERN.findall(user_query.lower())]
+
+
+def _match_phrase(tokens: List[str], i: int, phrases) -> Optional[Tuple[str, int]]:
+    """Longest phrase (up to 3 words) starting at tokens[i]: (phrase, length)"""
+    for length in (3, 2, 1):
+        phrase = " ".join(tokens[i : i + length])
+        if len(tokens) - i >= length and phrase in phrases:
+            return phrase, length
+    return None
+
+
+def _provider_for(token: str) -> Optional[str]:
+    if token in PROVIDER_ALIASES:
+        return PROVIDER_ALIASES[token]
+    if len(token) >= 6:
+        for provider in PROVIDERS:
+            if jellyfish.jaro_winkler_similarity(token, provider) >= PROVIDER_NAME_SIMILARITY:
+                return provider
+    return None
+
+
+def _learned_topic(tokens: List[str], i: int) -> Optional[Tuple[str, int]]:
+    """Term of the expansion dictionary starting at tokens[i], unless it is a filler or constraint word"""
+    match = expansion_dictionary.longest_match(tokens, i)
+    if match is None:
+        return None
+    words = tokens[i : i + match[1]]
+    if any(word in BLOCKING_WORDS for word in words):
+        return None
+    if len(words) == 1 and (words[0] in FILLER_WORDS or _provider_for(words[0])):
+        return None
+    return match
+
+
+def topic_expansions(topic: str) -> List[str]:
+    return TOPIC_EXPANSIONS.get(topic) or expansion_dictionary.expand(topic)
+
+
+def _level_for(token: str) -> Optional[str]:
+    for candidate in (token, token[:-1] if token.endswith("s") else token):
+        if relevance_scorer.identify_level_terms([candidate]):
+            return LEVEL_ALIASES.get(candidate, candidate)
+    return None
+
+
+def classify_query(user_query: str) -> Dict[str, Any]:
+    """
+    Topics, technologies, levels and providers named by the query, with the
+    words left unrecognized and the words that need the LLM
+    """
+    tokens = tokenize_query(user_query)
+    topic_phrases = set(TOPIC_EXPANSIONS) | set(TOPIC_ALIASES)
+    classified = {
+        "topics": [], "technologies": [], "levels": [], "providers": [],
+        "unknown": [], "blocking": [],
+    }
+
+    # Subjects named both before and after a provider make a multi-part
+    # request ("AI from Udacity, Python from Coursera")
+    mention_order = []
+
+    def add(kind, value):
+        if kind in ("topics", "technologies", "providers"):
+            mention_order.append("provider" if kind == "providers" else "subject")
+        if value not in classified[kind]:
+            classified[kind].append(value)
+
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        topic = _match_phrase(tokens, i, topic_phrases)
+        provider = _match_phrase(tokens, i, PROVIDER_ALIASES)
+        # Learned phrases win when they are longer ("cloud engineering" over "cloud")
+        learned = _learned_topic(tokens, i)
+        if learned and learned[1] > max(1, topic[1] if topic else 0):
+            topic = learned
+        if topic:
+            add("topics", TOPIC_ALIASES.get(topic[0], topic[0]))
+            i += topic[1]
+            continue
+        if provider:
+            add("providers", PROVIDER_ALIASES[provider[0]])
+            i += provider[1]
+            continue
+
+        i += 1
+        if token in BLOCKING_WORDS or any(char.isdigit() for char in token):
+            add("blocking", token)
+        elif relevance_scorer.identify_technology_terms([token]):
+            add("technologies", token)
+        elif _level_for(token):
+            add("levels", _level_for(token))
+        elif token in FILLER_WORDS:
+            continue
+        elif learned:
+            add("topics", learned[0])
+        elif _provider_for(token):
+            add("providers", _provider_for(token))
+        else:
+            add("unknown", token)
+
+    first_provider = mention_order.index("provider") if "provider" in mention_order else -1
+    if first_provider > 0 and "subject" in mention_order[first_provider:]:
+        classified["blocking"].append("multi-part request")
+    return classified
+
+
+def plan_confidence(classified: Dict[str, Any]) -> float:
+    """Share of content words the planner understood (0 when it cannot plan alone)"""
+    if classified["blocking"]:
+        return 0.0
+    subjects = len(classified["topics"]) + len(classified["technologies"])
+    if not subjects:
+        return 0.0
+    recognized = subjects + len(classified["levels"]) + len(classified["providers"])
+    return recognized / (recognized + len(classified["unknown"]))
+
+
+def _provider_query(fields: List[str], pattern: str, levels: List[str]) -> Dict[str, Any]:
+    condition = {"$regex": pattern, "$options": "i"}
+    search = [{field: condition} for field in SEARCH_FIELDS if field in fields]
+    query = {"$or": search} if len(search) > 1 else search[0]
+    if levels and LEVEL_FIELD in fields:
+        level_condition = {LEVEL_FIELD: {"$regex": keyword_regex(levels), "$options": "i"}}
+        return {"$and": [query, level_condition]}
+    return query
+
+
+def build_rule_based_queries(user_query: str) -> Optional[Dict[str, Any]]:
+    """
+    Provider queries for a simple keyword query, or None when the planner is
+    not confident enough (the LLM plans it instead)
+    """
+    classified = classify_query(user_query)
+    confidence = plan_confidence(classified)
+    if confidence < get_min_confidence():
+        logger.debug(f"Rule planner confidence {confidence:.2f} for '{user_query}'")
+        return None
+
+    expanded_terms = []
+    for topic in classified["topics"]:
+        expanded_terms.extend(topic_expansions(topic))
+    expanded_terms.extend(classified["technologies"])
+    expanded_terms = list(dict.fromkeys(expanded_terms))
+    pattern = keyword_regex(expanded_terms)
+
+    schemas = getSchemasAndSamples()
+    providers = classified["providers"] or list(PROVIDERS)
+    provider_queries = {
+        provider: _provider_query(
+            schemas[provider]["fields"], pattern, classified["levels"]
+        )
+        for provider in providers
+    }
+
+    logger.success(
+        f"⚡ Rule-based plan (confidence {confidence:.2f}): {expanded_terms} "
+        f"on {', '.join(providers)}"
+    )
+    return {
+        "query_type": "SPJ",
+        "thought_process": (
+            f"Rule-based plan: topics {classified['topics'] + classified['technologies']}, "
+            f"levels {classified['levels']}, providers {providers}"
+        ),
+        "expanded_terms": expanded_terms,
+        "providers": provider_queries,
+        "planner": "rules",
+        "planner_confidence": round(confidence, 3),
+    }
@@ -1,18 +1,35 @@
 # src/app/query_handler.py - COMPLETE FIXED VERSION
 import os
+import copy
 import json
 from datetime import datetime
 from bson import json_util
 from src.app.query_generator.llm_query_builder import generate_queries
+from src.app.query_generator.rule_planner import (
+    build_rule_based_queries,
+    rule_planner_enabled,
+)
 from src.app.query_executor.provider_executor import execute_provider_query
 from src.app.query_executor.aggregation_executor import (
     execute_aggregation_pipeline,
     execute_cross_platform_aggregation,
 )
-from src.app.response_formatter import unifyResponse
+from src.app.query_executor.concurrent_executor import execute_provider_queries
+from src.app.response_formatter import stubResponse, unifyResponse
 from src.app.results.saver import save_results
 from src.app.utils.logger import logger
-from src.app.relevance_scorer import relevance_scorer
+from src.app.relevance_scorer import (
+    StreamingRanker,
+    get_result_detail_top_k,
+    get_result_min_probability,
+    get_result_top_k,
+    relevance_scorer,
+)
+from src.app.query_cache import normalize_query_text, plan_cache
+from src.app.data_enrichment.enrichment_jobs import (
+    async_enrichment_enabled,
+    enrichment_jobs,
+)
 
 
 # SAVE FUNCTIONS
@@ -175,30 +192,87 @@ def create_relevance_summary(all_results, user_query):
     logger.info("=" * 120)
 
 
-def remove_duplicate_courses(courses):
-    """Remove duplicate courses based on title and provider"""
-    seen_courses = set()
-    unique_courses = []
+def duplicate_key(provider, title):
+    """Identity of a course for duplicate removal: provider and title"""
+    return f"{(provider or '').lower().strip()}:{(title or '').lower().strip()}"
 
-    for course in courses:
-        # Create a unique identifier based on title and provider
-        if "original_data" in course and isinstance(course["original_data"], dict):
-            title = course["original_data"].get("Title", "").lower().strip()
-            provider = course.get("provider", "").lower().strip()
-        else:
-            title = course.get("unified_data", {}).get("title", "").lower().strip()
-            provider = course.get("provider", "").lower().strip()
 
-        course_id = f"{provider}:{title}"
+def stream_rank_provider_queries(provider_queries, user_query, runner):
+    """
+    Run every provider query concurrently, scoring the documents batch by batch
+    as they stream from the cursors. Only the top RESULT_TOP_K courses are kept.
 
-        if course_id not in seen_courses:
-            seen_courses.add(course_id)
-            unique_courses.append(course)
-        else:
-            logger.debug(f"Removed duplicate: {title} from {provider}")
+    Returns (ranked_courses, execution_results, raw_documents_by_provider)
+    """
+    ranker = StreamingRanker(
+        relevance_scorer,
+        user_query,
+        top_k=get_result_top_k(),
+        source_order=list(provider_queries),
+        min_probability=get_result_min_probability(),
+    )
+
+    def run_provider(provider, query, user_query):
+        return runner(
+            provider,
+            query,
+            user_query,
+            consume_batch=lambda batch: ranker.add_batch(provider, batch),
+        )
+
+    outcomes = execute_provider_queries(provider_queries, user_query, run_provider)
+    ranked_courses = ranker.ranked()
+    logger.info(
+        f"🎯 GLOBAL relevance scoring: {ranker.total_scored} documents scored "
+        f"from ALL providers, top {len(ranked_courses)} kept"
+    )
 
-    logger.info(f"Removed {len(courses) - len(unique_courses)} duplicate courses")
-    return unique_courses
+    execution_results = {}
+    raw_documents_by_provider = {}
+    for provider, (_, result_info) in outcomes.items():
+        execution_results[provider] = result_info
+        raw_documents_by_provider[provider] = []
+    for course, _, _, _ in ranked_courses:
+        raw_documents_by_provider.setdefault(course["_provider"], []).append(course)
+
+    return ranked_courses, execution_results, raw_documents_by_provider
+
+
+def build_ranked_results(ranked_courses, enrichment_applied=False):
+    """
+    Result records for ranked courses, best first. Only the first
+    RESULT_DETAIL_TOP_K courses are unified (and later enriched); the rest
+    are returned as stubs. Duplicates (same provider and title) are dropped
+    first, so they do not use up detail slots.
+    """
+    detail_top_k = get_result_detail_top_k()
+    seen_courses = set()
+    all_results = []
+    for course, probability, relevance_score, _ in ranked_courses:
+        provider = course.get("_provider", "unknown")
+        course_id = duplicate_key(provider, course.get("Title", ""))
+        if course_id in seen_courses:
+            logger.debug(f"Removed duplicate: {course.get('Title')} from {provider}")
+            continue
+        seen_courses.add(course_id)
+
+        is_stub = bool(detail_top_k) and len(all_results) >= detail_top_k
+        if is_stub:
+            unified_data = stubResponse(provider, course, probability, relevance_score)
+        else:
+            unified_data = unifyResponse(provider, course, probability, relevance_score)
+
+        all_results.append(
+            {
+                "provider": provider,
+                "original_data": course,
+                "unified_data": unified_data,
+                "enrichment_applied": enrichment_applied and not is_stub,
+                "relevance_probability": probability,
+                "relevance_score": relevance_score,
+            }
+        )
+    return all_results
 
 
 # PROCESSING FUNCTIONS
@@ -230,85 +304,46 @@ def process_aggregation_query(generated_queries, user_query):
                 "🎯 Applying GLOBAL relevance scoring to cross-platform results"
             )
             ranked_courses = relevance_scorer.rank_courses_by_relevance(
-                combined_results, user_query
+                combined_results,
+                user_query,
+                top_k=get_result_top_k(),
+                min_probability=get_result_min_probability(),
             )
 
             # DEBUG: Show probabilities
             debug_relevance_probabilities(ranked_courses, "cross_platform")
 
-            for course, probability, relevance_score, field_scores in ranked_courses:
+            all_results = build_ranked_results(ranked_courses, enrichment_applied=True)
+            for course, _, _, _ in ranked_courses:
                 provider = course.get("_provider", "unknown")
-                unified_data = unifyResponse(
-                    provider, course, probability, relevance_score
-                )
-
-                all_results.append(
-                    {
-                        "provider": provider,
-                        "original_data": course,
-                        "unified_data": unified_data,
-                        "enrichment_applied": True,
-                        "relevance_probability": probability,
-                        "relevance_score": relevance_score,
-                    }
-                )
-
-                if provider not in raw_documents_by_provider:
-                    raw_documents_by_provider[provider] = []
-                raw_documents_by_provider[provider].append(course)
+                raw_documents_by_provider.setdefault(provider, []).append(course)
 
     else:
         logger.aggregation("Executing provider-level aggregation")
-        for provider, query in generated_queries.get("providers", {}).items():
+
+        def run_provider(provider, query, user_query, consume_batch):
             logger.info(f"Processing {provider}")
 
             # Check if this is an aggregation pipeline (list) or find query (dict)
             if isinstance(query, list):
-                sanitized_docs, result_info = execute_aggregation_pipeline(
-                    provider, query, user_query
+                return execute_aggregation_pipeline(
+                    provider, query, user_query, consume_batch
                 )
-            else:
-                sanitized_docs, result_info = execute_provider_query(
-                    provider, query, user_query
-                )
-
-            execution_results[provider] = result_info
-            raw_documents_by_provider[provider] = sanitized_docs or []
-
-        # NEW: Apply GLOBAL scoring after collecting ALL provider results
-        all_documents = []
-        for provider, docs in raw_documents_by_provider.items():
-            for doc in docs:
-                doc["_provider"] = provider  # Ensure provider info is attached
-                all_documents.append(doc)
+            return execute_provider_query(provider, query, user_query, consume_batch)
 
-        if all_documents:
-            logger.info(
-                f"🎯 Applying GLOBAL relevance scoring to {len(all_documents)} documents from ALL providers"
-            )
-            ranked_courses = relevance_scorer.rank_courses_by_relevance(
-                all_documents, user_query
+        # Apply GLOBAL scoring across ALL providers while the results stream in
+        ranked_courses, provider_results, raw_documents_by_provider = (
+            stream_rank_provider_queries(
+                generated_queries.get("providers", {}), user_query, run_provider
             )
+        )
+        execution_results.update(provider_results)
 
+        if ranked_courses:
             # DEBUG: Show probabilities
             debug_relevance_probabilities(ranked_courses, "global_all_providers")
 
-            for course, probability, relevance_score, field_scores in ranked_courses:
-                provider = course.get("_provider", "unknown")
-                unified_data = unifyResponse(
-                    provider, course, probability, relevance_score
-                )
-
-                all_results.append(
-                    {
-                        "provider": provider,
-                        "original_data": course,
-                        "unified_data": unified_data,
-                        "enrichment_applied": True,
-                        "relevance_probability": probability,
-                        "relevance_score": relevance_score,
-                    }
-                )
+            all_results = build_ranked_results(ranked_courses, enrichment_applied=True)
 
     return all_results, execution_results, raw_documents_by_provider
 
@@ -363,12 +398,8 @@ def save_relevance_report(all_results, user_query, output_dir):
         f.write("TOP 50 COURSES BY RELEVANCE PROBABILITY:\n")
         f.write("-" * 120 + "\n")
 
-        # Sort all results by probability
-        sorted_results = sorted(
-            all_results, key=lambda x: x.get("relevance_probability", 0), reverse=True
-        )
-
-        for i, result in enumerate(sorted_results[:50]):
+        # all_results is already in ranked order (highest probability first)
+        for i, result in enumerate(all_results[:50]):
             prob = result.get("relevance_probability", 0)
             score = result.get("relevance_score", 0)
             provider = result.get("provider", "unknown")
@@ -421,17 +452,13 @@ def save_relevance_report(all_results, user_query, output_dir):
     return report_path
 
 
-def process_batch_enrichment(all_results):
-    """Process batch enrichment for all courses"""
-    from src.app.data_enrichment.uniform_formatter import process_batch_enrichment
-    
-    if not all_results:
-        return all_results
-    
-    # Prepare courses for batch enrichment
+def select_courses_for_enrichment(all_results):
+    """Courses with reasonable relevance probability (>= 0.5%), in enrichment input format"""
     courses_for_enrichment = []
     for result in all_results:
-        # Only enrich courses with reasonable relevance probability (> 0.5%)
+        if result["unified_data"].get("is_stub"):
+            # Outside RESULT_DETAIL_TOP_K: never enriched
+            continue
         relevance_prob = result.get("relevance_probability", 0)
         if relevance_prob >= 0.005:
             course_data = {
@@ -445,6 +472,43 @@ def process_batch_enrichment(all_results):
         else:
             # Skip low-probability courses to save API calls
             logger.debug(f"⏭️  Skipping enrichment for low-probability course: {relevance_prob:.4f}")
+    return courses_for_enrichment
+
+
+def apply_enriched_courses(all_results, enriched_courses):
+    """Write enriched courses back into all_results; returns the updated results"""
+    # Create a mapping for quick lookup
+    enriched_dict = {}
+    for enriched_course in enriched_courses:
+        title = enriched_course.get('title', '')
+        provider = enriched_course.get('provider', '')
+        key = f"{provider}:{title}"
+        enriched_dict[key] = enriched_course
+    
+    # Update results with enriched data
+    updated_results = []
+    for result in all_results:
+        title = result["unified_data"].get('title', '')
+        provider = result.get('provider', '')
+        key = f"{provider}:{title}"
+        
+        if key in enriched_dict:
+            enriched_course = enriched_dict[key]
+            result["unified_data"] = enriched_course
+            result["enrichment_applied"] = enriched_course.get("_enrichment_applied", False)
+            updated_results.append(result)
+    return updated_results
+
+
+def process_batch_enrichment(all_results):
+    """Process batch enrichment for all courses"""
+    from src.app.data_enrichment.uniform_formatter import process_batch_enrichment
+    
+    if not all_results:
+        return all_results
+    
+    # Prepare courses for batch enrichment
+    courses_for_enrichment = select_courses_for_enrichment(all_results)
     
     logger.info(f"🎯 Preparing batch enrichment for {len(courses_for_enrichment)}/{len(all_results)} courses (probability >= 0.5%)")
     
@@ -455,28 +519,7 @@ def process_batch_enrichment(all_results):
     # Process batch enrichment
     try:
         enriched_courses = process_batch_enrichment(courses_for_enrichment)
-        
-        # Create a mapping for quick lookup
-        enriched_dict = {}
-        for enriched_course in enriched_courses:
-            title = enriched_course.get('title', '')
-            provider = enriched_course.get('provider', '')
-            key = f"{provider}:{title}"
-            enriched_dict[key] = enriched_course
-        
-        # Update results with enriched data
-        updated_count = 0
-        for result in all_results:
-            title = result["unified_data"].get('title', '')
-            provider = result.get('provider', '')
-            key = f"{provider}:{title}"
-            
-            if key in enriched_dict:
-                enriched_course = enriched_dict[key]
-                result["unified_data"] = enriched_course
-                result["enrichment_applied"] = enriched_course.get("_enrichment_applied", False)
-                updated_count += 1
-        
+        updated_count = len(apply_enriched_courses(all_results, enriched_courses))
         logger.info(f"✅ Batch enrichment completed: {updated_count} courses updated")
         
     except Exception as e:
@@ -488,11 +531,86 @@ def process_batch_enrichment(all_results):
     return all_results
 
 
-def processUserQuery(userQuery):
+def start_async_enrichment(all_results, output_dir, batch_size=20):
+    """
+    Enrich in the background, publishing the enriched frontend records of each
+    batch; polished_results.json is rewritten once every batch is done.
+
+    The worker enriches its own copy of the results: the request thread keeps
+    building the unenriched response from all_results meanwhile.
+    """
+    from src.app.data_enrichment.uniform_formatter import process_batch_enrichment
+    
+    all_results = copy.deepcopy(all_results)
+    courses_for_enrichment = select_courses_for_enrichment(all_results)
+    batches = [
+        courses_for_enrichment[i:i + batch_size]
+        for i in range(0, len(courses_for_enrichment), batch_size)
+    ]
+    
+    def task(job):
+        for batch in batches:
+            try:
+                enriched_batch = process_batch_enrichment(batch)
+            except Exception as e:
+                logger.error(f"❌ Background batch enrichment failed: {e}")
+                enriched_batch = []
+            updated = apply_enriched_courses(all_results, enriched_batch)
+            job.publish(build_frontend_results(updated))
+        save_enriched_courses(all_results, output_dir)
+    
+    return enrichment_jobs.submit(
+        task, total_batches=len(batches), total_courses=len(courses_for_enrichment)
+    )
+
+
+def build_frontend_results(all_results):
+    """Clean course records for the frontend"""
+    return [
+        {
+            **result["unified_data"],
+            "source_provider": result["provider"],
+            "original_provider_id": result["original_data"].get("_id"),
+            "enrichment_applied": result.get("enrichment_applied", False),
+            "relevance_probability": result.get("relevance_probability", 0),
+            "relevance_score": result.get("relevance_score", 0),
+        }
+        for result in all_results
+    ]
+
+
+def get_generated_queries(user_query):
+    """
+    Generate provider queries, reusing the plan of an identical earlier query.
+    The rule-based planner answers the queries it is confident about; the
+    LLM plans the rest.
+    """
+    cache_key = normalize_query_text(user_query)
+    generated_queries = plan_cache.get(cache_key)
+    if generated_queries is not None:
+        logger.info("💾 Query plan cache hit - skipping LLM query generation")
+        return generated_queries
+
+    # Simple keyword queries are planned without an LLM call
+    generated_queries = None
+    if rule_planner_enabled():
+        generated_queries = build_rule_based_queries(user_query)
+    if generated_queries is None:
+        generated_queries = generate_queries(user_query)
+
+    # Failed generations come back without providers - don't cache those
+    if generated_queries.get("providers"):
+        plan_cache.set(cache_key, generated_queries)
+    return generated_queries
+
+
+def processUserQuery(userQuery, async_enrichment=None):
+    if async_enrichment is None:
+        async_enrichment = async_enrichment_enabled()
     try:
         # STEP 1: Generate queries
         logger.info("🧠 STEP 1: Generating queries with LLM...")
-        generated_queries = generate_queries(userQuery)
+        generated_queries = get_generated_queries(userQuery)
 
         # DEBUG: Show the generated queries
         logger.info("🔍 GENERATED QUERIES DEBUG:")
@@ -524,67 +642,29 @@ def processUserQuery(userQuery):
             # SPJ query processing
             logger.info("Processing as SPJ query")
 
-            # FIRST: Collect all documents from all providers
-            all_documents = []
-            for provider, schema_field_query in generated_queries.get(
-                "providers", {}
-            ).items():
-                logger.info(f"Processing {provider}")
-
-                sanitized_docs, result_info = execute_provider_query(
-                    provider, schema_field_query, userQuery
+            # Query all providers concurrently and score the documents as they stream in
+            ranked_courses, provider_results, raw_documents_by_provider = (
+                stream_rank_provider_queries(
+                    generated_queries.get("providers", {}),
+                    userQuery,
+                    execute_provider_query,
                 )
+            )
+            for provider, result_info in provider_results.items():
                 execution_results[provider] = result_info
                 debug_info["execution_results"][provider] = result_info
-                raw_documents_by_provider[provider] = sanitized_docs or []
-
-                # Add provider info to each document
-                for doc in sanitized_docs:
-                    doc["_provider"] = provider
-                    all_documents.append(doc)
-
-            # SECOND: Apply GLOBAL relevance scoring to ALL documents
-            if all_documents:
-                logger.info(
-                    f"🎯 Applying GLOBAL relevance scoring to {len(all_documents)} documents from ALL providers"
-                )
-                ranked_courses = relevance_scorer.rank_courses_by_relevance(
-                    all_documents, userQuery
-                )
 
+            if ranked_courses:
                 # DEBUG: Show probabilities
                 debug_relevance_probabilities(ranked_courses, "global_all_providers")
 
-                for (
-                    course,
-                    probability,
-                    relevance_score,
-                    field_scores,
-                ) in ranked_courses:
-                    provider = course.get("_provider", "unknown")
-                    unified_data = unifyResponse(
-                        provider, course, probability, relevance_score
-                    )
-
-                    all_results.append(
-                        {
-                            "provider": provider,
-                            "original_data": course,
-                            "unified_data": unified_data,
-                            "enrichment_applied": False,  # Will be set by batch enrichment
-                            "relevance_probability": probability,
-                            "relevance_score": relevance_score,
-                        }
-                    )
-
-        # NEW: Remove duplicate courses before enrichment
-        logger.info(f"📊 Before duplicate removal: {len(all_results)} courses")
-        all_results = remove_duplicate_courses(all_results)
-        logger.info(f"📊 After duplicate removal: {len(all_results)} courses")
+                # enrichment_applied will be set by batch enrichment
+                all_results = build_ranked_results(ranked_courses)
 
         # NEW: STEP 3: Batch enrichment for all courses
-        logger.info("🤖 STEP 3: Batch enrichment...")
-        all_results = process_batch_enrichment(all_results)
+        if not async_enrichment:
+            logger.info("🤖 STEP 3: Batch enrichment...")
+            all_results = process_batch_enrichment(all_results)
 
         # STEP 4: Save results
         ts = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
@@ -608,6 +688,11 @@ def processUserQuery(userQuery):
             all_results, userQuery, query_output_dir
         )
 
+        enrichment_job = None
+        if async_enrichment:
+            logger.info("🤖 STEP 3: Batch enrichment (background)...")
+            enrichment_job = start_async_enrichment(all_results, query_output_dir)
+
         logger.success(f"✅ All files saved to {query_output_dir}")
         logger.info(f"📊 Total results: {len(all_results)}")
 
@@ -615,24 +700,8 @@ def processUserQuery(userQuery):
         enriched_count = sum(1 for result in all_results if result.get("enrichment_applied", False))
         logger.info(f"🎯 Courses enriched: {enriched_count}/{len(all_results)}")
 
-        # Prepare clean results for frontend - NOW GLOBALLY SORTED BY RELEVANCE
-        frontend_results = []
-        for result in all_results:
-            frontend_results.append(
-                {
-                    **result["unified_data"],
-                    "source_provider": result["provider"],
-                    "original_provider_id": result["original_data"].get("_id"),
-                    "enrichment_applied": result.get("enrichment_applied", False),
-                    "relevance_probability": result.get("relevance_probability", 0),
-                    "relevance_score": result.get("relevance_score", 0),
-                }
-            )
-
-        # Sort frontend results by relevance probability (descending)
-        frontend_results.sort(
-            key=lambda x: x.get("relevance_probability", 0), reverse=True
-        )
+        # Prepare clean results for frontend - already globally sorted by relevance
+        frontend_results = build_frontend_results(all_results)
 
         # FINAL DEBUG: Show comprehensive summary
         logger.info("🏆 FINAL RANKED RESULTS (Top 15):")
@@ -667,6 +736,15 @@ def processUserQuery(userQuery):
             "provider_distribution": provider_distribution,
             "debug": debug_info,
             "output_directory": query_output_dir,
+            "enrichment_job": (
+                {
+                    "job_id": enrichment_job.job_id,
+                    "status": enrichment_job.status,
+                    "total_batches": enrichment_job.total_batches,
+                }
+                if enrichment_job
+                else None
+            ),
         }
 
     except Exception as e:
@@ -1,18 +1,75 @@
 # src/app/relevance_scorer.py - COMPLETELY FIXED VERSION
 import re
 import math
-from typing import Dict, List, Any, Tuple
+import heapq
+import os
+import threading
+from functools import lru_cache
+from typing import Dict, List, Any, NamedTuple, Optional, Tuple
 from difflib import SequenceMatcher
 import jellyfish
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
+from scipy import sparse
+from src.app.indexing.tfidf_model import CorpusTfidfModel, corpus_tfidf_model
+from src.app.indexing.vocabulary_index import (
+    MIN_FUZZY_THRESHOLD,
+    fuzzy_vocabulary_index,
+)
 from src.app.utils.logger import logger
 
+# Field values repeat across requests (the catalog is a few thousand courses),
+# so their tokenized form is cached by text
+PREPARED_FIELD_CACHE_SIZE = int(os.getenv("PREPARED_FIELD_CACHE_SIZE", "50000"))
+
+
+class PreparedField(NamedTuple):
+    """Lowercased field text with its word list and distinct words"""
+
+    text: str
+    padded: str
+    words: Tuple[str, ...]
+    word_set: frozenset
+
+
+@lru_cache(maxsize=PREPARED_FIELD_CACHE_SIZE)
+def prepare_field(value: str) -> PreparedField:
+    text = value.lower()
+    words = tuple(text.split())
+    word_set = frozenset(words)
+    fuzzy_vocabulary_index.add_words(word_set)
+    return PreparedField(text, f" {text} ", words, word_set)
+
+
+@lru_cache(maxsize=4096)
+def term_pattern(term: str) -> "re.Pattern":
+    """Compiled word boundary matcher for a lowercased query term"""
+    return re.compile(rf"\b{re.escape(term)}\b")
+
 
 class RelevanceScorer:
-    def __init__(self):
+    # Enhanced field weights - technology-focused fields get higher weights
+    FIELD_WEIGHTS = {
+        "Title": 4.0,  # Highest weight - most important for tech matching
+        "What you learn": 3.0,  # High weight - describes technical content
+        "Skills": 3.0,  # High weight - key technical skills
+        "Short Intro": 2.0,  # Medium weight - description
+        "Category": 1.5,  # Medium weight - category
+        "Sub-Category": 1.0,  # Lower weight - subcategory
+        "Level": 2.0,  # Special weight for level matching
+    }
+
+    # Fields concatenated for the overall cosine similarity
+    COMBINED_TEXT_FIELDS = ["Title", "Short Intro", "What you learn", "Skills"]
+
+    # Lower temperature = more spread out probabilities
+    SOFTMAX_TEMPERATURE = 0.05
+
+    def __init__(self, corpus_model: Optional[CorpusTfidfModel] = None):
+        # Pairwise vectorizer, only used until the corpus model is available
         self.vectorizer = TfidfVectorizer(stop_words="english", max_features=1000)
+        self.corpus_model = corpus_model or corpus_tfidf_model
 
     def jaro_winkler_similarity(self, s1: str, s2: str) -> float:
         """Calculate Jaro-Winkler similarity between two strings"""
@@ -38,6 +95,9 @@ class RelevanceScorer:
             if not text1.strip() or not text2.strip():
                 return 0.0
 
+            if self.corpus_model.is_fitted:
+                return self.corpus_model.similarity(text1, text2)
+
             tfidf_matrix = self.vectorizer.fit_transform([text1, text2])
             similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])
             return similarity[0][0]
@@ -78,6 +138,22 @@ class RelevanceScorer:
 
         return list(set(key_terms))
 
+    def combined_text(self, course_data: Dict[str, Any]) -> str:
+        """Concatenate the descriptive fields used for overall text similarity"""
+        return " ".join(
+            str(course_data.get(field, "")) for field in self.COMBINED_TEXT_FIELDS
+        )
+
+    @staticmethod
+    def _best_fuzzy_similarity(
+        field: PreparedField, term: str, threshold: float
+    ) -> float:
+        """Best Jaro-Winkler similarity above threshold between term and a word of field"""
+        similar = fuzzy_vocabulary_index.similar_words(term, threshold)
+        return max(
+            (similar[word] for word in field.word_set & similar.keys()), default=0.0
+        )
+
     def calculate_technology_match_score(
         self, field_value: str, technology_terms: List[str]
     ) -> float:
@@ -85,7 +161,8 @@ class RelevanceScorer:
         if not field_value or not technology_terms:
             return 0.0
 
-        field_text = str(field_value).lower()
+        field = prepare_field(str(field_value))
+        field_text = field.text
         total_score = 0.0
 
         # Technology-specific scoring - prioritize exact matches
@@ -93,11 +170,11 @@ class RelevanceScorer:
             tech_lower = tech.lower()
 
             # Exact phrase match (highest weight)
-            if f" {tech_lower} " in f" {field_text} ":
+            if f" {tech_lower} " in field.padded:
                 total_score += 5.0  # Increased weight for exact matches
 
             # Word boundary match (high weight)
-            elif re.search(rf"\b{re.escape(tech_lower)}\b", field_text):
+            elif term_pattern(tech_lower).search(field_text):
                 total_score += 3.0
 
             # Partial match (medium weight)
@@ -106,12 +183,8 @@ class RelevanceScorer:
 
             # Similarity-based matching (lower weight)
             else:
-                max_similarity = 0.0
-                for word in field_text.split():
-                    similarity = self.jaro_winkler_similarity(tech_lower, word)
-                    if similarity > 0.85:  # Higher threshold for technology terms
-                        max_similarity = max(max_similarity, similarity)
-
+                # Higher threshold for technology terms
+                max_similarity = self._best_fuzzy_similarity(field, tech_lower, 0.85)
                 total_score += max_similarity * 0.5
 
         return total_score
@@ -127,11 +200,12 @@ class RelevanceScorer:
         if not field_value or (not key_terms and not technology_terms):
             return 0.0
 
-        field_text = str(field_value).lower()
+        field = prepare_field(str(field_value))
+        field_text = field.text
         total_score = 0.0
 
         # Calculate technology-specific score (higher priority)
-        tech_score = self.calculate_technology_match_score(field_text, technology_terms)
+        tech_score = self.calculate_technology_match_score(field_value, technology_terms)
         total_score += tech_score
 
         # Calculate general term score (lower priority)
@@ -141,20 +215,14 @@ class RelevanceScorer:
                 term_lower = term.lower()
 
                 # Exact match bonus
-                if f" {term_lower} " in f" {field_text} ":
+                if f" {term_lower} " in field.padded:
                     general_score += 2.0
                 # Partial match
                 elif term_lower in field_text:
                     general_score += 1.0
                 # Similarity-based matching
                 else:
-                    max_similarity = 0.0
-                    for word in field_text.split():
-                        similarity = self.jaro_winkler_similarity(term_lower, word)
-                        if similarity > 0.8:
-                            max_similarity = max(max_similarity, similarity)
-
-                    general_score += max_similarity
+                    general_score += self._best_fuzzy_similarity(field, term_lower, 0.8)
 
             total_score += (
                 general_score / len(key_terms)
@@ -243,16 +311,7 @@ class RelevanceScorer:
         logger.info(f"🎯 Technology terms: {technology_terms}")
         logger.info(f"🎯 Level terms: {level_terms}")
 
-        # Enhanced field weights - technology-focused fields get higher weights
-        field_weights = {
-            "Title": 4.0,  # Highest weight - most important for tech matching
-            "What you learn": 3.0,  # High weight - describes technical content
-            "Skills": 3.0,  # High weight - key technical skills
-            "Short Intro": 2.0,  # Medium weight - description
-            "Category": 1.5,  # Medium weight - category
-            "Sub-Category": 1.0,  # Lower weight - subcategory
-            "Level": 2.0,  # Special weight for level matching
-        }
+        field_weights = self.FIELD_WEIGHTS
 
         total_score = 0.0
         field_scores = {}
@@ -277,14 +336,7 @@ class RelevanceScorer:
                     total_score += field_score
 
         # Calculate overall text similarity using cosine similarity
-        combined_text = " ".join(
-            [
-                str(course_data.get("Title", "")),
-                str(course_data.get("Short Intro", "")),
-                str(course_data.get("What you learn", "")),
-                str(course_data.get("Skills", "")),
-            ]
-        )
+        combined_text = self.combined_text(course_data)
 
         cosine_score = self.cosine_similarity_score(user_query, combined_text)
         total_score += cosine_score * 2.0  # Add cosine score with weight
@@ -311,25 +363,328 @@ class RelevanceScorer:
 
         return min(normalized_score, 1.0), field_scores
 
+    # ------------------------------------------------------------------
+    # Batch scoring - same scores as calculate_course_relevance, computed
+    # column-wise over the whole candidate list
+    # ------------------------------------------------------------------
+
+    def _build_field_column(
+        self, courses: List[Dict[str, Any]], field: str
+    ) -> Dict[str, Any]:
+        """Collect the prepared values of one field for every course that has it"""
+        rows, prepared = [], []
+        for i, course in enumerate(courses):
+            field_value = course.get(field, "")
+            if field_value:
+                rows.append(i)
+                prepared.append(prepare_field(str(field_value)))
+
+        return {
+            "rows": np.array(rows, dtype=int),
+            "texts": [item.text for item in prepared],
+            "padded": [item.padded for item in prepared],
+            "word_sets": [item.word_set for item in prepared],
+            "word_matrix": None,
+            "vocabulary": None,
+            "similarities": {},
+        }
+
+    @staticmethod
+    def _contains_mask(texts: List[str], needle: str) -> np.ndarray:
+        """Boolean mask of texts containing needle"""
+        return np.fromiter((needle in text for text in texts), dtype=bool, count=len(texts))
+
+    @staticmethod
+    def _word_matrix(word_sets: List[frozenset]):
+        """Binary (row x distinct word) matrix built from the pre-tokenized word sets"""
+        vocabulary: Dict[str, int] = {}
+        indices: List[int] = []
+        indptr = [0]
+        for words in word_sets:
+            indices.extend(vocabulary.setdefault(word, len(vocabulary)) for word in words)
+            indptr.append(len(indices))
+        if not vocabulary:
+            # No words at all in this column
+            return False, None
+
+        matrix = sparse.csr_matrix(
+            (np.ones(len(indices)), indices, indptr),
+            shape=(len(word_sets), len(vocabulary)),
+        )
+        return matrix, list(vocabulary)
+
+    def _batch_fuzzy_scores(
+        self, column: Dict[str, Any], term: str, threshold: float
+    ) -> np.ndarray:
+        """Best Jaro-Winkler similarity above threshold between term and any word of each text.
+
+        The words above threshold come from the global vocabulary index, once
+        per term, and are mapped onto the distinct words of the column.
+        """
+        n_rows = len(column["texts"])
+        if column["word_matrix"] is None:
+            column["word_matrix"], column["vocabulary"] = self._word_matrix(
+                column["word_sets"]
+            )
+
+        if column["word_matrix"] is False:
+            return np.zeros(n_rows)
+
+        similarities = column["similarities"].get(term)
+        if similarities is None:
+            # Cached per term for every threshold: keep everything the index returns
+            similar = fuzzy_vocabulary_index.similar_words(term, MIN_FUZZY_THRESHOLD)
+            similarities = np.array(
+                [similar.get(word, 0.0) for word in column["vocabulary"]]
+            )
+            column["similarities"][term] = similarities
+
+        above_threshold = np.where(similarities > threshold, similarities, 0.0)
+        if not above_threshold.any():
+            return np.zeros(n_rows)
+
+        best = column["word_matrix"].multiply(above_threshold).max(axis=1)
+        return np.asarray(best.todense()).ravel()
+
+    def _batch_technology_match_scores(
+        self, column: Dict[str, Any], technology_terms: List[str]
+    ) -> np.ndarray:
+        """Vectorized calculate_technology_match_score over a field column"""
+        texts = column["texts"]
+        total_scores = np.zeros(len(texts))
+        if not texts or not technology_terms:
+            return total_scores
+
+        for tech in technology_terms:
+            tech_lower = tech.lower()
+            scores = np.zeros(len(texts))
+
+            exact = self._contains_mask(column["padded"], f" {tech_lower} ")
+            partial = self._contains_mask(texts, tech_lower)
+
+            # A word boundary match implies a substring match, so the regex
+            # only needs to run on rows that contain the term but not as " term "
+            boundary = np.zeros(len(texts), dtype=bool)
+            pattern = term_pattern(tech_lower)
+            for idx in np.flatnonzero(partial & ~exact):
+                boundary[idx] = pattern.search(texts[idx]) is not None
+
+            scores[exact] = 5.0
+            scores[boundary] = 3.0
+            scores[partial & ~exact & ~boundary] = 1.5
+
+            fuzzy_rows = ~partial
+            if fuzzy_rows.any():
+                fuzzy = self._batch_fuzzy_scores(column, tech_lower, 0.85)
+                scores[fuzzy_rows] = fuzzy[fuzzy_rows] * 0.5
+
+            total_scores += scores
+
+        return total_scores
+
+    def _batch_field_relevance(
+        self,
+        column: Dict[str, Any],
+        key_terms: List[str],
+        technology_terms: List[str],
+        field_weight: float = 1.0,
+    ) -> np.ndarray:
+        """Vectorized calculate_field_relevance over a field column"""
+        texts = column["texts"]
+        if not texts or (not key_terms and not technology_terms):
+            return np.zeros(len(texts))
+
+        total_scores = self._batch_technology_match_scores(column, technology_terms)
+
+        if key_terms:
+            general_scores = np.zeros(len(texts))
+            for term in key_terms:
+                term_lower = term.lower()
+                scores = np.zeros(len(texts))
+
+                exact = self._contains_mask(column["padded"], f" {term_lower} ")
+                partial = self._contains_mask(texts, term_lower)
+                scores[exact] = 2.0
+                scores[partial & ~exact] = 1.0
+
+                fuzzy_rows = ~partial
+                if fuzzy_rows.any():
+                    fuzzy = self._batch_fuzzy_scores(column, term_lower, 0.8)
+                    scores[fuzzy_rows] = fuzzy[fuzzy_rows]
+
+                general_scores += scores
+
+            total_scores = total_scores + (general_scores / len(key_terms)) * 0.5
+
+        return total_scores * field_weight
+
+    def batch_cosine_similarity_scores(
+        self, query: str, texts: List[str]
+    ) -> np.ndarray:
+        """Cosine similarity between query and every text, as cosine_similarity_score would compute it.
+
+        With a fitted corpus model this is one sparse matrix-vector product.
+        Otherwise cosine_similarity_score fits a TF-IDF model on the pair
+        (query, text), so every term present in both documents gets idf 1 and
+        every other term gets idf ln(3/2) + 1. That closed form lets all pairs
+        be scored with a single term-count matrix instead of one fit_transform
+        per course.
+        """
+        scores = np.zeros(len(texts))
+        if not texts or not query.strip():
+            return scores
+
+        if self.corpus_model.is_fitted:
+            non_empty = np.fromiter(
+                (bool(text.strip()) for text in texts), dtype=bool, count=len(texts)
+            )
+            if non_empty.any():
+                non_empty_texts = [text for text in texts if text.strip()]
+                scores[non_empty] = self.corpus_model.similarities(
+                    query, non_empty_texts
+                )
+            return scores
+
+        analyzer = self.vectorizer.build_analyzer()
+        query_counts: Dict[str, int] = {}
+        for token in analyzer(query):
+            query_counts[token] = query_counts.get(token, 0) + 1
+        if not query_counts:
+            return scores
+
+        counter = CountVectorizer(analyzer=analyzer)
+        try:
+            counts = counter.fit_transform(texts).tocsr().astype(float)
+        except ValueError:
+            # None of the texts has a single non-stopword token
+            return scores
+
+        vocabulary = counter.vocabulary_
+        query_vector = np.zeros(counts.shape[1])
+        for token, count in query_counts.items():
+            column_idx = vocabulary.get(token)
+            if column_idx is not None:
+                query_vector[column_idx] = count
+        query_mask = (query_vector > 0).astype(float)
+
+        single_idf_sq = (math.log(3 / 2) + 1) ** 2
+        presence = counts.copy()
+        presence.data[:] = 1.0
+        squared = counts.multiply(counts).tocsr()
+
+        dot = counts @ query_vector
+        shared_terms = presence @ query_mask
+        query_shared_sq = presence @ (query_vector**2)
+        doc_sq = np.asarray(squared.sum(axis=1)).ravel()
+        doc_shared_sq = squared @ query_mask
+        query_sq = float(sum(count * count for count in query_counts.values()))
+
+        query_norm_sq = single_idf_sq * query_sq + (1 - single_idf_sq) * query_shared_sq
+        doc_norm_sq = single_idf_sq * doc_sq + (1 - single_idf_sq) * doc_shared_sq
+        denominator = np.sqrt(query_norm_sq * doc_norm_sq)
+
+        valid = (denominator > 0) & np.fromiter(
+            (bool(text.strip()) for text in texts), dtype=bool, count=len(texts)
+        )
+        scores[valid] = dot[valid] / denominator[valid]
+
+        # The pairwise vectorizer keeps only max_features terms; pairs with a
+        # larger joint vocabulary fall back to the exact pairwise computation
+        max_features = self.vectorizer.max_features
+        if max_features:
+            pair_vocabulary = np.diff(counts.indptr) + len(query_counts) - shared_terms
+            for idx in np.flatnonzero(valid & (pair_vocabulary > max_features)):
+                scores[idx] = self.cosine_similarity_score(query, texts[idx])
+
+        return scores
+
+    def calculate_batch_relevance(
+        self, courses: List[Dict[str, Any]], user_query: str, key_terms: List[str]
+    ) -> Tuple[np.ndarray, List[Dict[str, float]]]:
+        """Calculate relevance scores for a whole candidate list at once.
+
+        Returns the same scores and field breakdowns as calling
+        calculate_course_relevance on each course.
+        """
+        n_courses = len(courses)
+        if not n_courses:
+            return np.zeros(0), []
+
+        technology_terms = self.identify_technology_terms(key_terms)
+        level_terms = self.identify_level_terms(key_terms)
+
+        logger.info(f"🎯 Technology terms: {technology_terms}")
+        logger.info(f"🎯 Level terms: {level_terms}")
+
+        total_scores = np.zeros(n_courses)
+        field_scores: List[Dict[str, float]] = [{} for _ in range(n_courses)]
+
+        for field, weight in self.FIELD_WEIGHTS.items():
+            column = self._build_field_column(courses, field)
+            if not len(column["rows"]):
+                continue
+
+            if field == "Level" and level_terms:
+                scores = self._batch_technology_match_scores(column, level_terms) * weight
+            else:
+                scores = self._batch_field_relevance(
+                    column, key_terms, technology_terms, weight
+                )
+
+            total_scores[column["rows"]] += scores
+            for row, score in zip(column["rows"].tolist(), scores.tolist()):
+                field_scores[row][field] = score
+
+        combined_texts = [self.combined_text(course) for course in courses]
+        cosine_scores = self.batch_cosine_similarity_scores(user_query, combined_texts)
+        total_scores += cosine_scores * 2.0
+        for row, score in enumerate((cosine_scores * 2.0).tolist()):
+            field_scores[row]["cosine_similarity"] = score
+
+        if technology_terms:
+            lowered_texts = [text.lower() for text in combined_texts]
+            all_tech_matched = np.ones(n_courses, dtype=bool)
+            for tech in technology_terms:
+                all_tech_matched &= self._contains_mask(lowered_texts, tech.lower())
+
+            total_scores[all_tech_matched] += 3.0
+            for row in np.flatnonzero(all_tech_matched).tolist():
+                field_scores[row]["all_tech_bonus"] = 3.0
+
+        max_possible_score = sum(self.FIELD_WEIGHTS.values()) + 2.0 + 3.0
+        normalized_scores = np.minimum(total_scores / max_possible_score, 1.0)
+
+        return normalized_scores, field_scores
+
     def softmax(self, scores: List[float]) -> List[float]:
         """Apply softmax function to convert scores to probabilities with temperature"""
-        if not scores:
+        if len(scores) == 0:
             return []
+        return self.softmax_array(np.asarray(scores, dtype=float)).tolist()
 
-        # Use temperature to make probabilities more spread out
-        temperature = 0.05  # Lower temperature = more spread out probabilities
-
-        # Subtract max for numerical stability and apply temperature
-        max_score = max(scores)
-        exp_scores = [math.exp((score - max_score) / temperature) for score in scores]
-        sum_exp_scores = sum(exp_scores)
-
-        return [exp_score / sum_exp_scores for exp_score in exp_scores]
+    def softmax_array(self, scores: np.ndarray) -> np.ndarray:
+        """softmax over a score array in one NumPy pass"""
+        # Use temperature to make probabilities more spread out; subtract the
+        # max for numerical stability
+        exp_scores = np.exp((scores - scores.max()) / self.SOFTMAX_TEMPERATURE)
+        return exp_scores / exp_scores.sum()
 
     def rank_courses_by_relevance(
-        self, courses: List[Dict[str, Any]], user_query: str
+        self,
+        courses: List[Dict[str, Any]],
+        user_query: str,
+        batch: bool = True,
+        top_k: int = 0,
+        min_probability: float = 0.0,
     ) -> List[Tuple[Dict[str, Any], float, float, Dict[str, float]]]:
-        """Rank courses by relevance to user query and return with softmax probabilities and detailed scores"""
+        """Rank courses by relevance to user query and return with softmax probabilities and detailed scores
+
+        With batch=True (default) the whole candidate list is scored at once by
+        calculate_batch_relevance; batch=False scores course by course.
+        Probabilities are normalized over every candidate, then only the top_k
+        best (0 keeps all) with probability >= min_probability are returned,
+        picked with a heap instead of sorting the whole list.
+        """
         if not courses:
             return []
 
@@ -340,28 +695,40 @@ class RelevanceScorer:
         logger.info(f"🧠 Extracted key terms: {key_terms}")
 
         # Calculate raw relevance scores with detailed breakdown
-        scored_courses = []
-        for course in courses:
-            relevance_score, field_scores = self.calculate_course_relevance(
-                course, user_query, key_terms
+        if batch:
+            relevance_scores, field_scores_list = self.calculate_batch_relevance(
+                courses, user_query, key_terms
             )
-            scored_courses.append((course, relevance_score, field_scores))
-
-        # Sort by relevance score (descending)
-        scored_courses.sort(key=lambda x: x[1], reverse=True)
+        else:
+            field_scores_list = []
+            relevance_scores = np.zeros(len(courses))
+            for i, course in enumerate(courses):
+                relevance_scores[i], field_scores = self.calculate_course_relevance(
+                    course, user_query, key_terms
+                )
+                field_scores_list.append(field_scores)
 
-        # Extract scores for softmax
-        raw_scores = [score for _, score, _ in scored_courses]
+        # Apply softmax over all candidates to get probabilities
+        probabilities = self.softmax_array(relevance_scores)
 
-        # Apply softmax to get probabilities
-        probabilities = self.softmax(raw_scores)
+        # Best first; ties keep candidate order (as a stable sort would)
+        if top_k and top_k < len(courses):
+            score_list = relevance_scores.tolist()
+            order = heapq.nlargest(top_k, range(len(courses)), key=score_list.__getitem__)
+        else:
+            order = np.argsort(-relevance_scores, kind="stable").tolist()
 
         # Combine courses with their probabilities and detailed scores
-        ranked_courses = []
-        for (course, relevance_score, field_scores), probability in zip(
-            scored_courses, probabilities
-        ):
-            ranked_courses.append((course, probability, relevance_score, field_scores))
+        ranked_courses = [
+            (
+                courses[i],
+                float(probabilities[i]),
+                float(relevance_scores[i]),
+                field_scores_list[i],
+            )
+            for i in order
+            if probabilities[i] >= min_probability
+        ]
 
         # Log top results for debugging
         if ranked_courses:
@@ -382,5 +749,115 @@ class RelevanceScorer:
         return ranked_courses
 
 
+class StreamingRanker:
+    """
+    Scores course batches as they arrive (e.g. straight from provider cursors)
+    and keeps only the top_k courses in a min-heap, so memory stays O(top_k)
+    however many documents match.
+
+    Softmax probabilities stay exact: a running logsumexp over every scored
+    course gives the same normalizer rank_courses_by_relevance computes over
+    the full list. Thread-safe, so provider workers can feed it concurrently.
+    """
+
+    def __init__(
+        self,
+        scorer: RelevanceScorer,
+        user_query: str,
+        top_k: int = 0,
+        source_order: Optional[List[str]] = None,
+        min_probability: float = 0.0,
+    ):
+        self.scorer = scorer
+        self.user_query = user_query
+        self.top_k = top_k
+        self.min_probability = min_probability
+        self.key_terms = scorer.extract_key_terms(user_query)
+        self.total_scored = 0
+        self._source_rank = {source: i for i, source in enumerate(source_order or [])}
+        self._positions: Dict[str, int] = {}
+        self._heap: List[tuple] = []
+        self._log_normalizer = -math.inf
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def add_batch(self, source: str, courses: List[Dict[str, Any]]):
+        """Score a batch of courses from one source (provider)"""
+        if not courses or self._closed:
+            return
+
+        for course in courses:
+            course["_provider"] = source
+        scores, field_scores_list = self.scorer.calculate_batch_relevance(
+            courses, self.user_query, self.key_terms
+        )
+        scaled = scores / self.scorer.SOFTMAX_TEMPERATURE
+        batch_max = float(scaled.max())
+        batch_log_normalizer = batch_max + math.log(float(np.exp(scaled - batch_max).sum()))
+
+        with self._lock:
+            if self._closed:
+                return
+            self._log_normalizer = float(
+                np.logaddexp(self._log_normalizer, batch_log_normalizer)
+            )
+            self.total_scored += len(courses)
+
+            source_rank = self._source_rank.setdefault(source, len(self._source_rank))
+            position = self._positions.get(source, 0)
+            self._positions[source] = position + len(courses)
+
+            for offset, (course, score, field_scores) in enumerate(
+                zip(courses, scores.tolist(), field_scores_list)
+            ):
+                # Ties keep provider order, then cursor order (as a stable sort
+                # would); the tie key is unique so courses are never compared
+                entry = (score, (-source_rank, -(position + offset)), course, field_scores)
+                if not self.top_k or len(self._heap) < self.top_k:
+                    heapq.heappush(self._heap, entry)
+                elif entry[:2] > self._heap[0][:2]:
+                    heapq.heapreplace(self._heap, entry)
+
+    def ranked(self) -> List[Tuple[Dict[str, Any], float, float, Dict[str, float]]]:
+        """
+        Top courses as (course, probability, relevance_score, field_scores),
+        best first - the same shape as rank_courses_by_relevance.
+        Courses under min_probability are dropped. Later batches (e.g. from a
+        provider that timed out) are ignored.
+        """
+        with self._lock:
+            self._closed = True
+            entries = sorted(self._heap, key=lambda e: e[:2], reverse=True)
+            log_normalizer = self._log_normalizer
+
+        temperature = self.scorer.SOFTMAX_TEMPERATURE
+        ranked = []
+        for score, _, course, field_scores in entries:
+            probability = math.exp(score / temperature - log_normalizer)
+            if probability < self.min_probability:
+                # Entries are best first: everything after is below the floor too
+                break
+            ranked.append((course, probability, score, field_scores))
+        return ranked
+
+
+def get_result_top_k() -> int:
+    """Number of ranked courses kept per query (RESULT_TOP_K, 0 keeps all)"""
+    return int(os.getenv("RESULT_TOP_K", "200"))
+
+
+def get_result_min_probability() -> float:
+    """Probability floor under which ranked courses are dropped (RESULT_MIN_PROBABILITY)"""
+    return float(os.getenv("RESULT_MIN_PROBABILITY", "0"))
+
+
+def get_result_detail_top_k() -> int:
+    """
+    Number of ranked courses returned in full, i.e. unified and enriched
+    (RESULT_DETAIL_TOP_K, 0 = all); the others are returned as stubs
+    """
+    return int(os.getenv("RESULT_DETAIL_TOP_K", "0"))
+
+
 # Global instance
 relevance_scorer = RelevanceScorer()
@@ -35,3 +35,19 @@ def unifyResponse(provider, raw, relevance_probability=None, relevance_score=Non
             fallback_data["relevance_score"] = relevance_score
 
         return fallback_data
+
+
+def stubResponse(provider, raw, relevance_probability=None, relevance_score=None):
+    """
+    Lightweight record for a ranked course outside the detailed top K: no
+    universal schema formatting and no enrichment.
+    """
+    return {
+        "title": raw.get("Title", ""),
+        "url": raw.get("URL", ""),
+        "provider": provider.capitalize(),
+        "relevance_probability": relevance_probability,
+        "relevance_score": relevance_score,
+        "enrichment_applied": False,
+        "is_stub": True,
+    }
@@ -1,6 +1,11 @@
 # src/app/routes.py
-from flask import request, jsonify, send_file
+from flask import request, jsonify, send_file, Response, stream_with_context
 from src.app.query_handler import processUserQuery
+from src.app.query_cache import cache_stats
+from src.app.data_enrichment.enrichment_store import enrichment_store
+from src.app.data_enrichment.enrichment_jobs import enrichment_jobs
+from src.app.query_executor.provider_executor import fetch_full_document
+from src.app.utils.rate_limiter import gemini_limiter
 import os
 import json
 from datetime import datetime
@@ -18,6 +23,19 @@ def register_routes(app):
             }
         )
 
+    @app.route("/metrics", methods=["GET"])
+    def metrics():
+        """Cache hit/miss counters, sizes and Gemini rate limiter metrics"""
+        return jsonify(
+            {
+                "success": True,
+                "cache": cache_stats(),
+                "enrichment_store": enrichment_store.stats(),
+                "llm_rate_limiter": gemini_limiter.stats(),
+                "timestamp": datetime.utcnow().isoformat(),
+            }
+        )
+
     @app.route("/query", methods=["POST"])
     def handle_query():
         """
@@ -45,7 +63,9 @@ def register_routes(app):
                 )
 
             # Process the query (this saves 4 JSON files)
-            result = processUserQuery(user_query)
+            result = processUserQuery(
+                user_query, async_enrichment=data.get("async_enrichment")
+            )
 
             # Return the enriched courses to frontend
             return jsonify(
@@ -57,6 +77,7 @@ def register_routes(app):
                     "output_directory": result["output_directory"],
                     "timestamp": result["output_directory"].split("/")[-1],
                     "saved_files": result.get("saved_files", {}),
+                    "enrichment_job": result.get("enrichment_job"),
                 }
             )
 
@@ -68,6 +89,80 @@ def register_routes(app):
                 500,
             )
 
+    @app.route("/enrichment/<job_id>", methods=["GET"])
+    def get_enrichment_updates(job_id):
+        """
+        Poll a background enrichment job
+        Query: since=<number of batches already received>
+        Returns: JSON with the enriched course records of the newer batches
+        """
+        job = enrichment_jobs.get(job_id)
+        if job is None:
+            return (
+                jsonify({"success": False, "error": f"Unknown enrichment job: {job_id}"}),
+                404,
+            )
+        since = request.args.get("since", default=0, type=int)
+        return jsonify({"success": True, **job.snapshot(since)})
+
+    @app.route("/enrichment/<job_id>/stream", methods=["GET"])
+    def stream_enrichment_updates(job_id):
+        """
+        Server-Sent Events stream of a background enrichment job
+        Emits a `batch` event per enriched batch and a final `done` event
+        """
+        job = enrichment_jobs.get(job_id)
+        if job is None:
+            return (
+                jsonify({"success": False, "error": f"Unknown enrichment job: {job_id}"}),
+                404,
+            )
+
+        since = request.args.get("since", default=0, type=int)
+
+        def events():
+            sent = since
+            while True:
+                if not job.wait_for_update(sent, timeout=15):
+                    yield ": keep-alive\n\n"
+                    continue
+                snapshot = job.snapshot(sent)
+                if snapshot["next"] > sent:
+                    sent = snapshot["next"]
+                    yield f"event: batch\ndata: {json.dumps(snapshot, default=str)}\n\n"
+                if job.done:
+                    final = job.snapshot(sent)
+                    yield f"event: done\ndata: {json.dumps(final, default=str)}\n\n"
+                    return
+
+        return Response(
+            stream_with_context(events()),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    @app.route("/courses/<provider>/<course_id>", methods=["GET"])
+    def get_full_course(provider, course_id):
+        """
+        Full provider document of one course
+        Query results only carry the projected fields in original_data
+        """
+        try:
+            document = fetch_full_document(provider, course_id)
+        except Exception as e:
+            return jsonify({"success": False, "error": str(e)}), 500
+        if document is None:
+            return (
+                jsonify(
+                    {
+                        "success": False,
+                        "error": f"Course not found: {provider}/{course_id}",
+                    }
+                ),
+                404,
+            )
+        return jsonify({"success": True, "provider": provider, "course": document})
+
     @app.route("/results", methods=["GET"])
     def list_all_results():
         """
@@ -310,7 +405,11 @@ def register_routes(app):
                     "error": "Endpoint not found",
                     "available_endpoints": [
                         "GET  /health",
+                        "GET  /metrics",
                         "POST /query",
+                        "GET  /enrichment/<job_id>",
+                        "GET  /enrichment/<job_id>/stream",
+                        "GET  /courses/<provider>/<course_id>",
                         "GET  /results",
                         "GET  /results/<timestamp>",
                         "GET  /results/<timestamp>/files",
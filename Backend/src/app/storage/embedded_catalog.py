@@ -0,0 +1,386 @@
+# src/app/storage/embedded_catalog.py
+"""
+Embedded, in-process course catalog (STORAGE_BACKEND=embedded).
+
+The whole catalog (a few thousand courses) is loaded from a JSON snapshot or
+straight from the provider CSVs and served through a small subset of the
+pymongo API (find/find_one/aggregate/count_documents), so dbMap and
+get_collection work unchanged without any network round trip. Filters are
+evaluated by the in-process matcher; id lookups use a hash map.
+
+    python -m src.app.storage.embedded_catalog --snapshot ./data/embedded_catalog.json
+"""
+import argparse
+import hashlib
+import json
+import os
+import threading
+from copy import deepcopy
+from typing import Any, Dict, Iterable, List, Optional
+
+from bson import ObjectId
+from pymongo.errors import OperationFailure
+
+from src.app.indexing.corpus import PROVIDERS
+from src.app.ingestion.csv_ingestion import (
+    PROVIDER_CSV_FILES,
+    build_course_document,
+    iter_csv_chunks,
+    row_content_hash,
+)
+from src.app.query_executor.mongo_matcher import UnsupportedQueryError, compile_filter
+from src.app.utils.logger import logger
+
+DEFAULT_SNAPSHOT_PATH = "./data/embedded_catalog.json"
+DEFAULT_CSV_DIR = "./data/raw_data"
+SNAPSHOT_VERSION = 1
+
+# BSON comparison order of the types found in course documents (bool before int)
+_TYPE_ORDER = [
+    (type(None), 0),
+    (bool, 8),
+    (int, 1),
+    (float, 1),
+    (str, 2),
+    (dict, 3),
+    (list, 4),
+    (ObjectId, 7),
+]
+
+
+def course_object_id(row: Dict[str, Any]) -> ObjectId:
+    """Deterministic _id for a CSV row (md5 of its URL, or of its content)"""
+    key = row.get("URL") or row_content_hash(row)
+    return ObjectId(hashlib.md5(key.encode("utf-8")).hexdigest()[:24])
+
+
+def _sort_key(value: Any):
+    for value_type, rank in _TYPE_ORDER:
+        if isinstance(value, value_type):
+            if value_type in (dict, list):
+                return rank, json.dumps(value, sort_keys=True, default=str)
+            return rank, value if value is not None else 0
+    return 9, str(value)
+
+
+def _sort_documents(docs: List[Dict[str, Any]], sort_spec) -> List[Dict[str, Any]]:
+    """Stable multi-key sort; missing fields sort like null"""
+    for field, direction in reversed(list(sort_spec)):
+        if isinstance(direction, dict):
+            raise UnsupportedQueryError(f"Unsupported sort on {field}: {direction}")
+        docs = sorted(
+            docs,
+            key=lambda doc, f=field: _sort_key(doc.get(f)),
+            reverse=direction == -1,
+        )
+    return docs
+
+
+def _normalize_sort(key_or_list, direction=None):
+    if isinstance(key_or_list, str):
+        return [(key_or_list, direction or 1)]
+    if isinstance(key_or_list, dict):
+        return list(key_or_list.items())
+    return list(key_or_list)
+
+
+def _check_projection(projection: Optional[Dict[str, Any]]):
+    if projection and any(isinstance(value, dict) for value in projection.values()):
+        raise UnsupportedQueryError("Projection expressions are not supported")
+
+
+def _project(doc: Dict[str, Any], projection: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    if not projection:
+        return dict(doc)
+    included = {field for field, value in projection.items() if value and field != "_id"}
+    if included:
+        projected = {field: doc[field] for field in included if field in doc}
+        if projection.get("_id", 1) and "_id" in doc:
+            projected["_id"] = doc["_id"]
+        return projected
+    excluded = {field for field, value in projection.items() if not value}
+    return {field: value for field, value in doc.items() if field not in excluded}
+
+
+def _expression_value(doc: Dict[str, Any], expression: Any) -> Any:
+    """$addFields expressions: field paths, literals and $ifNull"""
+    if isinstance(expression, str) and expression.startswith("$"):
+        return doc.get(expression[1:])
+    if isinstance(expression, dict):
+        if list(expression) == ["$ifNull"]:
+            for item in expression["$ifNull"]:
+                value = _expression_value(doc, item)
+                if value is not None:
+                    return value
+            return None
+        raise UnsupportedQueryError(f"Unsupported expression: {list(expression)}")
+    return expression
+
+
+class EmbeddedCursor:
+    """Lazily evaluated find cursor mirroring the pymongo methods the executors use"""
+
+    def __init__(self, collection: "EmbeddedCollection", query, projection=None):
+        self._collection = collection
+        self._query = query
+        self._projection = projection
+        self._sort = None
+        self._limit = 0
+
+    def sort(self, key_or_list, direction=None):
+        self._sort = _normalize_sort(key_or_list, direction)
+        return self
+
+    def limit(self, limit: int):
+        self._limit = limit
+        return self
+
+    def batch_size(self, _size: int):
+        return self
+
+    def max_time_ms(self, _ms: int):
+        return self
+
+    def __iter__(self):
+        try:
+            docs = self._collection._matching(self._query)
+            if self._sort:
+                docs = _sort_documents(list(docs), self._sort)
+            _check_projection(self._projection)
+        except UnsupportedQueryError as e:
+            # Surface unsupported operators the way a server rejects them
+            raise OperationFailure(str(e))
+        for count, doc in enumerate(docs, start=1):
+            yield _project(doc, self._projection)
+            if self._limit and count >= self._limit:
+                return
+
+
+class EmbeddedCollection:
+    def __init__(self, name: str, documents: List[Dict[str, Any]]):
+        self.name = name
+        self._documents = documents
+        self._by_id = {doc["_id"]: doc for doc in documents}
+
+    def _id_lookup(self, query) -> Optional[List[Dict[str, Any]]]:
+        """Direct hash lookups for {"_id": value} and {"_id": {"$in": [...]}}"""
+        if not isinstance(query, dict) or list(query) != ["_id"]:
+            return None
+        spec = query["_id"]
+        if isinstance(spec, dict):
+            if list(spec) != ["$in"]:
+                return None
+            ids = spec["$in"]
+        else:
+            ids = [spec]
+        return [self._by_id[doc_id] for doc_id in ids if doc_id in self._by_id]
+
+    def _matching(self, query) -> Iterable[Dict[str, Any]]:
+        by_id = self._id_lookup(query)
+        if by_id is not None:
+            return by_id
+        predicate = compile_filter(query)
+        return (doc for doc in self._documents if predicate(doc))
+
+    def find(self, query=None, projection=None, **_kwargs) -> EmbeddedCursor:
+        return EmbeddedCursor(self, query or {}, projection)
+
+    def find_one(self, query=None, projection=None, **_kwargs):
+        return next(iter(self.find(query, projection).limit(1)), None)
+
+    def count_documents(self, query, **_kwargs) -> int:
+        return sum(1 for _ in self._matching(query))
+
+    def aggregate(self, pipeline, **_kwargs):
+        try:
+            return iter([dict(doc) for doc in self._run_pipeline(pipeline)])
+        except UnsupportedQueryError as e:
+            raise OperationFailure(str(e))
+
+    def _run_pipeline(self, pipeline) -> Iterable[Dict[str, Any]]:
+        docs: Iterable[Dict[str, Any]] = self._documents
+        for position, stage in enumerate(pipeline):
+            if not isinstance(stage, dict) or len(stage) != 1:
+                raise UnsupportedQueryError("Each stage needs exactly one operator")
+            name, spec = next(iter(stage.items()))
+            if name == "$match":
+                if position == 0:
+                    docs = self._matching(spec)
+                else:
+                    predicate = compile_filter(spec)
+                    docs = [doc for doc in docs if predicate(doc)]
+            elif name == "$sort":
+                docs = _sort_documents(list(docs), _normalize_sort(spec))
+            elif name == "$limit":
+                docs = list(docs)[: int(spec)]
+            elif name == "$skip":
+                docs = list(docs)[int(spec):]
+            elif name == "$project":
+                _check_projection(spec)
+                docs = [_project(doc, spec) for doc in docs]
+            elif name == "$addFields":
+                docs = [
+                    {
+                        **doc,
+                        **{
+                            field: _expression_value(doc, expression)
+                            for field, expression in spec.items()
+                        },
+                    }
+                    for doc in docs
+                ]
+            elif name == "$count":
+                docs = [{spec: sum(1 for _ in docs)}]
+            else:
+                raise UnsupportedQueryError(f"Unsupported pipeline stage: {name}")
+        return docs
+
+    def create_index(self, keys, **kwargs) -> str:
+        # Lookups are served from memory; index definitions are accepted and ignored
+        return kwargs.get("name") or str(keys)
+
+
+class EmbeddedDatabase:
+    """A provider's database: every collection name maps to its catalog"""
+
+    def __init__(self, catalog: "EmbeddedCatalog", provider: str):
+        self.catalog = catalog
+        self.name = provider
+
+    def get_collection(self, name: str) -> EmbeddedCollection:
+        return self.catalog.collection(self.name, name)
+
+    def __getitem__(self, name: str) -> EmbeddedCollection:
+        return self.get_collection(name)
+
+
+class _EmbeddedAdmin:
+    def command(self, name, *args, **kwargs):
+        return {"ok": 1.0}
+
+
+class EmbeddedCatalog:
+    """All provider documents, loaded once from the snapshot or the CSVs"""
+
+    def __init__(
+        self, snapshot_path: Optional[str] = None, csv_dir: Optional[str] = None
+    ):
+        self.snapshot_path = snapshot_path or os.getenv(
+            "EMBEDDED_CATALOG_PATH", DEFAULT_SNAPSHOT_PATH
+        )
+        self.csv_dir = csv_dir or os.getenv("EMBEDDED_CATALOG_CSV_DIR", DEFAULT_CSV_DIR)
+        self.admin = _EmbeddedAdmin()
+        self._documents: Optional[Dict[str, List[Dict[str, Any]]]] = None
+        self._collections: Dict[str, EmbeddedCollection] = {}
+        self._lock = threading.Lock()
+
+    # pymongo client interface -------------------------------------------
+    def __getitem__(self, provider: str) -> EmbeddedDatabase:
+        return EmbeddedDatabase(self, provider)
+
+    def close(self):
+        pass
+
+    # Loading -------------------------------------------------------------
+    def load(self) -> Dict[str, List[Dict[str, Any]]]:
+        if self._documents is None:
+            with self._lock:
+                if self._documents is None:
+                    if os.path.exists(self.snapshot_path):
+                        self._documents = self._load_snapshot()
+                    else:
+                        self._documents = self._load_csvs()
+                    logger.success(
+                        f"Embedded catalog loaded: "
+                        f"{sum(len(d) for d in self._documents.values())} courses"
+                    )
+        return self._documents
+
+    def _load_snapshot(self) -> Dict[str, List[Dict[str, Any]]]:
+        with open(self.snapshot_path, "r", encoding="utf-8") as fh:
+            snapshot = json.load(fh)
+        if snapshot.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported catalog snapshot: {self.snapshot_path}")
+        documents = snapshot["providers"]
+        for docs in documents.values():
+            for doc in docs:
+                doc["_id"] = ObjectId(doc["_id"])
+        return documents
+
+    def reload_from_csvs(self) -> Dict[str, List[Dict[str, Any]]]:
+        with self._lock:
+            self._documents = self._load_csvs()
+            self._collections.clear()
+        return self._documents
+
+    def _load_csvs(self) -> Dict[str, List[Dict[str, Any]]]:
+        documents = {}
+        for provider in PROVIDERS:
+            filename = PROVIDER_CSV_FILES.get(provider)
+            path = os.path.join(self.csv_dir, filename) if filename else None
+            docs, seen = [], set()
+            if path and os.path.exists(path):
+                for rows in iter_csv_chunks(path):
+                    for row in rows:
+                        doc_id = course_object_id(row)
+                        if doc_id in seen:
+                            continue
+                        seen.add(doc_id)
+                        doc = build_course_document(row, row_content_hash(row))
+                        docs.append({"_id": doc_id, **doc})
+            else:
+                logger.warning(f"Embedded catalog: no CSV for {provider} ({path})")
+            documents[provider] = docs
+        return documents
+
+    def save_snapshot(self, path: Optional[str] = None) -> str:
+        path = path or self.snapshot_path
+        snapshot = {
+            "version": SNAPSHOT_VERSION,
+            "providers": {
+                provider: [{**doc, "_id": str(doc["_id"])} for doc in docs]
+                for provider, docs in self.load().items()
+            },
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump(snapshot, fh)
+        os.replace(tmp_path, path)
+        return path
+
+    def collection(self, provider: str, name: str) -> EmbeddedCollection:
+        collection = self._collections.get(provider)
+        if collection is None:
+            documents = self.load().get(provider, [])
+            with self._lock:
+                collection = self._collections.setdefault(
+                    provider, EmbeddedCollection(name, documents)
+                )
+        return collection
+
+
+def create_catalog_from_documents(
+    documents: Dict[str, List[Dict[str, Any]]]
+) -> EmbeddedCatalog:
+    """Catalog over in-memory documents (tests, benchmarks)"""
+    catalog = EmbeddedCatalog()
+    catalog._documents = deepcopy(documents)
+    return catalog
+
+
+# Global instance
+embedded_catalog = EmbeddedCatalog()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Write the embedded catalog snapshot from the provider CSVs"
+    )
+    parser.add_argument("--snapshot", default=None, help="Snapshot path to write")
+    parser.add_argument("--csv-dir", default=None)
+    args = parser.parse_args()
+
+    catalog = EmbeddedCatalog(snapshot_path=args.snapshot, csv_dir=args.csv_dir)
+    catalog.reload_from_csvs()
+    print(f"✅ Embedded catalog snapshot written to {catalog.save_snapshot()}")
@@ -0,0 +1,113 @@
+# src/app/utils/json_extract.py
+"""
+JSON values embedded in LLM responses (code fences, prose around the JSON,
+arrays cut off by the output token limit).
+
+Candidates are decoded with json.JSONDecoder.raw_decode from each bracket
+that can open JSON. When a candidate does not decode, scanning resumes
+where the decoder failed instead of at the next character, so the brackets
+nested in it are not tried one by one and a response is scanned in one pass.
+"""
+import json
+import re
+from typing import Any, Iterator, List, NamedTuple, Optional, Tuple
+
+CODE_FENCE_PATTERN = re.compile(r"```(?:json)?", re.IGNORECASE)
+# Brackets that can open JSON: an object starts with a key or is empty, an
+# array starts with a value or is empty ("{this}" and "[1]" in prose are cheap to skip)
+_JSON_START = re.compile(r"\{(?=\s*[\"}])|\[(?=\s*[\[{\"\d\-tfn\]])")
+_WHITESPACE = re.compile(r"\s*")
+
+_decoder = json.JSONDecoder()
+
+
+class JsonArray(NamedTuple):
+    """Elements of an array; complete is False when the array was cut off"""
+
+    items: List[Any]
+    complete: bool
+
+
+def strip_code_fences(text: str) -> str:
+    return CODE_FENCE_PATTERN.sub("", text).strip()
+
+
+def _decode_array_prefix(text: str, start: int) -> Tuple[List[Any], int]:
+    """Elements of the array opening at text[start] that decode, and where decoding stopped"""
+    items: List[Any] = []
+    position = _WHITESPACE.match(text, start + 1).end()
+    while position < len(text):
+        try:
+            item, position = _decoder.raw_decode(text, position)
+        except json.JSONDecodeError as e:
+            return items, max(e.pos, position)
+        except RecursionError:
+            return items, position
+        items.append(item)
+        position = _WHITESPACE.match(text, position).end()
+        if text.startswith(",", position):
+            position = _WHITESPACE.match(text, position + 1).end()
+        else:
+            break
+    return items, position
+
+
+def iter_json_values(text: str) -> Iterator[Tuple[int, int, Any, bool]]:
+    """
+    (start, end, value, complete) of every top-level object or array in the
+    text, left to right. A cut-off array is returned with the elements before
+    the cut (complete False); other values that do not decode are skipped.
+    """
+    position = 0
+    while True:
+        match = _JSON_START.search(text, position)
+        if match is None:
+            return
+        start = match.start()
+        try:
+            value, end = _decoder.raw_decode(text, start)
+        except json.JSONDecodeError as e:
+            position = max(e.pos, start + 1)
+            if text[start] == "[":
+                items, prefix_end = _decode_array_prefix(text, start)
+                if items:
+                    yield start, prefix_end, items, False
+                position = max(position, prefix_end)
+            continue
+        except RecursionError:
+            # Nested deeper than the decoder can go: not an LLM answer
+            position = start + 1
+            continue
+        yield start, end, value, True
+        position = end
+
+
+def extract_json_object(text: Optional[str]) -> Optional[dict]:
+    """The largest JSON object in an LLM response, or None"""
+    if not text:
+        return None
+    objects = [
+        (end - start, value)
+        for start, end, value, _ in iter_json_values(strip_code_fences(text))
+        if isinstance(value, dict)
+    ]
+    if not objects:
+        return None
+    return max(objects, key=lambda found: found[0])[1]
+
+
+def extract_json_array(text: Optional[str]) -> JsonArray:
+    """
+    The largest JSON array in an LLM response. A truncated array keeps the
+    elements that were complete.
+    """
+    if not text:
+        return JsonArray([], True)
+    arrays = [
+        (end - start, JsonArray(value, complete))
+        for start, end, value, complete in iter_json_values(strip_code_fences(text))
+        if isinstance(value, list)
+    ]
+    if not arrays:
+        return JsonArray([], True)
+    return max(arrays, key=lambda found: found[0])[1]
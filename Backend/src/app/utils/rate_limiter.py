@@ -0,0 +1,176 @@
+# src/app/utils/rate_limiter.py
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: refills at `rate` tokens per second up to
+    `capacity`. acquire() blocks until the tokens are available.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def per_minute(cls, requests_per_minute: float, burst: Optional[float] = None):
+        return cls(requests_per_minute / 60.0, burst if burst is not None else 1.0)
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _deficit(self, tokens: float) -> float:
+        """Seconds until `tokens` are available (0 when they are now)"""
+        return max(0.0, (min(tokens, self.capacity) - self._tokens) / self.rate)
+
+    def _take(self, tokens: float):
+        self._tokens -= min(tokens, self.capacity)
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take the tokens if they are available right now"""
+        with self._lock:
+            self._refill()
+            if self._deficit(tokens) == 0:
+                self._take(tokens)
+                return True
+            return False
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block until the tokens are taken; returns the seconds waited"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                wait = self._deficit(tokens)
+                if wait == 0:
+                    self._take(tokens)
+                    return waited
+            time.sleep(wait)
+            waited += wait
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of a prompt (~4 characters per token)"""
+    return len(text or "") // 4 + 1
+
+
+class GeminiRateLimiter:
+    """
+    Shared limiter for every Gemini call in the process, with separate
+    requests-per-minute and tokens-per-minute budgets.
+
+    acquire() waits only as long as the budgets require; try_acquire() never
+    waits and is meant for optional work that can be skipped.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float,
+        tokens_per_minute: float,
+        request_burst: float = 5,
+        output_token_reserve: int = 512,
+    ):
+        self.request_burst = request_burst
+        self.requests = TokenBucket.per_minute(
+            requests_per_minute, min(request_burst, requests_per_minute)
+        )
+        self.tokens = TokenBucket.per_minute(tokens_per_minute, tokens_per_minute)
+        self.output_token_reserve = output_token_reserve
+        self._lock = threading.Lock()
+        self._stats = {
+            "acquired": 0,
+            "throttled": 0,
+            "rejected": 0,
+            "total_wait_seconds": 0.0,
+            "max_wait_seconds": 0.0,
+        }
+        self._callers: Dict[str, int] = {}
+
+    def set_requests_per_minute(self, requests_per_minute: float):
+        """Change the request budget in place (e.g. for an offline job)"""
+        if requests_per_minute <= 0:
+            raise ValueError("requests_per_minute must be positive")
+        with self.requests._lock:
+            self.requests.rate = requests_per_minute / 60.0
+            self.requests.capacity = min(self.request_burst, requests_per_minute)
+            self.requests._tokens = min(self.requests._tokens, self.requests.capacity)
+
+    def _cost(self, prompt: str) -> int:
+        return estimate_tokens(prompt) + self.output_token_reserve
+
+    def _try_take(self, cost: int) -> float:
+        """Take one request and `cost` tokens, or return the seconds to wait"""
+        with self.requests._lock, self.tokens._lock:
+            self.requests._refill()
+            self.tokens._refill()
+            wait = max(self.requests._deficit(1), self.tokens._deficit(cost))
+            if wait == 0:
+                self.requests._take(1)
+                self.tokens._take(cost)
+            return wait
+
+    def _record(self, caller: str, waited: Optional[float]):
+        with self._lock:
+            if waited is None:
+                self._stats["rejected"] += 1
+                return
+            self._stats["acquired"] += 1
+            self._callers[caller] = self._callers.get(caller, 0) + 1
+            if waited > 0:
+                self._stats["throttled"] += 1
+                self._stats["total_wait_seconds"] += waited
+                self._stats["max_wait_seconds"] = max(
+                    self._stats["max_wait_seconds"], waited
+                )
+
+    def acquire(self, prompt: str = "", caller: str = "default") -> float:
+        """Block until the call fits in both budgets; returns the seconds waited"""
+        cost = self._cost(prompt)
+        started = time.monotonic()
+        while True:
+            wait = self._try_take(cost)
+            if wait == 0:
+                break
+            time.sleep(wait)
+        waited = time.monotonic() - started
+        self._record(caller, waited if waited > 0.001 else 0.0)
+        return waited
+
+    def try_acquire(self, prompt: str = "", caller: str = "default") -> bool:
+        """Take the budget for one call only if it is available right now"""
+        acquired = self._try_take(self._cost(prompt)) == 0
+        self._record(caller, 0.0 if acquired else None)
+        return acquired
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["total_wait_seconds"] = round(stats["total_wait_seconds"], 3)
+            stats["max_wait_seconds"] = round(stats["max_wait_seconds"], 3)
+            stats["avg_wait_seconds"] = (
+                round(stats["total_wait_seconds"] / stats["acquired"], 3)
+                if stats["acquired"]
+                else 0.0
+            )
+            stats["calls_by_caller"] = dict(self._callers)
+        stats["requests_per_minute"] = self.requests.rate * 60
+        stats["tokens_per_minute"] = self.tokens.rate * 60
+        return stats
+
+
+# Global instance
+gemini_limiter = GeminiRateLimiter(
+    requests_per_minute=float(os.getenv("GEMINI_RPM", "15")),
+    tokens_per_minute=float(os.getenv("GEMINI_TPM", "1000000")),
+    request_burst=float(os.getenv("GEMINI_RPM_BURST", "5")),
+)
@@ -0,0 +1,110 @@
+# src/test/test_bulk_enrichment_job.py
+import json
+import os
+import re
+import sys
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, BACKEND_DIR)
+
+from src.app.data_enrichment.bulk_enrichment_job import BulkEnrichmentJob
+from src.app.data_enrichment.enrichment_store import EnrichmentStore
+
+DOCUMENTS = [
+    {"_id": f"{i:03d}", "Title": f"Course {i}", "Short Intro": "Learn things", "URL": f"u{i}"}
+    for i in range(10)
+]
+
+
+def document_source(provider, last_id):
+    return [doc for doc in DOCUMENTS if last_id is None or doc["_id"] > last_id]
+
+
+def fake_llm(calls):
+    def call(prompt):
+        count = len(re.findall(r"^COURSE \d+:", prompt, re.MULTILINE))
+        calls.append(count)
+        return json.dumps(
+            [
+                {"skills": ["Python"], "learning_outcomes": ["Apply Python"],
+                 "category": "Programming", "level": "Beginner"}
+            ] * count
+        )
+
+    return call
+
+
+def make_job(tmp_path, calls, **kwargs):
+    return BulkEnrichmentJob(
+        store=EnrichmentStore(str(tmp_path / "store.sqlite")),
+        checkpoint_path=str(tmp_path / "checkpoint.json"),
+        batch_size=3,
+        concurrency=2,
+        llm_call=fake_llm(calls),
+        document_source=document_source,
+        **kwargs,
+    )
+
+
+def test_job_enriches_everything_in_batches(tmp_path):
+    calls = []
+    job = make_job(tmp_path, calls)
+    progress = job.run(["coursera"])["coursera"]
+
+    assert sorted(calls) == [1, 3, 3, 3]
+    assert progress == {"last_id": "009", "processed": 10, "enriched": 10, "failed": 0}
+    assert job.store.stats()["entries"] == 10
+
+
+def test_job_resumes_from_checkpoint(tmp_path):
+    calls = []
+    make_job(tmp_path, calls).run(["coursera"], limit=6)
+    assert sum(calls) == 6
+
+    resumed = make_job(tmp_path, calls)
+    progress = resumed.run(["coursera"])["coursera"]
+    assert sum(calls) == 10
+    assert progress["processed"] == 10
+    assert resumed.store.stats()["entries"] == 10
+
+
+
+def test_cut_off_batch_keeps_the_complete_enrichments(tmp_path):
+    calls = []
+    full_response = fake_llm(calls)
+
+    def cut_off(prompt):
+        # Lose the end of the last enrichment of every batch
+        return full_response(prompt)[:-20]
+
+    job = make_job(tmp_path, calls)
+    job.llm_call = cut_off
+    progress = job.run(["coursera"])["coursera"]
+
+    assert progress["enriched"] == 6
+    assert progress["failed"] == 4
+    assert job.store.stats()["entries"] == 6
+
+
+def test_failed_batches_are_retried_by_the_next_run(tmp_path):
+    calls = []
+    enrich = fake_llm(calls)
+
+    def flaky(prompt):
+        # The LLM call of the batch holding course 4 fails
+        return None if "Course 4" in prompt else enrich(prompt)
+
+    job = make_job(tmp_path, calls)
+    job.llm_call = flaky
+    progress = job.run(["coursera"])["coursera"]
+    assert progress["failed"] == 3
+    assert job.store.stats()["entries"] == 7
+    # The checkpoint stops before the window holding the failed batch
+    assert progress["last_id"] is None and progress["processed"] == 0
+
+    calls.clear()
+    resumed = make_job(tmp_path, calls)
+    progress = resumed.run(["coursera"])["coursera"]
+    assert calls == [3]
+    assert progress == {"last_id": "009", "processed": 10, "enriched": 10, "failed": 0}
+    assert resumed.store.stats()["entries"] == 10
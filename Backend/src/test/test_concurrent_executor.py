@@ -0,0 +1,51 @@
+# src/test/test_concurrent_executor.py
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, BACKEND_DIR)
+
+from src.app.query_executor.concurrent_executor import execute_provider_queries
+
+
+def fake_runner(provider, query, user_query):
+    time.sleep(query["delay"])
+    if query.get("fail"):
+        raise RuntimeError("cluster unreachable")
+    return [{"Title": f"{provider} course"}], {"match_count": 1}
+
+
+def test_provider_queries_run_concurrently():
+    queries = {p: {"delay": 0.3} for p in ["coursera", "udacity", "simplilearn"]}
+
+    started = time.monotonic()
+    outcomes = execute_provider_queries(queries, "python", fake_runner)
+    elapsed = time.monotonic() - started
+
+    assert list(outcomes) == list(queries)
+    assert all(docs for docs, _ in outcomes.values())
+    assert elapsed < 0.8
+
+
+def test_timeouts_and_failures_return_partial_results(monkeypatch):
+    monkeypatch.setenv("PROVIDER_QUERY_TIMEOUT_UDACITY", "0.2")
+    queries = {
+        "coursera": {"delay": 0.05},
+        "udacity": {"delay": 1.0},
+        "simplilearn": {"delay": 0.05, "fail": True},
+    }
+
+    started = time.monotonic()
+    outcomes = execute_provider_queries(queries, "python", fake_runner)
+    elapsed = time.monotonic() - started
+
+    assert elapsed < 0.8
+    assert outcomes["coursera"][0] == [{"Title": "coursera course"}]
+
+    docs, info = outcomes["udacity"]
+    assert docs == [] and info["timed_out"]
+
+    docs, info = outcomes["simplilearn"]
+    assert docs == [] and "cluster unreachable" in info["execution_error"]
+    assert not info["timed_out"]
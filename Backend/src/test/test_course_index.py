@@ -0,0 +1,167 @@
+# src/test/test_course_index.py
+import csv
+import os
+import re
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, BACKEND_DIR)
+
+from src.app.indexing.inverted_index import CourseInvertedIndex
+from src.app.query_executor.mongo_matcher import (
+    compile_filter,
+    extract_literal_alternatives,
+)
+
+RAW_DATA_DIR = os.path.join(BACKEND_DIR, "data", "raw_data")
+
+
+def load_provider_documents():
+    for provider, filename in [
+        ("coursera", "OnlineCoursera.csv"),
+        ("udacity", "OnlineUdacity.csv"),
+        ("simplilearn", "OnlineSimplilearn.csv"),
+    ]:
+        with open(os.path.join(RAW_DATA_DIR, filename), encoding="utf-8-sig") as fh:
+            for i, row in enumerate(csv.DictReader(fh)):
+                doc = {k: v for k, v in row.items() if k and v != ""}
+                doc["_id"] = f"{provider}-{i}"
+                yield provider, doc
+
+
+def regex(pattern, options="i"):
+    return {"$regex": pattern, "$options": options}
+
+
+QUERIES = [
+    {"Title": regex("\\bPython\\b")},
+    {
+        "$or": [
+            {"Title": regex("\\b(AI|Artificial Intelligence|Machine Learning)\\b")},
+            {"Skills": regex("\\b(AI|Artificial Intelligence|Machine Learning)\\b")},
+            {"What you learn": regex("\\b(Deep Learning|Neural Networks)\\b")},
+        ]
+    },
+    {
+        "$and": [
+            {"$or": [{"Title": regex("\\bdata\\b")}, {"Short Intro": regex("data")}]},
+            {"Level": regex("^Beginner$")},
+        ]
+    },
+    {"Title": regex("\\bC\\+\\+\\b")},
+    {"Title": regex("machine\\s+learning")},
+    {"Title": regex("Cyber ?Security")},
+    {"Title": regex("SQL", "")},
+    {"Level": {"$in": ["Beginner", "Intermediate"]}, "Title": regex("web")},
+    {"Category": "Data Science"},
+]
+
+
+@pytest.fixture(scope="module")
+def index_and_docs():
+    documents = list(load_provider_documents())
+    return CourseInvertedIndex().build(documents), documents
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_index_matches_full_scan(index_and_docs, query):
+    index, documents = index_and_docs
+    predicate = compile_filter(query)
+
+    for provider in ["coursera", "udacity", "simplilearn"]:
+        expected = [
+            str(doc["_id"])
+            for p, doc in documents
+            if p == provider and predicate(doc)
+        ]
+        assert index.match_ids(provider, query) == expected
+
+
+def test_index_results_are_regex_matches(index_and_docs):
+    index, documents = index_and_docs
+    pattern = re.compile(r"\b(Python|Java)\b", re.IGNORECASE)
+    expected = [
+        str(doc["_id"])
+        for p, doc in documents
+        if p == "coursera" and pattern.search(doc.get("Title", ""))
+    ]
+    query = {"Title": regex("\\b(Python|Java)\\b")}
+    assert index.match_ids("coursera", query) == expected
+    assert expected
+
+
+def test_ungrouped_alternation_matches_inside_words():
+    index = CourseInvertedIndex().build(
+        [("coursera", {"_id": "c1", "Title": "Database Design"})]
+    )
+    query = {"Title": regex("\\bdata|science\\b")}
+    assert compile_filter(query)({"Title": "Database Design"})
+    assert index.match_ids("coursera", query) == ["c1"]
+
+
+def test_unknown_provider_and_unsupported_operators(index_and_docs):
+    index, _ = index_and_docs
+    assert index.match_ids("futurelearn", {"Title": "x"}) is None
+    assert index.match_ids("coursera", {"$text": {"$search": "python"}}) is None
+    assert index.match_ids("coursera", {"Title": {"$elemMatch": {}}}) is None
+
+
+def test_literal_alternatives():
+    assert extract_literal_alternatives("\\b(AI|Machine Learning)\\b") == (
+        ("AI", True, True),
+        ("Machine Learning", True, True),
+    )
+    assert extract_literal_alternatives("\\bC\\+\\+\\b") == (("C++", True, True),)
+    assert extract_literal_alternatives("machine\\s+learning") == (
+        ("machine learning", False, False),
+    )
+    # Without a group the anchors only bound the first and last alternative
+    assert extract_literal_alternatives("\\bdata|science\\b") == (
+        ("data", True, False),
+        ("science", False, True),
+    )
+    assert extract_literal_alternatives("data.*science") is None
+    assert extract_literal_alternatives("\\d+ hours") is None
+    assert extract_literal_alternatives("(a|(b|c))") is None
+
+
+def test_snapshot_is_rejected_when_collections_changed(tmp_path):
+    path = str(tmp_path / "course_index.json")
+    docs = [("coursera", {"_id": "c1", "Title": "Python"})]
+    fingerprints = {"coursera": {"count": 1, "max_id": "c1"}}
+    CourseInvertedIndex().build(docs, fingerprints).save_snapshot(path)
+
+    index = CourseInvertedIndex()
+    assert index.load_snapshot(path, fingerprints)
+    assert index.match_ids("coursera", {"Title": regex("python")}) == ["c1"]
+
+    # A re-import added courses: the old snapshot would hide them
+    reimported = {"coursera": {"count": 2, "max_id": "c2"}}
+    assert not CourseInvertedIndex().load_snapshot(path, reimported)
+    # Unreadable collections do not invalidate the snapshot
+    assert CourseInvertedIndex().load_snapshot(path, {"coursera": None})
+
+
+def test_ingestion_invalidates_snapshot(tmp_path, monkeypatch):
+    from src.app.ingestion import csv_ingestion
+
+    path = tmp_path / "course_index.json"
+    monkeypatch.setenv("COURSE_INDEX_PATH", str(path))
+    monkeypatch.setattr(csv_ingestion, "ensure_indexes", lambda collection: None)
+
+    class FakeCollection:
+        def find(self, query, projection):
+            return [{"URL": "https://x/python", "_content_hash": "old"}]
+
+        def bulk_write(self, operations, ordered):
+            self.written = len(operations)
+
+    csv_path = tmp_path / "courses.csv"
+    csv_path.write_text("Title,URL\nPython,https://x/python\n", encoding="utf-8")
+    CourseInvertedIndex().build([("coursera", {"_id": "c1"})]).save_snapshot(str(path))
+
+    stats = csv_ingestion.CsvIngestor(FakeCollection()).ingest(str(csv_path))
+    assert stats["updated"] == 1
+    assert not path.exists()
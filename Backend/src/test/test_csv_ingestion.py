@@ -0,0 +1,77 @@
+# src/test/test_csv_ingestion.py
+import os
+import sys
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, BACKEND_DIR)
+
+from src.app.ingestion.csv_ingestion import (
+    HASH_FIELD,
+    PROVIDER_CSV_FILES,
+    build_course_document,
+    iter_csv_chunks,
+    plan_chunk,
+    row_content_hash,
+)
+
+CSV = (
+    "﻿Title,URL,Rating,Number of viewers,\n"
+    "Python,https://x/python,4.8stars,\"1,200\",\n"
+    "SQL,https://x/sql,,10,\n"
+    "No url,,4.1stars,5,\n"
+)
+
+
+def write_csv(tmp_path, content=CSV):
+    path = tmp_path / "courses.csv"
+    path.write_text(content, encoding="utf-8")
+    return str(path)
+
+
+def test_csv_is_streamed_in_chunks(tmp_path):
+    chunks = list(iter_csv_chunks(write_csv(tmp_path), chunk_size=2))
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    first = chunks[0][0]
+    assert first == {
+        "Title": "Python",
+        "URL": "https://x/python",
+        "Rating": "4.8stars",
+        "Number of viewers": "1,200",
+    }
+    assert chunks[0][1]["Rating"] is None
+
+
+def test_course_document_has_companions_and_hash():
+    row = {"URL": "https://x/python", "Rating": "4.8stars", "Number of viewers": "1,200"}
+    document = build_course_document(row, "abc")
+    assert document["viewers_count"] == 1200 and document["rating_value"] == 4.8
+    # The raw CSV strings are kept; the companions carry the numeric types
+    assert isinstance(document["viewers_count"], int)
+    assert isinstance(document["rating_value"], float)
+    assert document["Rating"] == "4.8stars"
+    assert document[HASH_FIELD] == "abc" and document["URL"] == row["URL"]
+
+
+def test_only_new_and_changed_rows_are_written(tmp_path):
+    rows = next(iter_csv_chunks(write_csv(tmp_path)))
+    stored = {}
+    operations, counts = plan_chunk(rows, stored)
+    assert counts == {"inserted": 2, "updated": 0, "unchanged": 0, "skipped": 1}
+    assert len(operations) == 2
+    assert stored["https://x/python"] == row_content_hash(rows[0])
+
+    # Re-import: nothing to write
+    operations, counts = plan_chunk(rows, dict(stored))
+    assert operations == [] and counts["unchanged"] == 2
+
+    # Refreshed scrape: one changed row, one duplicated URL
+    refreshed = [dict(rows[0], Rating="4.9stars"), rows[1], dict(rows[1])]
+    operations, counts = plan_chunk(refreshed, dict(stored))
+    assert counts == {"inserted": 0, "updated": 1, "unchanged": 2, "skipped": 0}
+    assert len(operations) == 1
+
+
+def test_provider_csv_exports_exist():
+    raw_data_dir = os.path.join(BACKEND_DIR, "data", "raw_data")
+    for filename in PROVIDER_CSV_FILES.values():
+        assert os.path.exists(os.path.join(raw_data_dir, filename)), filename
@@ -0,0 +1,50 @@
+# src/test/test_db_connection.py
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, BACKEND_DIR)
+
+from src.app import db_connection
+
+
+@pytest.fixture
+def env(monkeypatch):
+    for provider in db_connection.PROVIDERS:
+        name = provider.upper()
+        monkeypatch.delenv(f"MONGO_URI_{name}", raising=False)
+        monkeypatch.setenv(f"MONGO_DB_{name}", f"{provider}_db")
+        monkeypatch.setenv(f"MONGO_COLLECTION_{name}", f"{provider}_courses")
+    monkeypatch.setenv("MONGO_MAX_POOL_SIZE", "7")
+    db_connection.close_all_clients()
+    yield monkeypatch
+    db_connection.close_all_clients()
+
+
+def test_no_client_is_created_before_first_use(env):
+    assert db_connection.client_registry.clients() == []
+    with pytest.raises(EnvironmentError):
+        db_connection.dbMap["coursera"]
+    assert db_connection.COLLECTION_MAP["coursera"] == "coursera_courses"
+
+
+def test_providers_on_one_cluster_share_a_pooled_client(env):
+    for provider in ["coursera", "udacity"]:
+        env.setenv(f"MONGO_URI_{provider.upper()}", "mongodb://localhost:1")
+    env.setenv("MONGO_URI_SIMPLILEARN", "mongodb://localhost:2")
+
+    coursera = db_connection.CLIENT_MAP["coursera"]
+    assert db_connection.CLIENT_MAP["udacity"] is coursera
+    assert db_connection.CLIENT_MAP["simplilearn"] is not coursera
+    assert coursera.options.pool_options.max_pool_size == 7
+    assert db_connection.dbMap["udacity"].name == "udacity_db"
+    assert db_connection.get_collection("udacity").name == "udacity_courses"
+
+
+def test_entries_can_be_overridden(env):
+    db_connection.dbMap["coursera"] = "test-db"
+    assert db_connection.dbMap.get("coursera") == "test-db"
+    assert db_connection.dbMap.get("unknown") is None
+    assert list(db_connection.dbMap) == db_connection.PROVIDERS
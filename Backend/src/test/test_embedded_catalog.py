@@ -0,0 +1,92 @@
+# src/test/test_embedded_catalog.py
+import os
+import sys
+
+import pytest
+from pymongo.errors import OperationFailure
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, BACKEND_DIR)
+
+from src.app.storage.embedded_catalog import (
+    EmbeddedCatalog,
+    course_object_id,
+    create_catalog_from_documents,
+)
+
+COURSES = [
+    {"_id": 1, "Title": "Python Basics", "viewers_count": 500, "Level": "Beginner"},
+    {"_id": 2, "Title": "Advanced Python", "viewers_count": 1500, "Level": "Advanced"},
+    {"_id": 3, "Title": "SQL for Analysts", "Level": "Beginner"},
+    {"_id": 4, "Title": "Machine Learning", "viewers_count": 900},
+]
+
+
+@pytest.fixture
+def courses():
+    catalog = create_catalog_from_documents({"coursera": COURSES})
+    return catalog["coursera"]["courses"]
+
+
+def titles(docs):
+    return [doc["Title"] for doc in docs]
+
+
+def test_find_filters_sorts_limits_and_projects(courses):
+    query = {
+        "$or": [
+            {"Title": {"$regex": "python", "$options": "i"}},
+            {"viewers_count": {"$gte": 800}},
+        ]
+    }
+    cursor = courses.find(query, {"Title": 1}).sort("viewers_count", -1).limit(2)
+    assert list(cursor) == [
+        {"_id": 2, "Title": "Advanced Python"},
+        {"_id": 4, "Title": "Machine Learning"},
+    ]
+    assert titles(courses.find({"_id": {"$in": [3, 1, 99]}})) == [
+        "SQL for Analysts",
+        "Python Basics",
+    ]
+    assert courses.find_one({"Level": {"$in": ["Advanced"]}})["_id"] == 2
+    assert courses.count_documents({"Level": "Beginner"}) == 2
+
+
+def test_aggregate_subset(courses):
+    pipeline = [
+        {"$match": {"Level": {"$exists": True}}},
+        {"$sort": {"viewers_count": 1, "_id": 1}},
+        {"$limit": 2},
+        {"$addFields": {"views": {"$ifNull": ["$viewers_count", 0]}}},
+        {"$project": {"Title": 1, "views": 1, "_id": 0}},
+    ]
+    assert list(courses.aggregate(pipeline)) == [
+        {"Title": "SQL for Analysts", "views": 0},
+        {"Title": "Python Basics", "views": 500},
+    ]
+    assert list(courses.aggregate([{"$count": "n"}])) == [{"n": 4}]
+
+
+def test_unsupported_operators_fail_like_a_server(courses):
+    with pytest.raises(OperationFailure):
+        list(courses.find({"$text": {"$search": "python"}}))
+    with pytest.raises(OperationFailure):
+        courses.aggregate([{"$group": {"_id": "$Level"}}])
+
+
+def test_csv_catalog_has_deterministic_ids(tmp_path):
+    (tmp_path / "OnlineUdacity.csv").write_text(
+        "Title,URL,Duration\n"
+        "Intro to AI,https://u/ai,Estimated 4 Weeks\n"
+        "Intro to AI,https://u/ai,Estimated 4 Weeks\n",
+        encoding="utf-8",
+    )
+    catalog = EmbeddedCatalog(str(tmp_path / "snapshot.json"), str(tmp_path))
+    docs = list(catalog["udacity"]["c"].find({}))
+    assert len(docs) == 1
+    assert docs[0]["_id"] == course_object_id({"URL": "https://u/ai"})
+    assert docs[0]["duration_weeks"] == 4.0
+
+    catalog.save_snapshot()
+    reloaded = EmbeddedCatalog(str(tmp_path / "snapshot.json"), str(tmp_path / "none"))
+    assert list(reloaded["udacity"]["c"].find({})) == docs
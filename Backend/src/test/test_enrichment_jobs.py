@@ -0,0 +1,93 @@
+# src/test/test_enrichment_jobs.py
+import os
+import sys
+import threading
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, BACKEND_DIR)
+
+from src.app.data_enrichment.enrichment_jobs import (
+    COMPLETED,
+    FAILED,
+    EnrichmentJobManager,
+)
+
+
+def test_job_publishes_batches_progressively():
+    manager = EnrichmentJobManager(max_workers=1)
+    release = threading.Event()
+
+    def task(job):
+        job.publish([{"title": "A"}, {"title": "B"}])
+        release.wait(5)
+        job.publish([{"title": "C"}])
+
+    job = manager.submit(task, total_batches=2, total_courses=3)
+    assert manager.get(job.job_id) is job
+
+    assert job.wait_for_update(0, timeout=5)
+    first = job.snapshot(0)
+    assert [r["title"] for r in first["updates"]] == ["A", "B"]
+    assert first["next"] == 1 and not job.done
+
+    release.set()
+    # Returns once the job has finished (there is no third batch)
+    assert job.wait_for_update(2, timeout=5)
+
+    final = job.snapshot(first["next"])
+    assert [r["title"] for r in final["updates"]] == ["C"]
+    assert final["status"] == COMPLETED
+    assert final["completed_batches"] == 2
+
+
+def test_failed_job_reports_error():
+    manager = EnrichmentJobManager(max_workers=1)
+
+    def task(job):
+        raise RuntimeError("quota exceeded")
+
+    job = manager.submit(task, total_batches=1, total_courses=1)
+    job.wait_for_update(0, timeout=5)
+    assert job.status == FAILED
+    assert job.snapshot()["error"] == "quota exceeded"
+
+
+def test_finished_jobs_expire():
+    manager = EnrichmentJobManager(max_workers=1, job_ttl=0)
+    job = manager.submit(lambda job: None, total_batches=0, total_courses=0)
+    job.wait_for_update(0, timeout=5)
+
+    manager.submit(lambda job: None, total_batches=0, total_courses=0)
+    assert manager.get(job.job_id) is None
+
+
+def test_async_enrichment_does_not_touch_the_response(tmp_path, monkeypatch):
+    from src.app import query_handler
+    from src.app.data_enrichment import uniform_formatter
+
+    def instant_enrichment(courses):
+        # e.g. every course served from the enrichment store
+        return [dict(course, _enrichment_applied=True, level="Beginner") for course in courses]
+
+    monkeypatch.setattr(uniform_formatter, "process_batch_enrichment", instant_enrichment)
+    monkeypatch.setattr(query_handler, "enrichment_jobs", EnrichmentJobManager(max_workers=1))
+
+    all_results = [
+        {
+            "provider": "coursera",
+            "original_data": {"_id": "c1", "Title": "Python"},
+            "unified_data": {"title": "Python", "provider": "Coursera"},
+            "enrichment_applied": False,
+            "relevance_probability": 0.9,
+            "relevance_score": 1.0,
+        }
+    ]
+    expected = query_handler.build_frontend_results(all_results)
+
+    job = query_handler.start_async_enrichment(all_results, str(tmp_path))
+    job.wait_for_update(1, timeout=5)
+    assert job.status == COMPLETED
+    assert job.snapshot()["updates"][0]["enrichment_applied"] is True
+
+    # However fast the worker was, the synchronous response is unenriched
+    assert query_handler.build_frontend_results(all_results) == expected
@@ -0,0 +1,93 @@
+# src/test/test_enrichment_store.py
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, BACKEND_DIR)
+
+from src.app.data_enrichment import uniform_formatter
+from src.app.data_enrichment.enrichment_store import EnrichmentStore
+
+
+def make_course(course_id, title, what_you_learn="Python basics"):
+    return {
+        "title": title,
+        "description": f"Intro to {title}",
+        "provider": "coursera",
+        "skills": [],
+        "learning_outcomes": [],
+        "category": "",
+        "level": "",
+        "original_data": {
+            "_id": course_id,
+            "Title": title,
+            "What you learn": what_you_learn,
+        },
+    }
+
+
+ENRICHMENT = {
+    "skills": ["Python"],
+    "learning_outcomes": ["Write Python scripts"],
+    "category": "Programming",
+    "level": "Beginner",
+}
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = EnrichmentStore(str(tmp_path / "enrichment.sqlite"))
+    monkeypatch.setattr(uniform_formatter, "enrichment_store", store)
+    return store
+
+
+def test_store_round_trip_and_content_hash(store):
+    course = make_course("1", "Python 101")
+    store.put(course, {**ENRICHMENT, "title": "not stored"})
+
+    assert store.get(course) == ENRICHMENT
+    assert store.get(make_course("2", "Python 101")) is None
+    # Changed source text invalidates the stored enrichment
+    assert store.get(make_course("1", "Python 101", "Advanced Python")) is None
+    assert store.stats()["entries"] == 1
+
+
+def test_batch_enrichment_only_sends_misses_to_llm(store, monkeypatch):
+    calls = []
+
+    def fake_batch(courses):
+        calls.append([c["title"] for c in courses])
+        return [
+            {**c, **ENRICHMENT, "_enrichment_applied": True, "_batch_enriched": True}
+            for c in courses
+        ]
+
+    monkeypatch.setattr(uniform_formatter.batch_enricher, "enrich_courses_batch", fake_batch)
+
+    first = [make_course("1", "Python 101"), make_course("2", "Data Science")]
+    uniform_formatter.process_batch_enrichment(first)
+    assert calls == [["Python 101", "Data Science"]]
+
+    second = first + [make_course("3", "Web Development")]
+    results = uniform_formatter.process_batch_enrichment(second)
+
+    assert calls[1] == ["Web Development"]
+    assert [r["title"] for r in results] == ["Python 101", "Data Science", "Web Development"]
+    assert all(r["category"] == "Programming" for r in results)
+    assert results[0]["_enrichment_cached"] is True
+
+    uniform_formatter.process_batch_enrichment(second)
+    assert len(calls) == 2
+
+
+def test_fallback_results_are_not_stored(store, monkeypatch):
+    monkeypatch.setattr(
+        uniform_formatter.batch_enricher,
+        "enrich_courses_batch",
+        lambda courses: [{**c, "_batch_enriched": False} for c in courses],
+    )
+
+    uniform_formatter.process_batch_enrichment([make_course("1", "Python 101")])
+    assert store.stats()["entries"] == 0
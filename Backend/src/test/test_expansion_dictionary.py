@@ -0,0 +1,107 @@
+# src/test/test_expansion_dictionary.py
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, BACKEND_DIR)
+
+from src.app.indexing.expansion_dictionary import ExpansionDictionary
+from src.app.query_generator import rule_planner
+
+PLANS = [
+    (
+        "Show me some Cloud Engineering courses",
+        ["Cloud Engineering", "AWS", "Azure", "DevOps"],
+    ),
+    # Each topic owns the terms listed after it
+    (
+        "guitar and cricket courses",
+        ["Guitar", "Music Theory", "Cricket", "Batting", "Bowling"],
+    ),
+    # Terms listed before the first mentioned topic belong to it
+    ("Top 5 Python courses", ["Data Science", "Pandas", "Python"]),
+    ("python for beginners", ["Python", "Pandas"]),
+    # A plan without any term the user wrote teaches nothing
+    ("something fun", ["Juggling", "Magic"]),
+    # Terms with numbers are constraints, not topics
+    ("cricket", ["Cricket", "T20", "3 weeks"]),
+]
+
+SKILLS = [
+    "Accounting, Financial Statement, Balance Sheet",
+    "Accounting, Financial Statement",
+    "Accounting, Financial Statement, Marketing",
+    "Accounting, Balance Sheet, Leadership",
+    "Accounting, Balance Sheet",
+    "Artificial Intelligence (AI), Python (IDLE)",
+    ["Cascading Style Sheets (CSS)", "HTML"],
+    "8583",
+]
+
+
+@pytest.fixture
+def dictionary():
+    return ExpansionDictionary().build(PLANS, SKILLS)
+
+
+def test_plan_terms_are_attributed_to_the_topic_before_them(dictionary):
+    assert dictionary.expand("cloud engineering") == [
+        "Cloud Engineering",
+        "AWS",
+        "Azure",
+        "DevOps",
+    ]
+    assert dictionary.expand("Guitar") == ["Guitar", "Music Theory"]
+    assert dictionary.expand("cricket") == ["Cricket", "Batting", "Bowling"]
+    # Pandas in both python plans, Data Science in half of them
+    assert dictionary.expand("python") == ["Python", "Pandas", "Data Science"]
+    assert "juggling" not in dictionary
+    assert "3 weeks" not in dictionary
+
+
+def test_skills_that_appear_together_are_related(dictionary):
+    # Equally related terms are ordered by name
+    assert dictionary.expand("accounting") == [
+        "Accounting",
+        "Balance Sheet",
+        "Financial Statement",
+    ]
+    # Parenthesized acronyms are synonyms, other notes are dropped
+    assert dictionary.expand("AI") == ["AI", "Artificial Intelligence"]
+    assert dictionary.expand("css") == ["CSS", "Cascading Style Sheets"]
+    assert "idle" not in dictionary
+    assert "marketing" not in dictionary
+
+
+def test_longest_known_phrase_is_matched(dictionary):
+    tokens = "show me cloud engineering and accounting".split()
+    assert dictionary.longest_match(tokens, 2) == ("cloud engineering", 2)
+    assert dictionary.longest_match(tokens, 5) == ("accounting", 1)
+    assert dictionary.longest_match(tokens, 3) is None
+
+
+def test_snapshot_round_trip(dictionary, tmp_path):
+    path = str(tmp_path / "expansion_dictionary.json")
+    dictionary.save(path)
+
+    loaded = ExpansionDictionary()
+    assert loaded.load(path)
+    assert loaded.expansions == dictionary.expansions
+    assert loaded.longest_match(["cloud", "engineering"], 0) == ("cloud engineering", 2)
+    assert not ExpansionDictionary().load(str(tmp_path / "missing.json"))
+
+
+def test_rule_planner_uses_learned_topics(dictionary, monkeypatch):
+    assert rule_planner.build_rule_based_queries("Cloud Engineering courses") is None
+
+    monkeypatch.setattr(rule_planner, "expansion_dictionary", dictionary)
+    plan = rule_planner.build_rule_based_queries("Cloud Engineering courses")
+    assert plan["expanded_terms"] == ["Cloud Engineering", "AWS", "Azure", "DevOps"]
+    # Static topics keep the expansions the LLM prompt uses
+    plan = rule_planner.build_rule_based_queries("AI and accounting courses")
+    assert plan["expanded_terms"][:2] == ["AI", "Artificial Intelligence"]
+    assert "Financial Statement" in plan["expanded_terms"]
+    # Learned topics do not hide constraints
+    assert rule_planner.build_rule_based_queries("top accounting courses") is None
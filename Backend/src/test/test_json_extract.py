@@ -0,0 +1,95 @@
+# src/test/test_json_extract.py
+import json
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, BACKEND_DIR)
+
+from src.app.data_enrichment.batch_enricher import BatchEnricher
+from src.app.utils.json_extract import (
+    JsonArray,
+    extract_json_array,
+    extract_json_object,
+)
+
+PLAN = {
+    "query_type": "SPJ",
+    "providers": {"udacity": {"Title": {"$regex": "\\b(AI|ML)\\b", "$options": "i"}}},
+}
+
+
+def test_object_in_code_fence_with_prose():
+    response = (
+        "Here is the plan {as requested}:\n```json\n"
+        + json.dumps(PLAN, indent=2)
+        + "\n```\nLet me know if you need {anything} else."
+    )
+    assert extract_json_object(response) == PLAN
+    # Braces inside strings do not end the object
+    assert extract_json_object('{"text": "a } b", "n": [1, {"x": "{"}]}') == {
+        "text": "a } b",
+        "n": [1, {"x": "{"}],
+    }
+
+
+def test_largest_object_wins_and_broken_objects_are_skipped():
+    response = 'Example: {"a": 1}. Result: ' + json.dumps(PLAN) + " {'single': quotes}"
+    assert extract_json_object(response) == PLAN
+    # A cut-off object is not returned as one of its nested objects
+    assert extract_json_object(json.dumps(PLAN)[:-3]) is None
+    assert extract_json_object("no json here") is None
+    assert extract_json_object(None) is None
+
+
+def test_truncated_array_keeps_complete_elements():
+    items = [{"skills": ["Python"], "level": "Beginner"}, {"skills": ["SQL"], "level": "Advanced"}]
+    text = json.dumps(items + [{"skills": ["Go"], "level": "Beg"}])
+    assert extract_json_array("```json\n" + text[:-10]) == JsonArray(items, False)
+    assert extract_json_array("```json\n" + text + "\n```") == JsonArray(
+        items + [{"skills": ["Go"], "level": "Beg"}], True
+    )
+    # Bracketed prose before the array is skipped
+    assert extract_json_array("[Note] see [1] below: " + json.dumps(items)) == JsonArray(
+        items, True
+    )
+    assert extract_json_array("") == JsonArray([], True)
+
+
+def test_scanning_is_linear_in_the_response_length():
+    def elapsed(size):
+        text = "{" * size + '[{"a": "' + "b" * size
+        started = time.perf_counter()
+        extract_json_array(text)
+        extract_json_object(text)
+        return time.perf_counter() - started
+
+    elapsed(1000)
+    assert elapsed(200000) < 1.0
+
+
+def test_batch_enrichment_keeps_the_prefix_of_a_cut_off_response(monkeypatch):
+    enricher = BatchEnricher()
+    courses = [{"title": f"Course {i}"} for i in range(4)]
+    enrichments = [{"skills": [f"Skill {i}"], "level": "Beginner"} for i in range(4)]
+    response = json.dumps(enrichments)[:-40]
+
+    fallback = []
+
+    def apply_fallback(courses_data):
+        fallback.extend(course["title"] for course in courses_data)
+        return [dict(course, _enrichment_applied=False) for course in courses_data]
+
+    monkeypatch.setattr(enricher, "safe_batch_gemini_call", lambda prompt: response)
+    monkeypatch.setattr(enricher, "_apply_batch_fallback", apply_fallback)
+
+    enriched = enricher.enrich_courses_batch(courses)
+    assert [course["title"] for course in enriched] == [c["title"] for c in courses]
+    assert [course.get("skills") for course in enriched[:3]] == [
+        ["Skill 0"],
+        ["Skill 1"],
+        ["Skill 2"],
+    ]
+    assert enriched[0]["_batch_enriched"] is True
+    assert fallback == ["Course 3"]
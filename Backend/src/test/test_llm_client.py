@@ -0,0 +1,83 @@
+# src/test/test_llm_client.py
+import json
+import os
+import sys
+import types
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, BACKEND_DIR)
+
+import pytest
+
+from src.app.data_enrichment.batch_enricher import batch_enricher
+from src.app.llm_client import (
+    GeminiBackend,
+    LLMClient,
+    LLMThrottledError,
+    StubBackend,
+)
+from src.app.utils import rate_limiter
+
+
+def test_stub_backend_is_deterministic_for_batch_prompts():
+    courses = [
+        {"title": "Python for Data Science", "provider": "coursera", "original_data": {}},
+        {"title": "Intro to React", "provider": "udacity", "original_data": {}},
+    ]
+    prompt = batch_enricher.create_batch_enrichment_prompt(courses)
+    client = LLMClient(StubBackend())
+
+    first = json.loads(client.generate(prompt))
+    assert len(first) == 2
+    assert first[0]["skills"] == ["Python", "Data", "Science"]
+    assert json.loads(client.generate(prompt)) == first
+
+
+def test_stub_backend_query_plan():
+    prompt = '**USER QUERY:** "machine learning with python"'
+    plan = json.loads(StubBackend().generate(prompt))
+
+    assert plan["query_type"] == "SPJ"
+    assert plan["expanded_terms"] == ["machine", "python"]
+    assert set(plan["providers"]) == {"coursera", "udacity", "simplilearn", "futurelearn"}
+
+
+def test_gemini_backend_reuses_model(monkeypatch):
+    # A fake SDK module, so the test does not need google-generativeai installed
+    genai = types.ModuleType("google.generativeai")
+    google = types.ModuleType("google")
+    google.generativeai = genai
+    monkeypatch.setitem(sys.modules, "google", google)
+    monkeypatch.setitem(sys.modules, "google.generativeai", genai)
+
+    created, configured = [], []
+
+    class FakeModel:
+        def __init__(self, name):
+            created.append(name)
+
+        def generate_content(self, prompt):
+            return type("Response", (), {"text": f"echo: {prompt}"})()
+
+    genai.configure = lambda **kwargs: configured.append(kwargs)
+    genai.GenerativeModel = FakeModel
+
+    backend = GeminiBackend(api_key="test")
+    assert backend.generate("a") == "echo: a"
+    assert backend.generate("b") == "echo: b"
+    assert created == ["gemini-2.0-flash"]
+    assert len(configured) == 1
+
+
+def test_non_blocking_call_raises_when_throttled(monkeypatch):
+    limiter = rate_limiter.GeminiRateLimiter(60, 100000, request_burst=1)
+    monkeypatch.setattr("src.app.llm_client.gemini_limiter", limiter)
+
+    backend = StubBackend()
+    backend.rate_limited = True
+    client = LLMClient(backend)
+
+    client.generate("first", blocking=False)
+    with pytest.raises(LLMThrottledError):
+        client.generate("second", blocking=False)
+    assert backend.calls == 1
@@ -0,0 +1,96 @@
+# src/test/test_normalizers.py
+import os
+import sys
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, BACKEND_DIR)
+
+from src.app.ingestion.normalizers import (
+    normalize_course,
+    parse_duration,
+    parse_rating,
+    parse_viewers,
+)
+from src.app.query_executor.mongo_matcher import compile_filter
+from src.app.query_generator.query_translator import rewrite_numeric_fields
+
+
+def test_rating_and_viewers():
+    assert parse_rating("4.9stars") == 4.9
+    assert parse_rating(4) == 4.0
+    assert parse_rating("45") is None
+    assert parse_rating(float("nan")) is None
+    assert parse_viewers("42,571") == 42571
+    assert parse_viewers("2,20,747") == 220747
+    assert parse_viewers("1.2k") == 1200
+    assert parse_viewers("") is None
+
+
+def test_durations():
+    assert parse_duration("Approx. 12 hours to complete") == (12.0, 1.2)
+    assert parse_duration("6 months at 10 hours a week") == (260.0, 26.0)
+    assert parse_duration("Estimated timeApprox. 16 Weeks") == (160.0, 16.0)
+    assert parse_duration("4 - 8 Weeks to complete") == (60.0, 6.0)
+    assert parse_duration("Estimated timeApprox. 7 Days") == (10.0, 1.0)
+    assert parse_duration("Estimated timeApprox. undefined undefined") == (None, None)
+
+
+def test_normalize_course_sets_every_companion_field():
+    companions = normalize_course({"Rating": "4.7stars", "Number of viewers": "390"})
+    assert companions == {
+        "rating_value": 4.7,
+        "viewers_count": 390,
+        "duration_hours": None,
+        "duration_weeks": None,
+    }
+
+
+def test_numeric_comparisons_use_companion_fields():
+    query = {
+        "$and": [
+            {"Title": {"$regex": "python"}},
+            {"Rating": {"$gte": 4.5}},
+            {"Number of viewers": {"$regex": "000"}},
+        ]
+    }
+    rewritten = rewrite_numeric_fields(query)["$and"]
+    assert rewritten[1] == {
+        "$or": [
+            {"rating_value": {"$gte": 4.5}},
+            {"rating_value": {"$exists": False}, "Rating": {"$gte": 4.5}},
+        ]
+    }
+    assert rewritten[2] == {"Number of viewers": {"$regex": "000"}}
+
+    pipeline = [
+        {"$match": {"Duration": {"$lte": 20}, "Level": "Beginner"}},
+        {"$sort": {"Number of viewers": -1}},
+        {"$project": {"Rating": 1}},
+    ]
+    assert rewrite_numeric_fields(pipeline) == [
+        {
+            "$match": {
+                "$and": [
+                    {"Level": "Beginner"},
+                    {
+                        "$or": [
+                            {"duration_hours": {"$lte": 20}},
+                            {"duration_hours": {"$exists": False}, "Duration": {"$lte": 20}},
+                        ]
+                    },
+                ]
+            }
+        },
+        {"$sort": {"viewers_count": -1}},
+        {"$project": {"Rating": 1}},
+    ]
+
+
+def test_numeric_filters_still_match_documents_without_companions():
+    predicate = compile_filter(rewrite_numeric_fields({"Rating": {"$gte": 4.5}}))
+    # Normalized documents compare the companion field
+    assert predicate({"Rating": "4.8stars", "rating_value": 4.8})
+    assert not predicate({"Rating": "4.1stars", "rating_value": 4.1})
+    # Collections not backfilled yet keep the raw-field comparison
+    assert predicate({"Rating": 4.7})
+    assert not predicate({"Rating": 4.1})
@@ -0,0 +1,39 @@
+# src/test/test_projection_planner.py
+import os
+import sys
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, BACKEND_DIR)
+
+from src.app.query_executor.projection_planner import (
+    apply_pipeline_projection,
+    plan_projection,
+)
+from src.app.relevance_scorer import RelevanceScorer
+from src.app.universal_schema import FIELD_MAPPING
+
+
+def test_projection_covers_scoring_and_mapping_fields():
+    projection = plan_projection("coursera")
+    assert projection["Title"] == 1 and projection["Number of viewers"] == 1
+    for field in RelevanceScorer.FIELD_WEIGHTS:
+        assert field in projection
+    for source_fields in FIELD_MAPPING.values():
+        assert all(field in projection for field in source_fields)
+    assert "_id" not in projection
+
+
+def test_projection_extra_fields_and_disable(monkeypatch):
+    assert "Custom Sort" in plan_projection("Udacity", ("Custom Sort",))
+    monkeypatch.setenv("QUERY_PROJECTION", "false")
+    assert plan_projection("udacity") is None
+
+
+def test_pipeline_projection_only_for_document_preserving_stages():
+    pipeline = [{"$match": {"Title": "x"}}, {"$sort": {"Rating": -1}}, {"$limit": 5}]
+    projected = apply_pipeline_projection(pipeline, "coursera")
+    assert projected[:3] == pipeline
+    assert projected[-1] == {"$project": plan_projection("coursera")}
+
+    grouped = pipeline + [{"$group": {"_id": "$Category", "n": {"$sum": 1}}}]
+    assert apply_pipeline_projection(grouped, "coursera") == grouped
@@ -0,0 +1,77 @@
+# src/test/test_query_cache.py
+import os
+import sys
+import time
+
+import pytest
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, BACKEND_DIR)
+
+from src.app.query_cache import (
+    MemoryCacheBackend,
+    QueryCache,
+    SqliteCacheBackend,
+    canonical_query_key,
+    normalize_query_text,
+)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return MemoryCacheBackend(max_entries=2)
+    return SqliteCacheBackend(str(tmp_path / "cache.sqlite"), "test", max_entries=2)
+
+
+def test_hits_misses_and_copies(backend):
+    cache = QueryCache("test", backend, ttl=60)
+    assert cache.get("k") is None
+
+    value = [{"Title": "Python 101", "_id": "abc"}]
+    cache.set("k", value)
+    value[0]["_provider"] = "coursera"  # callers mutate documents afterwards
+
+    assert cache.get("k") == [{"Title": "Python 101", "_id": "abc"}]
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_lru_eviction(backend):
+    cache = QueryCache("test", backend, ttl=60)
+    cache.set("a", 1)
+    time.sleep(0.01)
+    cache.set("b", 2)
+    time.sleep(0.01)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    time.sleep(0.01)
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_expiry(backend):
+    cache = QueryCache("test", backend, ttl=0.05)
+    cache.set("k", {"query_type": "SPJ"})
+    time.sleep(0.1)
+    assert cache.get("k") is None
+
+
+def test_keys():
+    assert normalize_query_text("  Python   courses for Beginners? ") == (
+        "python courses for beginners"
+    )
+    a = {"$or": [{"Title": {"$regex": "x", "$options": "i"}}]}
+    b = {"$or": [{"Title": {"$options": "i", "$regex": "x"}}]}
+    assert canonical_query_key("coursera", a) == canonical_query_key("coursera", b)
+    assert canonical_query_key("coursera", a) != canonical_query_key("udacity", a)
+    assert canonical_query_key("coursera", a) != canonical_query_key("coursera", a, 5)
+
+
+def test_mongo_operators_round_trip_as_plain_dicts(backend):
+    cache = QueryCache("test", backend, ttl=60)
+    plan = {"providers": {"coursera": {"Title": {"$regex": "\\bAI\\b", "$options": "i"}}}}
+    cache.set("plan", plan)
+    assert cache.get("plan") == plan
@@ -0,0 +1,175 @@
+# src/test/test_query_plan.py
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, BACKEND_DIR)
+
+from src.app.query_executor.mongo_matcher import compile_filter
+from src.app.query_generator.query_plan import (
+    build_provider_plan,
+    canonicalize_filter,
+    canonicalize_query,
+    plan_hash,
+)
+
+DOCUMENTS = [
+    {"Title": "Deep Learning Specialization", "Skills": "PyTorch, Keras", "Level": "Advanced"},
+    {"Title": "Intro to AI", "Short Intro": "Machine learning basics", "Level": "Beginner"},
+    {"Title": "Cooking 101", "Short Intro": "Learn to cook", "Level": "Beginner"},
+    {"Title": "Neural Networks", "Skills": "deep learning", "Duration": "3 months"},
+    {"Title": "Java and JavaScript", "Skills": ["Java", "Spring"], "Level": "Intermediate"},
+    {"Title": "Data (C++)", "Short Intro": "AI? maybe", "Duration": "12 months"},
+]
+
+
+def regex(pattern, options="i"):
+    return {"$regex": pattern, "$options": options}
+
+
+LLM_QUERY = {
+    "$and": [
+        {
+            "$or": [
+                {"Title": regex("\\bDeep Learning\\b")},
+                {"Short Intro": regex("\\bDeep Learning\\b")},
+                {"Title": regex("\\b(AI|Neural Networks)\\b")},
+                {"$or": [{"Title": regex("\\bdeep learning\\b")}]},
+                {"Skills": regex("\\bDeep Learning\\b")},
+            ]
+        },
+        {"$and": [{"Level": {"$ne": "Advanced"}}]},
+    ]
+}
+
+
+def matches(query):
+    predicate = compile_filter(query)
+    return [i for i, doc in enumerate(DOCUMENTS) if predicate(doc)]
+
+
+def test_alternations_are_merged_and_groups_folded():
+    assert canonicalize_filter(LLM_QUERY) == {
+        "$or": [
+            {"Short Intro": regex("\\bDeep Learning\\b")},
+            {"Skills": regex("\\bDeep Learning\\b")},
+            {"Title": regex("\\b(AI|Deep Learning|Neural Networks)\\b")},
+        ],
+        "Level": {"$ne": "Advanced"},
+    }
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        LLM_QUERY,
+        {"$or": [{"Title": regex("Java")}, {"Title": regex("\\bJavaScript\\b")}]},
+        {"$or": [{"Title": regex("C\\+\\+")}, {"Title": regex("\\(C")}, {"Skills": "Java"}]},
+        {"$or": [{"Title": regex("ai", "")}, {"Title": regex("AI", "")}]},
+        {"$nor": [{"Level": "Beginner"}, {"Level": "Beginner"}]},
+        {"$or": [{"Duration": regex("(\\d+)\\s*month")}, {"Duration": regex("\\b3\\b")}]},
+        {"$and": [{"$or": [{"Title": regex("Data")}]}, {"$or": [{"Title": regex("AI")}]}]},
+        {"$or": [{"Title": regex("\\bdata|ai\\b")}, {"Title": regex("\\bJava\\b")}]},
+    ],
+)
+def test_plans_match_the_same_documents(query):
+    plan = canonicalize_filter(query)
+    assert matches(plan) == matches(query)
+    # Canonical plans are fixed points
+    assert canonicalize_filter(plan) == plan
+
+
+def test_non_literal_regexes_are_kept():
+    query = {
+        "$or": [
+            {"Duration": regex("(\\d+)\\s*month")},
+            {"Duration": regex("\\bDeep\\s+Learning\\b")},
+        ]
+    }
+    assert sorted(canonicalize_filter(query)["$or"], key=str) == sorted(
+        query["$or"], key=str
+    )
+    # Case-sensitive duplicates differing in case are both kept
+    assert canonicalize_filter(
+        {"$or": [{"Title": regex("ai", "")}, {"Title": regex("AI", "")}]}
+    ) == {"Title": {"$regex": "(AI|ai)"}}
+
+
+def test_equivalent_plans_hash_the_same():
+    reordered = {
+        "$and": [
+            {"Level": {"$ne": "Advanced"}},
+            {
+                "$or": [
+                    {"Skills": regex("\\bDeep Learning\\b")},
+                    {"Title": regex("\\b(Neural Networks|Deep Learning|AI)\\b")},
+                    {"Short Intro": regex("\\bDeep Learning\\b")},
+                ]
+            },
+        ]
+    }
+    assert plan_hash(reordered) == plan_hash(LLM_QUERY)
+    assert plan_hash({"Level": "Beginner"}) != plan_hash({"Level": "Advanced"})
+
+
+def test_ungrouped_alternations_keep_their_anchors():
+    # \b binds tighter than |: \bdata OR science\b, which matches "database"
+    ungrouped = {"Title": regex("\\bdata|science\\b")}
+    grouped = {"Title": regex("\\b(data|science)\\b")}
+    predicate = compile_filter(canonicalize_filter(ungrouped))
+    assert predicate({"Title": "Database Design"})
+    assert not compile_filter(canonicalize_filter(grouped))({"Title": "Database Design"})
+
+    assert plan_hash(ungrouped) != plan_hash(grouped)
+
+
+def test_pipelines_only_simplify_match_stages():
+    pipeline = [
+        {"$match": {"$or": [{"Title": regex("AI")}, {"Title": regex("ML")}]}},
+        {"$sort": {"rating_value": -1}},
+        {"$limit": 5},
+    ]
+    assert canonicalize_query(pipeline) == [
+        {"$match": {"Title": regex("(AI|ML)")}},
+        {"$sort": {"rating_value": -1}},
+        {"$limit": 5},
+    ]
+
+
+def test_provider_plans_are_translated_and_simplified(monkeypatch):
+    query = {
+        "$or": [
+            {"Skills Covered": regex("\\bPython\\b")},
+            {"What you learn": regex("\\bSQL\\b")},
+        ],
+        "Average Rating": {"$gte": 4.5},
+    }
+    # udacity maps both schema fields to "What you learn"
+    assert build_provider_plan(query, "udacity") == {
+        "What you learn": regex("\\b(Python|SQL)\\b"),
+        "Average Rating": {"$gte": 4.5},
+    }
+    assert build_provider_plan(query, "coursera") == {
+        "$and": [
+            {
+                "$or": [
+                    {"Rating": {"$gte": 4.5}, "rating_value": {"$exists": False}},
+                    {"rating_value": {"$gte": 4.5}},
+                ]
+            },
+            {
+                "$or": [
+                    {"Skills": regex("\\bPython\\b")},
+                    {"What you learn": regex("\\bSQL\\b")},
+                ]
+            },
+        ]
+    }
+
+    monkeypatch.setenv("QUERY_PLAN_SIMPLIFY", "false")
+    assert build_provider_plan(query, "udacity")["$or"] == [
+        {"What you learn": regex("\\bPython\\b")},
+        {"What you learn": regex("\\bSQL\\b")},
+    ]
@@ -0,0 +1,50 @@
+# src/test/test_rate_limiter.py
+import os
+import sys
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, BACKEND_DIR)
+
+from src.app.utils.rate_limiter import GeminiRateLimiter, TokenBucket
+
+
+def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=50, capacity=1)
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+    assert bucket.acquire() > 0
+
+
+def test_gemini_limiter_budgets_and_metrics():
+    limiter = GeminiRateLimiter(
+        requests_per_minute=6000, tokens_per_minute=60000, request_burst=2,
+        output_token_reserve=0,
+    )
+    assert limiter.try_acquire("x" * 40, caller="a")
+    assert limiter.try_acquire("x" * 40, caller="b")
+    # Request budget exhausted: optional work is rejected, required work waits
+    assert not limiter.try_acquire("x" * 40)
+    assert limiter.acquire("x" * 40, caller="a") > 0
+
+    # A prompt larger than the remaining token budget waits for refill
+    assert not limiter.try_acquire("x" * 4 * 60000)
+
+    stats = limiter.stats()
+    assert stats["acquired"] == 3
+    assert stats["rejected"] == 2
+    assert stats["throttled"] == 1
+    assert stats["calls_by_caller"] == {"a": 2, "b": 1}
+
+
+def test_request_budget_can_be_reconfigured():
+    limiter = GeminiRateLimiter(
+        requests_per_minute=1, tokens_per_minute=60000, request_burst=5,
+        output_token_reserve=0,
+    )
+    assert limiter.try_acquire()
+    assert not limiter.try_acquire()
+
+    # e.g. bulk_enrichment_job --rpm 6000: the shared limiter is the only one
+    limiter.set_requests_per_minute(6000)
+    assert limiter.stats()["requests_per_minute"] == 6000
+    assert limiter.acquire() < 1
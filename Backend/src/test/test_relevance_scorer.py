@@ -0,0 +1,255 @@
+# src/test/test_relevance_scorer.py
+import csv
+import math
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, BACKEND_DIR)
+
+from src.app.relevance_scorer import (
+    RelevanceScorer,
+    StreamingRanker,
+    prepare_field,
+    term_pattern,
+)
+
+RAW_DATA_DIR = os.path.join(BACKEND_DIR, "data", "raw_data")
+SAMPLE_ROWS_PER_PROVIDER = 120
+
+QUERIES = [
+    "python courses for beginners",
+    "Machine Learning with TensorFlow and Keras",
+    "advanced react javascript frontend",
+    "cyber securty course",  # typo exercises the fuzzy matching path
+    "show me some courses",
+    "the and of",  # only stopwords for the TF-IDF analyzer
+]
+
+
+def load_sample_courses():
+    courses = []
+    for provider, filename in [
+        ("coursera", "OnlineCoursera.csv"),
+        ("udacity", "OnlineUdacity.csv"),
+        ("simplilearn", "OnlineSimplilearn.csv"),
+    ]:
+        with open(os.path.join(RAW_DATA_DIR, filename), encoding="utf-8-sig") as fh:
+            for i, row in enumerate(csv.DictReader(fh)):
+                if i >= SAMPLE_ROWS_PER_PROVIDER:
+                    break
+                course = {k: v for k, v in row.items() if k and v != ""}
+                course["_provider"] = provider
+                courses.append(course)
+
+    # Edge cases seen in sanitized Mongo documents
+    courses.extend(
+        [
+            {"Title": "Python for Everybody", "Skills": 757, "_provider": "simplilearn"},
+            {"Title": None, "Short Intro": "Intro to Java", "Level": "Beginner"},
+            {"Title": "", "What you learn": "   "},
+            {"Title": "Pythonic Patterns", "Level": "Intermediate"},
+            {},
+        ]
+    )
+    return courses
+
+
+@pytest.fixture(scope="module")
+def courses():
+    return load_sample_courses()
+
+
+@pytest.mark.parametrize("user_query", QUERIES)
+def test_batch_scores_match_per_course_scores(courses, user_query):
+    scorer = RelevanceScorer()
+    key_terms = scorer.extract_key_terms(user_query)
+
+    batch_scores, batch_field_scores = scorer.calculate_batch_relevance(
+        courses, user_query, key_terms
+    )
+
+    for course, batch_score, batch_fields in zip(
+        courses, batch_scores, batch_field_scores
+    ):
+        score, field_scores = scorer.calculate_course_relevance(
+            course, user_query, key_terms
+        )
+        assert batch_score == pytest.approx(score, abs=1e-9)
+        assert batch_fields.keys() == field_scores.keys()
+        for field, value in field_scores.items():
+            assert batch_fields[field] == pytest.approx(value, abs=1e-9)
+
+
+@pytest.mark.parametrize("user_query", QUERIES[:3])
+def test_batch_ranking_matches_per_course_ranking(courses, user_query):
+    scorer = RelevanceScorer()
+
+    batch_ranked = scorer.rank_courses_by_relevance(courses, user_query)
+    per_course_ranked = scorer.rank_courses_by_relevance(
+        courses, user_query, batch=False
+    )
+
+    assert len(batch_ranked) == len(per_course_ranked)
+    for (_, b_prob, b_score, _), (_, p_prob, p_score, _) in zip(
+        batch_ranked, per_course_ranked
+    ):
+        assert b_score == pytest.approx(p_score, abs=1e-9)
+        assert b_prob == pytest.approx(p_prob, abs=1e-9)
+
+
+@pytest.mark.parametrize("top_k", [0, 25])
+@pytest.mark.parametrize("user_query", QUERIES[:2])
+def test_streaming_ranker_matches_full_ranking(courses, user_query, top_k):
+    scorer = RelevanceScorer()
+    provider_courses = [c for c in courses if c.get("_provider")]
+    full_ranking = scorer.rank_courses_by_relevance(provider_courses, user_query)
+
+    ranker = StreamingRanker(
+        scorer, user_query, top_k=top_k, source_order=["coursera", "udacity", "simplilearn"]
+    )
+    # Providers stream interleaved batches, as concurrent cursors would
+    batches = {}
+    for course in provider_courses:
+        batches.setdefault(course["_provider"], []).append(course)
+    for start in range(0, SAMPLE_ROWS_PER_PROVIDER + 1, 37):
+        for provider in ["simplilearn", "coursera", "udacity"]:
+            ranker.add_batch(provider, batches[provider][start:start + 37])
+
+    streamed = ranker.ranked()
+    assert ranker.total_scored == len(provider_courses)
+    assert len(streamed) == (top_k or len(full_ranking))
+    for (s_course, s_prob, s_score, _), (f_course, f_prob, f_score, _) in zip(
+        streamed, full_ranking
+    ):
+        assert s_course is f_course
+        assert s_score == pytest.approx(f_score, abs=1e-12)
+        assert s_prob == pytest.approx(f_prob, rel=1e-9, abs=1e-15)
+
+
+def test_batch_relevance_on_empty_candidate_list():
+    scorer = RelevanceScorer()
+    scores, field_scores = scorer.calculate_batch_relevance([], "python", ["python"])
+    assert len(scores) == 0
+    assert field_scores == []
+
+
+def test_corpus_model_scoring_and_persistence(courses, tmp_path):
+    from src.app.indexing.tfidf_model import CorpusTfidfModel, course_corpus_text
+
+    model = CorpusTfidfModel().fit(course_corpus_text(course) for course in courses)
+    model_path = str(tmp_path / "tfidf_model.pkl")
+    model.save(model_path)
+
+    loaded = CorpusTfidfModel()
+    assert loaded.load(model_path)
+
+    scorer = RelevanceScorer(corpus_model=loaded)
+    user_query = "machine learning python"
+    texts = [scorer.combined_text(course) for course in courses]
+
+    batch = scorer.batch_cosine_similarity_scores(user_query, texts)
+    pairwise = [scorer.cosine_similarity_score(user_query, text) for text in texts]
+    assert batch == pytest.approx(pairwise, abs=1e-9)
+
+    # Courses about the query topic rank above unrelated ones
+    ml_course = next(
+        i for i, c in enumerate(courses) if "Machine Learning" in str(c.get("Title"))
+    )
+    assert batch[ml_course] > 0.1
+    assert batch.max() <= 1.0 + 1e-9
+
+    key_terms = scorer.extract_key_terms(user_query)
+    batch_scores, _ = scorer.calculate_batch_relevance(courses, user_query, key_terms)
+    for course, batch_score in zip(courses, batch_scores):
+        score, _ = scorer.calculate_course_relevance(course, user_query, key_terms)
+        assert batch_score == pytest.approx(score, abs=1e-9)
+
+
+def test_prepared_fields_and_term_patterns_are_cached():
+    prepared = prepare_field("Intro to  Machine Learning")
+    assert prepared.text == "intro to  machine learning"
+    assert prepared.padded == " intro to  machine learning "
+    assert prepared.words == ("intro", "to", "machine", "learning")
+    assert prepared.word_set == {"intro", "to", "machine", "learning"}
+    assert prepare_field("Intro to  Machine Learning") is prepared
+
+    pattern = term_pattern("node.js")
+    assert term_pattern("node.js") is pattern
+    assert pattern.search("learn node.js today")
+    assert not pattern.search("nodexjs")
+
+    # Scoring a field twice reuses the cached tokens and gives the same score
+    scorer = RelevanceScorer()
+    first = scorer.calculate_field_relevance(
+        "Python for Data Science", ["pyton", "data"], ["python"], 2.0
+    )
+    hits = prepare_field.cache_info().hits
+    second = scorer.calculate_field_relevance(
+        "Python for Data Science", ["pyton", "data"], ["python"], 2.0
+    )
+    assert second == first > 0
+    assert prepare_field.cache_info().hits > hits
+
+
+def test_softmax_matches_reference_formula():
+    scorer = RelevanceScorer()
+    scores = [0.9, 0.42, 0.42, 0.0, 0.133]
+    max_score = max(scores)
+    exp_scores = [math.exp((s - max_score) / scorer.SOFTMAX_TEMPERATURE) for s in scores]
+    expected = [e / sum(exp_scores) for e in exp_scores]
+    assert scorer.softmax(scores) == pytest.approx(expected, rel=1e-12)
+    assert scorer.softmax([]) == []
+
+
+@pytest.mark.parametrize("top_k", [1, 7, 50])
+def test_top_k_ranking_is_prefix_of_full_ranking(courses, top_k):
+    scorer = RelevanceScorer()
+    user_query = QUERIES[0]
+    full_ranking = scorer.rank_courses_by_relevance(courses, user_query)
+    top_ranking = scorer.rank_courses_by_relevance(courses, user_query, top_k=top_k)
+
+    assert len(top_ranking) == top_k
+    for (t_course, t_prob, t_score, _), (f_course, f_prob, f_score, _) in zip(
+        top_ranking, full_ranking
+    ):
+        # Same courses in the same order (ties included), same probabilities
+        assert t_course is f_course
+        assert t_score == f_score
+        assert t_prob == pytest.approx(f_prob, rel=1e-12)
+
+
+def test_min_probability_cuts_off_the_tail(courses):
+    scorer = RelevanceScorer()
+    user_query = QUERIES[1]
+    full_ranking = scorer.rank_courses_by_relevance(courses, user_query)
+    floor = full_ranking[5][1]
+
+    ranked = scorer.rank_courses_by_relevance(
+        courses, user_query, min_probability=floor
+    )
+    assert ranked == [entry for entry in full_ranking if entry[1] >= floor]
+    assert 6 <= len(ranked) < len(full_ranking)
+
+    ranker = StreamingRanker(scorer, user_query, min_probability=floor)
+    ranker.add_batch("coursera", [c for c in courses if c.get("_provider")])
+    assert all(prob >= floor for _, prob, _, _ in ranker.ranked())
+
+
+def test_detail_top_k_skips_duplicates_and_stubs_are_not_enriched(monkeypatch):
+    from src.app.query_handler import build_ranked_results
+
+    monkeypatch.setenv("RESULT_DETAIL_TOP_K", "2")
+    ranked = [
+        ({"_provider": "coursera", "_id": "a", "Title": "Python"}, 0.5, 3.0, {}),
+        ({"_provider": "coursera", "_id": "b", "Title": "python "}, 0.3, 2.0, {}),
+        ({"_provider": "coursera", "_id": "c", "Title": "SQL"}, 0.1, 1.0, {}),
+        ({"_provider": "udacity", "_id": "d", "Title": "Python"}, 0.1, 1.0, {}),
+    ]
+    results = build_ranked_results(ranked, enrichment_applied=True)
+
+    assert [r["original_data"]["_id"] for r in results] == ["a", "c", "d"]
+    assert [bool(r["unified_data"].get("is_stub")) for r in results] == [False, False, True]
+    assert [r["enrichment_applied"] for r in results] == [True, True, False]
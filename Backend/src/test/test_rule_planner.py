@@ -0,0 +1,81 @@
+# src/test/test_rule_planner.py
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, BACKEND_DIR)
+
+from src.app.db_connection import PROVIDERS
+from src.app.query_executor.mongo_matcher import compile_filter
+from src.app.query_generator.rule_planner import (
+    build_rule_based_queries,
+    classify_query,
+    plan_confidence,
+)
+
+
+def test_single_keyword_is_planned_for_every_provider():
+    plan = build_rule_based_queries("python")
+    assert plan["planner"] == "rules"
+    assert plan["query_type"] == "SPJ"
+    assert plan["expanded_terms"] == ["python"]
+    assert list(plan["providers"]) == PROVIDERS
+
+    matches = compile_filter(plan["providers"]["coursera"])
+    assert matches({"Title": "Python for Everybody"})
+    assert matches({"Skills": "Pandas, Python, SQL"})
+    assert not matches({"Title": "Pythonic Gardens"})
+
+
+def test_topics_are_expanded_and_providers_detected():
+    plan = build_rule_based_queries("Show me some Data Science courses from Udacity")
+    assert list(plan["providers"]) == ["udacity"]
+    assert plan["expanded_terms"][:2] == ["Data Science", "Data Analysis"]
+
+    matches = compile_filter(plan["providers"]["udacity"])
+    assert matches({"Title": "Intro to Statistics"})
+    assert not matches({"Title": "Cooking 101"})
+
+
+def test_provider_typos_and_aliases():
+    assert classify_query("AI courses from SImplilern")["providers"] == ["simplilearn"]
+    assert classify_query("ML from Future Learn & course era")["providers"] == [
+        "futurelearn",
+        "coursera",
+    ]
+
+
+def test_level_filter_only_where_the_provider_has_levels():
+    plan = build_rule_based_queries("beginner java courses from udacity and coursera")
+    udacity = compile_filter(plan["providers"]["udacity"])
+    assert udacity({"Title": "Java Basics", "Level": "Beginner"})
+    assert not udacity({"Title": "Java Basics", "Level": "Advanced"})
+    # coursera has no Level field: the level is left to relevance ranking
+    assert "$and" not in plan["providers"]["coursera"]
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "Top 7 Python courses by rating",
+        "AI courses not from Udacity",
+        "Python courses under 10 hours",
+        "Show me Business Law courses",
+        "guitar",
+        "AI from Udacity, Python from Coursera",
+        "",
+    ],
+)
+def test_queries_needing_the_llm_are_not_planned(query):
+    assert build_rule_based_queries(query) is None
+
+
+def test_confidence_threshold_is_configurable(monkeypatch):
+    query = "Show me Database course from Udacity & Sports related course"
+    assert plan_confidence(classify_query(query)) == pytest.approx(2 / 3)
+    assert build_rule_based_queries(query) is None
+
+    monkeypatch.setenv("RULE_PLANNER_MIN_CONFIDENCE", "0.6")
+    assert list(build_rule_based_queries(query)["providers"]) == ["udacity"]
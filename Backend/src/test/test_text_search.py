@@ -0,0 +1,147 @@
+# src/test/test_text_search.py
+import os
+import sys
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, BACKEND_DIR)
+
+from src.app.query_executor.text_search import (
+    TEXT_SCORE_FIELD,
+    rewrite_regex_to_text,
+    text_score_options,
+)
+
+KEYWORDS = {"$regex": "\\b(AI|Python)\\b", "$options": "i"}
+PHRASES = {"$regex": "\\b(AI|Machine Learning)\\b", "$options": "i"}
+
+
+def test_keyword_or_becomes_text_search():
+    query = {"$or": [{"Title": KEYWORDS}, {"Skills": KEYWORDS}]}
+    assert rewrite_regex_to_text(query) == {"$text": {"$search": "AI Python"}}
+    assert rewrite_regex_to_text({"Title": KEYWORDS}) == {
+        "$text": {"$search": "AI Python"}
+    }
+
+    # "machine OR learning" would be far broader than the phrase regex
+    multi_word = {"$or": [{"Title": PHRASES}, {"Skills": PHRASES}]}
+    assert rewrite_regex_to_text(multi_word) is None
+    assert rewrite_regex_to_text({"$or": [{"Title": KEYWORDS}, {"Skills": PHRASES}]}) is None
+
+
+def test_only_rewritable_conditions_are_rewritten():
+    level = {"Level": "Beginner"}
+    query = {"$and": [level, {"$or": [{"Title": KEYWORDS}]}, {"Skills": KEYWORDS}]}
+    assert rewrite_regex_to_text(query) == {
+        "$and": [level, {"$text": {"$search": "AI Python"}}, {"Skills": KEYWORDS}]
+    }
+
+    case_sensitive = {"Title": {"$regex": "Python"}}
+    not_indexed = {"Level": {"$regex": "beginner", "$options": "i"}}
+    pattern = {"Title": {"$regex": "py.*on", "$options": "i"}}
+    # \bdata OR science\b also matches "database"
+    ungrouped = {"Title": {"$regex": "\\bdata|science\\b", "$options": "i"}}
+    unbounded = {"Title": {"$regex": "python", "$options": "i"}}
+    for query in (
+        case_sensitive,
+        not_indexed,
+        pattern,
+        ungrouped,
+        unbounded,
+        {"$or": [{"Title": KEYWORDS}, level]},
+    ):
+        assert rewrite_regex_to_text(query) is None
+
+
+def test_text_queries_fetch_and_sort_by_score():
+    projection, sort = text_score_options({"$text": {"$search": "ai"}}, {"Title": 1})
+    assert projection == {"Title": 1, TEXT_SCORE_FIELD: {"$meta": "textScore"}}
+    assert sort == [(TEXT_SCORE_FIELD, {"$meta": "textScore"})]
+    assert text_score_options({"Title": "x"}, None) == (None, None)
+
+
+class FakeCursor:
+    """Yields docs, then raises error once fail_after documents were read"""
+
+    def __init__(self, docs, error=None, fail_after=0):
+        self.docs, self.error, self.fail_after = docs, error, fail_after
+
+    def max_time_ms(self, _):
+        return self
+
+    def batch_size(self, _):
+        return self
+
+    def sort(self, _):
+        return self
+
+    def limit(self, _):
+        return self
+
+    def __iter__(self):
+        for i, doc in enumerate(self.docs):
+            if self.error is not None and i == self.fail_after:
+                raise self.error
+            yield doc
+        if self.error is not None:
+            raise self.error
+
+
+class FakeCollection:
+    def __init__(self, text_error, fail_after):
+        self.text_error, self.fail_after = text_error, fail_after
+        self.queries = []
+
+    def find(self, query, projection=None):
+        self.queries.append(query)
+        docs = [{"_id": f"c{i}", "Title": f"AI {i}"} for i in range(4)]
+        if "$text" in query:
+            return FakeCursor(docs, self.text_error, self.fail_after)
+        return FakeCursor(docs)
+
+
+def _run_text_query(monkeypatch, text_error, fail_after):
+    from src.app.query_executor import provider_executor
+    from src.app.query_cache import result_cache
+
+    coll = FakeCollection(text_error, fail_after)
+    monkeypatch.setenv("QUERY_EXECUTION_MODE", "text")
+    monkeypatch.setenv("DOCUMENT_BATCH_SIZE", "2")
+    monkeypatch.setattr(result_cache, "get", lambda key: None)
+    monkeypatch.setattr(result_cache, "set", lambda key, value: None)
+    fake_db = type("FakeDb", (), {"get_collection": lambda self, name: coll})()
+    monkeypatch.setattr(provider_executor, "dbMap", {"coursera": fake_db})
+    monkeypatch.setattr(provider_executor, "COLLECTION_MAP", {"coursera": "courses"})
+
+    batches = []
+    schema_query = {"$or": [{"Course Title": KEYWORDS}]}
+    _, info = provider_executor.execute_provider_query(
+        "coursera", schema_query, "ai python", consume_batch=batches.append
+    )
+    return coll, batches, info
+
+
+def test_missing_text_index_falls_back_to_regex(monkeypatch):
+    from pymongo.errors import OperationFailure
+
+    error = OperationFailure("text index required for $text query", code=27)
+    coll, batches, info = _run_text_query(monkeypatch, error, fail_after=0)
+
+    assert [len(batch) for batch in batches] == [2, 2]
+    assert "$text" in coll.queries[0] and "$text" not in coll.queries[1]
+    assert info["execution_error"] is None
+
+
+def test_text_errors_after_streamed_batches_are_not_retried(monkeypatch):
+    from pymongo.errors import ExecutionTimeout, OperationFailure
+
+    for error, fail_after in (
+        (ExecutionTimeout("operation exceeded time limit", code=50), 2),
+        (OperationFailure("interrupted", code=11601), 0),
+        (OperationFailure("text index required for $text query", code=27), 2),
+    ):
+        coll, batches, info = _run_text_query(monkeypatch, error, fail_after)
+
+        # No second query, so nothing reaches the sink twice
+        assert len(coll.queries) == 1
+        assert sum(len(batch) for batch in batches) == fail_after
+        assert info["execution_error"]
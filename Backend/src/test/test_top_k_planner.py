@@ -0,0 +1,72 @@
+# src/test/test_top_k_planner.py
+import os
+import sys
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, BACKEND_DIR)
+
+from src.app.query_executor.top_k_planner import (
+    SORT_VALUE_FIELD,
+    build_top_k_pipeline,
+    can_push_down,
+    document_sort_value,
+    merge_top_k,
+    numeric_sort_value,
+)
+
+
+def test_numeric_sort_value_parses_stored_strings():
+    assert numeric_sort_value("10,438") == 10438
+    assert numeric_sort_value("4.5") == 4.5
+    assert numeric_sort_value(12) == 12
+    assert numeric_sort_value("4.9stars") == 0
+    assert numeric_sort_value(None) == 0
+
+
+def test_pipeline_sorts_and_limits_on_the_server():
+    pipeline = build_top_k_pipeline(
+        {"Title": "x"}, "Number of viewers", True, 5, {"Title": 1}
+    )
+    stages = [next(iter(stage)) for stage in pipeline]
+    assert stages == ["$match", "$addFields", "$sort", "$limit", "$project"]
+    assert pipeline[2]["$sort"][SORT_VALUE_FIELD] == -1
+    assert pipeline[3]["$limit"] == 5
+    assert pipeline[4]["$project"] == {"Title": 1, SORT_VALUE_FIELD: 1}
+
+    unfiltered = build_top_k_pipeline({}, "Rating", False, 3)
+    assert "$addFields" in unfiltered[0]
+    assert unfiltered[1]["$sort"][SORT_VALUE_FIELD] == 1
+
+
+def test_ingested_numeric_field_is_sorted_directly():
+    pipeline = build_top_k_pipeline(
+        {}, "Number of viewers", True, 5, numeric_field="viewers_count"
+    )
+    assert pipeline[0] == {"$sort": {"viewers_count": -1, "_id": 1}}
+    assert pipeline[1] == {"$limit": 5}
+    doc = {"viewers_count": 7, "Number of viewers": "9"}
+    assert document_sort_value(doc, "Number of viewers") == 7
+    assert document_sort_value({"Rating": "4.5stars"}, "Rating") == 4.5
+
+
+def test_free_text_sort_fields_need_their_companion_to_push_down():
+    # $convert would read "4.9stars" as 0 while the Python path parses 4.9
+    assert not can_push_down("Rating", None)
+    assert not can_push_down("Duration", None)
+    assert can_push_down("Rating", "rating_value")
+    # Plain numbers and "10,438"-style strings convert the same on both paths
+    assert can_push_down("Price", None)
+    assert numeric_sort_value("10,438") == document_sort_value({"Price": "10,438"}, "Price")
+
+
+def test_merge_matches_a_full_sort():
+    def docs(provider, values):
+        return [{"p": provider, SORT_VALUE_FIELD: v} for v in values]
+
+    lists = [docs("a", [9, 5, 1]), docs("b", [8, 5, 2]), docs("c", [])]
+    top = merge_top_k(lists, descending=True, limit=4)
+    assert [(d["p"]) for d in top] == ["a", "b", "a", "b"]
+    assert all(SORT_VALUE_FIELD not in d for d in top)
+
+    ascending = [docs("a", [1, 4]), docs("b", [2, 3])]
+    assert len(merge_top_k(ascending, descending=False, limit=None)) == 4
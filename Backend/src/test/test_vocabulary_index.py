@@ -0,0 +1,50 @@
+# src/test/test_vocabulary_index.py
+import os
+import sys
+
+import jellyfish
+import pytest
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, BACKEND_DIR)
+
+from src.app.indexing.vocabulary_index import FuzzyVocabularyIndex
+
+WORDS = [
+    "python", "pythonic", "programming", "machine", "machines", "learning",
+    "learn", "security", "cybersecurity", "secure", "javascript", "java",
+    "react", "reactive", "beginners", "beginner", "data", "date", "node.js",
+    "kubernetes", "écoles", "a", "c++",
+]
+TERMS = ["pyton", "securty", "machin", "javscript", "datta", "beginers", "c", "ecole"]
+
+
+def brute_force(term, words, threshold):
+    similarities = {word: jellyfish.jaro_winkler_similarity(term, word) for word in words}
+    return {word: sim for word, sim in similarities.items() if sim > threshold}
+
+
+@pytest.mark.parametrize("threshold", [0.8, 0.85, 0.9])
+@pytest.mark.parametrize("term", TERMS)
+def test_similar_words_match_brute_force(term, threshold):
+    index = FuzzyVocabularyIndex()
+    index.add_words(WORDS)
+    assert index.similar_words(term, threshold) == brute_force(term, WORDS, threshold)
+
+
+def test_cached_matches_are_extended_with_new_words():
+    index = FuzzyVocabularyIndex()
+    index.add_words(WORDS[:5])
+    first = index.similar_words("pyton", 0.8)
+    assert set(first) == {"python", "pythonic"} & set(brute_force("pyton", WORDS[:5], 0.8))
+
+    index.add_words(["pyhton", "python"])  # duplicates are ignored
+    assert len(index) == 6
+    assert index.similar_words("pyton", 0.8) == brute_force("pyton", WORDS[:5] + ["pyhton"], 0.8)
+    assert index.stats() == {"words": 6, "cached_terms": 1}
+
+
+def test_threshold_below_index_minimum_is_rejected():
+    index = FuzzyVocabularyIndex()
+    with pytest.raises(ValueError):
+        index.similar_words("python", 0.5)